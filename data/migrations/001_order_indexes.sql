@@ -0,0 +1,26 @@
+-----------------------
+-- ORDERS
+-----------------------
+-- Listing and keyset pagination on (date, id_order), also used by the export
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders (date DESC, id_order DESC);
+
+-- Orders of a customer (order history, GET /Order/?id_customer=)
+CREATE INDEX IF NOT EXISTS idx_orders_customer_date ON orders (id_customer, date DESC, id_order DESC);
+
+-- Orders of a driver (assigned orders, GET /Order/?id_driver=)
+CREATE INDEX IF NOT EXISTS idx_orders_driver_date ON orders (id_driver, date DESC, id_order DESC);
+
+-- Status filter of GET /Order/?status=
+CREATE INDEX IF NOT EXISTS idx_orders_status_date ON orders (status, date DESC, id_order DESC);
+
+-- Ready orders waiting for a driver, oldest first
+CREATE INDEX IF NOT EXISTS idx_orders_ready_date ON orders (date, id_order) WHERE status = 'Ready';
+
+-- Foreign key used by the cascade when an address is deleted
+CREATE INDEX IF NOT EXISTS idx_orders_address ON orders (id_address);
+
+-----------------------
+-- ORDER_PRODUCTS
+-----------------------
+-- Foreign key used by the cascade when a product is deleted
+CREATE INDEX IF NOT EXISTS idx_order_products_product ON order_products (id_product);
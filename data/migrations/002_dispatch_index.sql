@@ -0,0 +1,5 @@
+-----------------------
+-- ORDERS
+-----------------------
+-- Dispatch queue: ready orders not yet claimed by a driver, oldest first
+CREATE INDEX IF NOT EXISTS idx_orders_dispatch ON orders (date, id_order) WHERE status = 'Ready' AND id_driver IS NULL;
@@ -0,0 +1,13 @@
+-----------------------
+-- DELIVERY_ZONE
+-----------------------
+-- Travel time from the restaurant to each address, per transport mode.
+-- Filled when the address is stored so dispatch does not need Google Maps.
+CREATE TABLE IF NOT EXISTS delivery_zone (
+    id_address        INT NOT NULL,
+    transport_mode    VARCHAR(20) NOT NULL,
+    duration_seconds  INT NOT NULL CHECK (duration_seconds >= 0),
+    computed_at       TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id_address, transport_mode),
+    CONSTRAINT fk_delivery_zone_address FOREIGN KEY (id_address) REFERENCES address(id_address) ON DELETE CASCADE
+);
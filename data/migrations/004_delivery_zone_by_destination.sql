@@ -0,0 +1,15 @@
+-----------------------
+-- DELIVERY_ZONE
+-----------------------
+-- Travel time from the restaurant to each destination, per transport mode.
+-- Keyed by the normalized destination rather than by id_address: every order stores a new address row,
+-- and an order to a destination already served must not need Google Maps.
+-- Durations can always be computed again, so the rows keyed by id_address are dropped.
+DROP TABLE IF EXISTS delivery_zone;
+CREATE TABLE delivery_zone (
+    destination       VARCHAR(255) NOT NULL,
+    transport_mode    VARCHAR(20) NOT NULL,
+    duration_seconds  INT NOT NULL CHECK (duration_seconds >= 0),
+    computed_at       TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (destination, transport_mode)
+);
@@ -1,17 +1,52 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse
 
 from src.App.AdministratorController import admin_router
 from src.App.DriverController import driver_router
+from src.App.MetricsController import metrics_middleware, metrics_router
 from src.App.OrderController import order_router
 from src.App.ProductController import product_router
+from src.DAO.AsyncDBConnector import AsyncDBConnector
+from src.utils.log_context import get_correlation_id, reset_correlation_id, set_correlation_id
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Closes the connection pools of the async endpoints when the server stops.
+    The pools are opened by the first request using them.
+    """
+    yield
+    await AsyncDBConnector.close_all()
 
-app = FastAPI(title="Projet Info 2A", description="UB'EJR")
+
+app = FastAPI(title="Projet Info 2A", description="UB'EJR", lifespan=lifespan)
 app.include_router(product_router)
 app.include_router(order_router)
 app.include_router(admin_router)
 app.include_router(driver_router)
+app.include_router(metrics_router)
+app.middleware("http")(metrics_middleware)
+
+
+@app.middleware("http")
+async def correlation_id_middleware(request: Request, call_next):
+    """
+    Tags every log line written while handling a request with the same correlation id.
+    The id is taken from the X-Request-ID header if the client sent one, and sent back in the response.
+    """
+    token = set_correlation_id(request.headers.get(REQUEST_ID_HEADER))
+    try:
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = get_correlation_id()
+        return response
+    finally:
+        reset_correlation_id(token)
 
 
 @app.get("/", include_in_schema=False)
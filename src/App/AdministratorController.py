@@ -1,17 +1,17 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
 from src.App.init_app import jwt_service
-from src.App.JWTBearer import JWTBearer
+from src.App.JWTBearer import JWTBearer, JWTCredentials
 from src.DAO.AdminDAO import AdminDAO
 from src.DAO.DBConnector import DBConnector
 from src.Model.APIUser import APIUser
 from src.Model.JWTResponse import JWTResponse
 from src.Service.AdminService import AdminService
 from src.Service.PasswordService import check_password_strength, create_salt
+from src.utils.principal_cache import principal_cache
 from src.utils.securite import hash_password
 
 
@@ -45,7 +45,7 @@ def login_admin(username: str, password: str) -> JWTResponse:
 
 @admin_router.get("/me")
 def get_admin_own_profile(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
 ) -> APIUser:
     """
     Return the authenticated admin's profile using the provided JWT.
@@ -60,15 +60,12 @@ def create_new_admin(
     first_name: str,
     last_name: str,
     email: str,
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
 ) -> APIUser:
     """
     Create a new admin account (requires valid JWT).
     Returns the created admin.
     """
-    token = credentials.credentials
-    jwt_service.validate_user_jwt(token)
-
     admin = admin_service.create_admin(
         username=username, password=password, first_name=first_name, last_name=last_name, email=email
     )
@@ -92,7 +89,7 @@ def update_my_admin_profile(
     first_name: str,
     last_name: str,
     email: str,
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
 ) -> APIUser:
     """
     Update the authenticated admin's profile.
@@ -100,8 +97,7 @@ def update_my_admin_profile(
     """
     admindao = AdminDAO(DBConnector(test=False))
     admin_service = AdminService(admindao=admindao)
-    token = credentials.credentials
-    admin_id = int(jwt_service.validate_user_jwt(token))
+    admin_id = credentials.user_id
     print(admin_id)
 
     admin = admin_service.get_by_id(admin_id)
@@ -139,20 +135,24 @@ def update_my_admin_profile(
 
 
 def get_admin_from_credentials(
-    credentials: HTTPAuthorizationCredentials,
+    credentials: JWTCredentials,
 ) -> APIUser:
     """
-    Extract admin ID from JWT and return the admin profile.
+    Return the profile of the admin authenticated by the JWT, already validated by JWTBearer.
+    The profile is cached for a short time, so most requests do not read the database.
     """
-    token = credentials.credentials
-    admin_id = int(jwt_service.validate_user_jwt(token))
-    admin = admin_service.get_by_id(admin_id)
+    principal = principal_cache.get("admin", credentials.user_id)
+    if principal is not None:
+        return principal
+    admin = admin_service.get_by_id(credentials.user_id)
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
-    return APIUser(
+    principal = APIUser(
         id=admin.id_admin,
         username=admin.user_name,
         first_name=admin.first_name,
         last_name=admin.last_name,
         email=admin.email,
     )
+    principal_cache.set("admin", credentials.user_id, admin.id, principal)
+    return principal
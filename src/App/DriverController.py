@@ -1,10 +1,9 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials
 
 from src.App.AdministratorController import get_admin_from_credentials
-from src.App.JWTBearer import JWTBearer
+from src.App.JWTBearer import JWTBearer, JWTCredentials
 from src.Model.APIUser import APIUser
 from src.Service.DriverService import DriverService
 
@@ -20,7 +19,7 @@ def create_driver(
     last_name: str,
     email: str,
     mean_of_transport: str,
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
 ) -> APIUser:
     """
     Create a new driver account.
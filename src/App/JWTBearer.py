@@ -5,11 +5,18 @@ from jwt import DecodeError, ExpiredSignatureError
 from src.App.init_app import jwt_service
 
 
+class JWTCredentials(HTTPAuthorizationCredentials):
+    """Bearer credentials whose token has been validated, with its decoded claims."""
+
+    claims: dict
+    user_id: int
+
+
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
         super(JWTBearer, self).__init__(auto_error=auto_error)
 
-    async def __call__(self, request: Request) -> HTTPAuthorizationCredentials:
+    async def __call__(self, request: Request) -> JWTCredentials:
         credentials: HTTPAuthorizationCredentials | None = await super(
             JWTBearer, self
         ).__call__(request)
@@ -21,7 +28,7 @@ class JWTBearer(HTTPBearer):
                 status_code=403, detail="Invalid authentication scheme."
             )
         try:
-            jwt_service.validate_user_jwt(credentials.credentials)
+            claims = jwt_service.validate_claims(credentials.credentials)
         except ExpiredSignatureError as e:
             raise HTTPException(status_code=403, detail="Expired token") from e
         except DecodeError as e:
@@ -29,4 +36,10 @@ class JWTBearer(HTTPBearer):
         except Exception as e:
             raise HTTPException(status_code=403, detail="Unknown error") from e
 
-        return credentials
+        # Endpoints read the caller from here instead of decoding the token again
+        return JWTCredentials(
+            scheme=credentials.scheme,
+            credentials=credentials.credentials,
+            claims=claims,
+            user_id=int(claims["user_id"]),
+        )
@@ -0,0 +1,157 @@
+import os
+import secrets
+import threading
+import time
+from typing import Annotated, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.App.dependencies import get_db_connector
+from src.DAO.OrderDAO import OrderDAO
+from src.DAO.QueryStats import HISTOGRAM_BUCKETS, query_stats
+from src.Service.Google_Maps import check_address
+from src.Service.Google_Maps import map as route_map
+from src.Service.Google_Maps.client import get_async_client
+from src.Service.OrderService import OrderService
+from src.utils.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, registry
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time spent handling HTTP requests.", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+
+# Bearer token the scraper must send. /metrics is refused to everyone when it is not set
+METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN") or None
+# Orders are counted at most once every ORDER_COUNTS_TTL seconds, however often /metrics is scraped
+ORDER_COUNTS_TTL = float(os.getenv("METRICS_ORDER_COUNTS_TTL", 30))
+_order_counts: Tuple[float, Dict[str, int]] = (0.0, {})
+_order_counts_lock = threading.Lock()
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Measures the latency of every request, labelled by route template rather than by URL."""
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status_code,
+        )
+
+
+def collect_db_pool():
+    """Usage of the blocking (psycopg2) and asyncio (psycopg 3) connection pools.
+
+    Zeros until a query opens a pool, a scrape never opens it.
+    """
+    connector = get_db_connector()
+    pools = {"sync": connector.open_pool_stats() or {}, "async": connector.async_connector.open_pool_stats() or {}}
+    gauges = []
+    for key in ("size", "idle", "in_use", "waiting", "max_size"):
+        gauge = Gauge(f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}.", ("pool",))
+        for pool, stats in pools.items():
+            gauge.set(stats.get(key, 0), pool=pool)
+        gauges.append(gauge)
+    counters = []
+    for key in ("checkouts", "checkout_timeouts", "connections_created", "connections_discarded"):
+        counter = Counter(f"db_pool_{key}_total", f"Connection pool {key.replace('_', ' ')}.", ("pool",))
+        for pool, stats in pools.items():
+            counter.inc(stats.get(key, 0), pool=pool)
+        counters.append(counter)
+    wait = Counter("db_pool_wait_seconds_total", "Time spent waiting for a free connection.", ("pool",))
+    for pool, stats in pools.items():
+        wait.inc(stats.get("wait_time_total", 0), pool=pool)
+    return [*gauges, *counters, wait]
+
+
+def collect_db_queries():
+    """Durations of the SQL queries by fingerprint."""
+    duration = Histogram(
+        "db_query_duration_seconds", "SQL query execution time.", ("query",), buckets=HISTOGRAM_BUCKETS
+    )
+    errors = Counter("db_query_errors_total", "Failed SQL queries.", ("query",))
+    rows = Counter("db_query_rows_total", "Rows returned or affected by SQL queries.", ("query",))
+    for query, entry in query_stats.snapshot().items():
+        duration.load(list(entry["buckets"].values()), entry["total_time"], query=query)
+        errors.inc(entry["errors"], query=query)
+        rows.inc(entry["rows"], query=query)
+    return [duration, errors, rows]
+
+
+def collect_maps():
+    """Google Maps requests and cache efficiency."""
+    requests = Counter("maps_requests_total", "Google Maps requests by method and outcome.", ("method", "outcome"))
+    for method, outcomes in get_async_client().stats().items():
+        for outcome, count in outcomes.items():
+            requests.inc(count, method=method, outcome=outcome)
+
+    hits = Counter("maps_cache_hits_total", "Google Maps cache hits.", ("cache",))
+    misses = Counter("maps_cache_misses_total", "Google Maps cache misses.", ("cache",))
+    hit_ratio = Gauge("maps_cache_hit_ratio", "Share of the Google Maps cache lookups that were hits.", ("cache",))
+    entries = Gauge("maps_cache_entries", "Entries in the in-memory Google Maps caches.", ("cache",))
+    # Read at scrape time so that a replaced cache is reported
+    for cache in (check_address.geocode_cache, route_map.route_cache, route_map.duration_cache):
+        stats = cache.stats()
+        hits.inc(stats["hits"], cache=stats["name"])
+        misses.inc(stats["misses"], cache=stats["name"])
+        hit_ratio.set(stats["hit_ratio"], cache=stats["name"])
+        entries.set(stats["size"], cache=stats["name"])
+    return [requests, hits, misses, hit_ratio, entries]
+
+
+def order_counts() -> Dict[str, int]:
+    """Number of orders in each status, counted again once ORDER_COUNTS_TTL seconds have passed."""
+    global _order_counts
+    with _order_counts_lock:
+        expires_at, counts = _order_counts
+        if expires_at <= time.monotonic():
+            counts = OrderService(OrderDAO(get_db_connector())).count_by_status()
+            _order_counts = (time.monotonic() + ORDER_COUNTS_TTL, counts)
+        return counts
+
+
+def collect_orders():
+    """Number of orders in each status."""
+    orders = Gauge("orders", "Orders by status.", ("status",))
+    for order_status, count in order_counts().items():
+        orders.set(count, status=order_status)
+    return [orders]
+
+
+for collector in (collect_db_pool, collect_db_queries, collect_maps, collect_orders):
+    registry.register_collector(collector)
+
+
+def check_metrics_token(
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(HTTPBearer(auto_error=False))],
+):
+    """Only let through the requests sending METRICS_TOKEN as bearer token."""
+    if (
+        METRICS_TOKEN is None
+        or credentials is None
+        or not secrets.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode())
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid metrics token")
+
+
+@metrics_router.get(
+    "/metrics", response_class=Response, dependencies=[Depends(check_metrics_token)], include_in_schema=False
+)
+def get_metrics():
+    """
+    Operational metrics in the Prometheus text format: request latency per route, requests in flight,
+    connection pool usage, SQL query durations, Google Maps requests and caches, and orders by status.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,28 +1,119 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel, Field
+
+from src.App.dependencies import AddressServiceDep, CustomerDAODep, OrderServiceDep
+from src.App.JWTBearer import JWTBearer, JWTCredentials
+from src.Model.Address import Address
+from src.Model.OrderLine import OrderLine
+
+
+class PlaceOrderRequest(BaseModel):
+    id_customer: int
+    address: str
+    city: str
+    postal_code: int
+    payment_method: Literal["Card", "Cash"] = "Card"
+    lines: list[OrderLine] = Field(min_length=1)
 
-from src.App.JWTBearer import JWTBearer
-from src.DAO.DBConnector import DBConnector
-from src.DAO.OrderDAO import OrderDAO
-from src.Service.OrderService import OrderService
 
 order_router = APIRouter(prefix="/Order", tags=["Orders"])
-db = DBConnector()
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
 @order_router.get("/", status_code=status.HTTP_200_OK)
-def get_all_orders(credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())]):
+async def get_all_orders(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    order_service: OrderServiceDep,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    order_status: Annotated[Literal["Delivered", "Ready", "On the way"] | None, Query(alias="status")] = None,
+    id_customer: int | None = None,
+    id_driver: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+):
     """
-    Retrieves all orders from the PostgreSQL database.
+    Retrieves one page of orders from the PostgreSQL database, most recent first.
+    Orders can be filtered by status, customer, driver and date range [date_from, date_to).
+    Pass the returned next_cursor as cursor to get the following page; it is null on the last page.
     """
-    orderdao = OrderDAO(DBConnector(test=False))
-    order_service = OrderService(orderdao)
     try:
-        orders = order_service.list_all_orders()
-        return orders
+        return await order_service.list_orders_page_async(
+            limit=limit,
+            cursor=cursor,
+            status=order_status,
+            id_customer=id_customer,
+            id_driver=id_driver,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         print("DEBUG ERROR:", str(e))
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}") from e
+
+
+@order_router.get("/export", status_code=status.HTTP_200_OK)
+def export_orders(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    order_service: OrderServiceDep,
+    file_format: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson",
+):
+    """
+    Streams the full order history, oldest first, as NDJSON or CSV.
+    Rows are read from the database with a server-side cursor and sent as they come.
+    """
+    return StreamingResponse(
+        order_service.export_orders(file_format=file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{file_format}"'},
+    )
+
+
+@order_router.post("/", status_code=status.HTTP_201_CREATED)
+def place_order(
+    request: PlaceOrderRequest,
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
+    customerdao: CustomerDAODep,
+    address_service: AddressServiceDep,
+    order_service: OrderServiceDep,
+):
+    """
+    Places an order with all its products in one call, for the customer authenticated by the token.
+    The order, its products and the stock decrements are saved in a single transaction.
+    """
+    if customerdao.get_id_customer_by_id_user(credentials.user_id) != request.id_customer:
+        raise HTTPException(status_code=403, detail="Orders can only be placed for your own customer account")
+
+    address = Address(address=request.address, city=request.city, postal_code=request.postal_code)
+    if not address_service.validate_address(address):
+        raise HTTPException(status_code=400, detail="We do not deliver to this address")
+    try:
+        address = address_service.add_address(address.address, address.city, address.postal_code)
+        if address is None:
+            raise HTTPException(status_code=400, detail="Address could not be saved")
+
+        order = order_service.place_order(
+            id_customer=request.id_customer,
+            id_address=address.id_address,
+            lines=request.lines,
+            payment_method=request.payment_method,
+        )
+        if order is None:
+            raise HTTPException(status_code=409, detail="Order could not be placed (unknown product or out of stock)")
+        return order
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}") from e
@@ -3,22 +3,22 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
 
+from src.App.dependencies import ProductDAODep, ProductServiceDep
 from src.App.JWTBearer import JWTBearer
-from src.DAO.DBConnector import DBConnector
-from src.DAO.ProductDAO import ProductDAO
 from src.Model.Product import Product
-from src.Service.ProductService import ProductService
 
 product_router = APIRouter(prefix="/Product", tags=["Products"])
-db = DBConnector()
 
 
 @product_router.get("/{product_id}", response_model=Product, status_code=status.HTTP_200_OK)
-def get_product_by_id(product_id: int, credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())]):
+async def get_product_by_id(
+    product_id: int,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    productdao: ProductDAODep,
+):
     """Retrieve a product by its ID."""
-    productdao = ProductDAO(DBConnector(test=False))
     try:
-        product = productdao.get_product_by_id(product_id)
+        product = await productdao.get_product_by_id_async(product_id)
         if product is None:
             raise HTTPException(status_code=404, detail=f"Product with id [{product_id}] not found")
         return product
@@ -29,10 +29,12 @@ def get_product_by_id(product_id: int, credentials: Annotated[HTTPAuthorizationC
 
 
 @product_router.get("/id/{product_name}", status_code=status.HTTP_200_OK)
-def get_all_products(product_name, credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())]):
+def get_all_products(
+    product_name,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    product_service: ProductServiceDep,
+):
     """Gives all products with id so that the admin can use the others endpoints"""
-    productdao = ProductDAO(DBConnector(test=False))
-    product_service = ProductService(productdao)
     try:
         id_product = product_service.get_id_by_name(product_name)
         return id_product
@@ -49,10 +51,9 @@ def create_product(
     product_type,
     stock,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],  # admin connected
+    product_service: ProductServiceDep,
 ):
     """Create a new product (admin only)."""
-    productdao = ProductDAO(DBConnector(test=False))
-    product_service = ProductService(productdao)
     try:
         new_product = product_service.create(
             name=name,
@@ -73,10 +74,9 @@ def create_product(
 def delete_product(
     product_id: int,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    product_service: ProductServiceDep,
 ):
     """Delete a product by ID (admin only)."""
-    productdao = ProductDAO(DBConnector(test=False))
-    product_service = ProductService(productdao)
     try:
         deleted = product_service.delete(product_id)
         if deleted:
@@ -91,11 +91,10 @@ def update_product(
     product_id: int,
     updated_product: Product,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    product_service: ProductServiceDep,
 ):
     """Update an existing product (admin only)."""
     try:
-        product_service = ProductService(ProductDAO(DBConnector(test=False)))
-
         result = product_service.update_product(
             product_id=product_id,
             name=updated_product.name,
@@ -121,10 +120,9 @@ def update_stock(
     product_id: int,
     stock_added: int,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    product_service: ProductServiceDep,
 ):
     """Increase product stock by a given amount (admin only)."""
-    productdao = ProductDAO(DBConnector(test=False))
-    product_service = ProductService(productdao)
     try:
         added = product_service.increment_stock(product_id=product_id, quantity=stock_added)
         if added:
@@ -1,16 +1,16 @@
 from typing import TYPE_CHECKING, Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials
 
 from src.App.init_app import jwt_service, user_repo, user_service
-from src.App.JWTBearer import JWTBearer
+from src.App.JWTBearer import JWTBearer, JWTCredentials
 from src.Model.APIUser import APIUser
 from src.Model.JWTResponse import JWTResponse
 from src.Service.PasswordService import (
     check_password_strength,
     validate_username_password,
 )
+from src.utils.principal_cache import principal_cache
 
 if TYPE_CHECKING:
     from src.Model.User import User
@@ -48,9 +48,9 @@ def login(username: str, password: str) -> JWTResponse:
     return jwt_service.encode_jwt(user.id)
 
 
-@user_router.get("/me", dependencies=[Depends(JWTBearer())])
+@user_router.get("/me")
 def get_user_own_profile(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(JWTBearer())],
+    credentials: Annotated[JWTCredentials, Depends(JWTBearer())],
 ) -> APIUser:
     """
     Get the authenticated user profile
@@ -58,13 +58,17 @@ def get_user_own_profile(
     return get_user_from_credentials(credentials)
 
 
-def get_user_from_credentials(credentials: HTTPAuthorizationCredentials) -> APIUser:
+def get_user_from_credentials(credentials: JWTCredentials) -> APIUser:
     """
-    Extract the authenticated user from the JWT token and return their public profile.
+    Return the public profile of the user authenticated by the JWT, already validated by JWTBearer.
+    The profile is cached for a short time, so most requests do not read the database.
     """
-    token = credentials.credentials
-    user_id = int(jwt_service.validate_user_jwt(token))
-    user: User | None = user_repo.get_by_id(user_id)
+    principal = principal_cache.get("user", credentials.user_id)
+    if principal is not None:
+        return principal
+    user: User | None = user_repo.get_by_id(credentials.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return APIUser(id=user.id, username=user.username)
+    principal = APIUser(id=user.id, username=user.username)
+    principal_cache.set("user", credentials.user_id, user.id, principal)
+    return principal
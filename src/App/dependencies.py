@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Annotated
+
+from fastapi import Depends
+
+from src.DAO.AddressDAO import AddressDAO
+from src.DAO.CustomerDAO import CustomerDAO
+from src.DAO.DBConnector import DBConnector
+from src.DAO.OrderDAO import OrderDAO
+from src.DAO.ProductDAO import ProductDAO
+from src.Service.AddressService import AddressService
+from src.Service.OrderService import OrderService
+from src.Service.ProductService import ProductService
+
+# The connector, and therefore its connection pool, is created once per process. DAOs and services
+# only hold a reference to it, so building them for each request is cheap. FastAPI resolves each
+# provider once per request: the OrderDAO and the OrderService of a request share one ProductDAO.
+# Tests swap the database (or any DAO or service) with app.dependency_overrides, e.g.
+#     app.dependency_overrides[get_db_connector] = lambda: DBConnector(test=True)
+
+
+@lru_cache(maxsize=None)
+def get_db_connector() -> DBConnector:
+    """Return the connector shared by every request of the process."""
+    return DBConnector()
+
+
+def get_product_dao(db_connector: Annotated[DBConnector, Depends(get_db_connector)]) -> ProductDAO:
+    return ProductDAO(db_connector)
+
+
+def get_order_dao(
+    db_connector: Annotated[DBConnector, Depends(get_db_connector)],
+    productdao: Annotated[ProductDAO, Depends(get_product_dao)],
+) -> OrderDAO:
+    return OrderDAO(db_connector, productdao=productdao)
+
+
+def get_address_dao(db_connector: Annotated[DBConnector, Depends(get_db_connector)]) -> AddressDAO:
+    return AddressDAO(db_connector)
+
+
+def get_customer_dao(db_connector: Annotated[DBConnector, Depends(get_db_connector)]) -> CustomerDAO:
+    return CustomerDAO(db_connector)
+
+
+def get_product_service(productdao: Annotated[ProductDAO, Depends(get_product_dao)]) -> ProductService:
+    return ProductService(productdao)
+
+
+def get_order_service(orderdao: Annotated[OrderDAO, Depends(get_order_dao)]) -> OrderService:
+    return OrderService(orderdao)
+
+
+def get_address_service(addressdao: Annotated[AddressDAO, Depends(get_address_dao)]) -> AddressService:
+    return AddressService(addressdao)
+
+
+ProductDAODep = Annotated[ProductDAO, Depends(get_product_dao)]
+CustomerDAODep = Annotated[CustomerDAO, Depends(get_customer_dao)]
+ProductServiceDep = Annotated[ProductService, Depends(get_product_service)]
+OrderServiceDep = Annotated[OrderService, Depends(get_order_service)]
+AddressServiceDep = Annotated[AddressService, Depends(get_address_service)]
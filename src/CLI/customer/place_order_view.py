@@ -7,6 +7,7 @@ from src.DAO.AddressDAO import AddressDAO
 from src.DAO.DBConnector import DBConnector
 from src.DAO.OrderDAO import OrderDAO
 from src.DAO.ProductDAO import ProductDAO
+from src.Model.OrderLine import OrderLine
 from src.Service.AddressService import AddressService
 from src.Service.Google_Maps.check_address import check_address
 from src.Service.OrderService import OrderService
@@ -14,6 +15,31 @@ from src.Service.ProductService import ProductService
 
 
 class PlaceOrderView(AbstractView):
+    @staticmethod
+    def order_lines(ids, menu_products, products_names, quantities):
+        """Lines of the order: menu items get the 10% discount, single products do not"""
+        lines = [OrderLine(id_product=ids[product], quantity=1, promotion=True) for product in menu_products]
+        lines += [
+            OrderLine(id_product=ids[product], quantity=int(quantity), promotion=False)
+            for product, quantity in zip(products_names, quantities, strict=True)
+        ]
+        return lines
+
+    @staticmethod
+    def order_summary(menu_products, list_dessert, products_names, quantities):
+        """Summary of the menus and single products of the order"""
+        message = "Order validated \n \nSummary : \nMenus : \n"
+        for product in menu_products:
+            message += f"{product}"
+            if product in list_dessert:
+                message += " \n"
+            else:
+                message += " and "
+        message += "Single products : \n"
+        for product, quantity in zip(products_names, quantities, strict=True):
+            message += f"{product} quantity: {int(quantity)} \n"
+        return message
+
     def choose_menu(self):
         """Place an order"""
         productdao = ProductDAO(DBConnector())
@@ -39,9 +65,11 @@ class PlaceOrderView(AbstractView):
         list_dessert = []
         prices = {}
         stocks = {}
+        ids = {}
         for product in raw_list_products:
             name = product["name"]
             list_products.append(name)
+            ids[name] = product["id_product"]
             price = product["price"]
             prices[name] = float(price)
             stock = product["stock"]
@@ -181,39 +209,19 @@ class PlaceOrderView(AbstractView):
         # payment method
         payment_method = inquirer.select(message="Select a payment method :", choices=["Cash", "Card"]).execute()
 
-        # creating the order
-        order = order_service.create(
+        lines = self.order_lines(ids, list_choosen_menu, list_choosen_products_names, quantities)
+
+        # creating the order with all its products in one transaction
+        order = order_service.place_order(
             id_customer=id_customer,
             id_address=id_address,
-            nb_items=0,
-            total_amount=0,
+            lines=lines,
             payment_method=payment_method,
         )
+        if order is None:
+            return MenuView("Your order could not be placed, a product may be out of stock. Please try again.")
 
-        id_order = order.id_order
-
-        message = "Order validated \n \nSummary : \nMenus : \n"
-        # putting choosen products into the order
-        for product in list_choosen_menu:
-            id_product = product_service.get_id_by_name(product)
-            order_service.add_product_to_order(
-                order_id=id_order, product_id=id_product, quantity=1, promotion=True
-            )
-            message += f"{product}"
-            if product in list_dessert:
-                message += " \n"
-            else:
-                message += " and "
-        message += "Single products : \n"
-        for i in range(len(list_choosen_products_names)):
-            product = list_choosen_products_names[i]
-            quantity = int(quantities[i])
-            id_product = product_service.get_id_by_name(product)
-            order_service.add_product_to_order(
-                order_id=id_order, product_id=id_product, quantity=int(quantity), promotion=False
-            )
-            message += f"{product} quantity: {quantity} \n"
-
+        message = self.order_summary(list_choosen_menu, list_dessert, list_choosen_products_names, quantities)
         message += "total price : " + str(total_amount) + " euros \n"
         message += "address to be delivered : " + address + " " + city + " " + postal_code + " \n"
 
@@ -1,23 +1,15 @@
-import os
-
-import googlemaps
-from dotenv import load_dotenv
 from InquirerPy import inquirer
 
 from src.CLI.session import Session
 from src.CLI.view_abstract import AbstractView
+from src.DAO.AddressDAO import AddressDAO
+from src.DAO.DBConnector import DBConnector
 from src.DAO.DriverDAO import DriverDAO
 from src.DAO.OrderDAO import OrderDAO
+from src.Service.AddressService import DELIVERY_ORIGIN, AddressService, format_destination
 from src.Service.Google_Maps.map import compute_itinerary, create_map, display_itinerary_details
 from src.Service.OrderService import OrderService
 
-# Load environment variables
-load_dotenv()
-API_KEY = os.getenv("API_KEY_GOOGLE_MAPS")
-
-# Initialize Google Maps client
-gmaps = googlemaps.Client(key=API_KEY)
-
 
 class ManageOrderView(AbstractView):
     """
@@ -29,6 +21,7 @@ class ManageOrderView(AbstractView):
             super().__init__(message)
             self.driver_dao = DriverDAO()
             self.order_service = OrderService(OrderDAO())
+            self.address_service = AddressService(AddressDAO(DBConnector()))
 
             # Retrieving driver's id
             if driver_id is not None:
@@ -71,39 +64,39 @@ class ManageOrderView(AbstractView):
                 return []
 
             print(f"Transport type: {driver.mean_of_transport}")
-            origin = "ENSAI, Rennes, France"
 
             # If the deliverer uses a bike, he can only deliver orders that are less than 30 minutes away
+            # Orders already assigned to a driver cannot be claimed
+            all_ready_orders = [
+                order_data
+                for order_data in self.order_service.list_all_orders_ready()
+                if order_data["order"].id_driver is None
+            ]
+
             if driver.mean_of_transport == "Bike":
                 max_bike_time = 30 * 60
-                all_ready_orders = self.order_service.list_all_orders_ready()
                 filtered_orders = []
 
-                for order_data in all_ready_orders:
-                    order_address = order_data["address"]
-                    destination = f"{order_address.address}, {order_address.postal_code} {order_address.city}"
+                # Durations stored with the addresses are read from the database, without Google Maps
+                durations = self.address_service.get_delivery_durations(
+                    [order_data["address"] for order_data in all_ready_orders], "bicycling"
+                )
 
-                    try:
-                        directions_bike = compute_itinerary(origin, destination, "bicycling")
-                        if directions_bike and directions_bike[0]["legs"]:
-                            duration_seconds = directions_bike[0]["legs"][0]["duration"]["value"]
-                            duration_minutes = duration_seconds // 60
-
-                            if duration_seconds <= max_bike_time:
-                                filtered_orders.append(order_data)
-                            else:
-                                print(f"Order {order_data['order'].id_order}: {duration_minutes} min (too far)")
-                        else:
-                            print(f"Order {order_data['order'].id_order}: unable to compute itinerary")
-                    except Exception as e:
-                        print(f"Error for delivery {order_data['order'].id_order}: {e}")
-                        continue
+                for order_data in all_ready_orders:
+                    order_id = order_data["order"].id_order
+                    duration_seconds = durations.get(order_data["address"].id_address)
+                    if duration_seconds is None:
+                        print(f"Order {order_id}: unable to compute itinerary")
+                    elif duration_seconds <= max_bike_time:
+                        filtered_orders.append(order_data)
+                    else:
+                        print(f"Order {order_id}: {duration_seconds // 60} min (too far)")
 
                 return filtered_orders
 
             # For the other drivers, they can deliver all orders
             else:
-                return self.order_service.list_all_orders_ready()
+                return all_ready_orders
 
         except Exception as e:
             print(f"Error in get_available_orders: {e}")
@@ -164,18 +157,18 @@ class ManageOrderView(AbstractView):
     def accept_delivery(self, order_data):
         """Handle accepting an order"""
         order_id = order_data["order"].id_order
-        order_address = order_data["address"]
 
-        # Assign the order to the driver
-        success = self.order_service.assign_order(self.driver_id, order_id)
-        if not success:
-            message = "Error assigning the order"
+        # Claim the order: it is assigned to this driver and marked as 'On the way' atomically.
+        # Only the order the driver accepted is claimed, so if another driver took it in the meantime
+        # the driver goes back to the menu.
+        claimed = self.order_service.claim_next_ready_order(self.driver_id, [order_id])
+        if not claimed:
+            message = "This order is no longer available"
             print(message)
-            from src.CLI.menu_driver import MenuDriver
+            from src.CLI.driver.menu_driver import MenuDriver
             return MenuDriver(message=message)
 
-        # Mark as 'on the way'
-        self.order_service.mark_as_on_the_way(order_id)
+        order_address = claimed["address"]
         print("Order assigned and marked as 'On the way'")
 
         # Compute and display the itinerary
@@ -183,8 +176,8 @@ class ManageOrderView(AbstractView):
         transport_mapping = {"Car": "driving", "Bike": "bicycling"}
         transport_mode = transport_mapping.get(driver.mean_of_transport, "driving")
 
-        origin = "ENSAI, Rennes, France"
-        destination = f"{order_address.address}, {order_address.postal_code} {order_address.city}"
+        origin = DELIVERY_ORIGIN
+        destination = format_destination(order_address)
 
         print("\n" + "=" * 60)
         print("Computing itinerary")
@@ -193,10 +186,10 @@ class ManageOrderView(AbstractView):
         directions = compute_itinerary(origin, destination, transport_mode)
         if directions:
             display_itinerary_details(directions)
-            map_path = create_map(origin, destination, transport_mode)
+            map_path = create_map(origin, destination, transport_mode, directions, order_id=order_id)
             if map_path:
                 print(f"Map saved: {map_path}")
-                print("You can now open the map file 'delivery_path.html' in the Google_Maps service")
+                print("You can now open this file in your browser")
             else:
                 print("Unable to compute map")
         else:
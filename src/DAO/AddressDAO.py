@@ -1,4 +1,5 @@
 import logging
+from typing import Dict, List
 
 from src.Model.Address import Address
 from src.utils.log_decorator import log
@@ -47,3 +48,80 @@ class AddressDAO:
         except Exception as e:
             logging.info(f"Erreur lors de l'insertion : {e}")
             return None
+
+    @staticmethod
+    def _upsert_durations(cursor, transport_mode: str, durations: Dict[str, int]):
+        """Insert or refresh delivery_zone rows of one transport mode with an open cursor, in one statement."""
+        cursor.execute(
+            """
+            INSERT INTO delivery_zone (destination, transport_mode, duration_seconds)
+            SELECT destination, %(transport_mode)s, duration
+            FROM unnest(%(destinations)s::varchar[], %(durations)s::int[]) AS t(destination, duration)
+            ON CONFLICT (destination, transport_mode)
+            DO UPDATE SET duration_seconds = EXCLUDED.duration_seconds, computed_at = NOW();
+            """,
+            {
+                "transport_mode": transport_mode,
+                "destinations": list(durations.keys()),
+                "durations": list(durations.values()),
+            },
+        )
+
+    @log
+    def add_delivery_durations(self, durations: Dict[str, int], transport_mode: str) -> bool:
+        """Store the delivery durations of several destinations in one statement
+
+        Parameters
+        ----------
+        durations : dict
+            Travel time in seconds from the restaurant, by normalized destination.
+        transport_mode : str
+            Google Maps transport mode, e.g. "bicycling".
+
+        Returns
+        -------
+        bool
+            True if the durations were stored, False otherwise.
+        """
+        if not durations:
+            return False
+        try:
+            with self.db_connector.transaction() as cursor:
+                self._upsert_durations(cursor, transport_mode, durations)
+            return True
+        except Exception as e:
+            logging.info(f"Erreur lors de l'insertion : {e}")
+            return False
+
+    @log
+    def get_delivery_durations(self, destinations: List[str], transport_mode: str) -> Dict[str, int]:
+        """Get the precomputed delivery durations of several destinations in one query
+
+        Parameters
+        ----------
+        destinations : list of str
+            Normalized destinations.
+        transport_mode : str
+            Google Maps transport mode, e.g. "bicycling".
+
+        Returns
+        -------
+        dict
+            Duration in seconds by destination. Destinations without a precomputed duration are missing.
+        """
+        if not destinations:
+            return {}
+        try:
+            rows = self.db_connector.sql_query(
+                """
+                SELECT destination, duration_seconds
+                FROM delivery_zone
+                WHERE transport_mode = %s AND destination = ANY(%s);
+                """,
+                [transport_mode, list(destinations)],
+                "all",
+            )
+            return {row["destination"]: row["duration_seconds"] for row in rows}
+        except Exception as e:
+            logging.info(f"Erreur lors de la lecture : {e}")
+            return {}
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Union
+
+from psycopg import AsyncCursor
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from src.DAO.QueryStats import query_stats
+
+if TYPE_CHECKING:
+    from src.DAO.DBConnector import DBConnector
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncCursor(AsyncCursor):
+    """AsyncCursor recording the duration and row count of each execute in query_stats."""
+
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        text = query if isinstance(query, str) else query.as_string(self)
+        try:
+            result = await super().execute(query, params, **kwargs)
+        except Exception:
+            query_stats.record(text, time.perf_counter() - start, error=True)
+            raise
+        query_stats.record(text, time.perf_counter() - start, max(self.rowcount, 0))
+        return result
+
+
+class AsyncDBConnector:
+    """Asyncio counterpart of DBConnector, on psycopg 3 and its asynchronous connection pool.
+
+    Queries, placeholders (%s, %(name)s) and rows (dictionaries) are the same as with DBConnector,
+    so DAOs can share their SQL between the blocking and the async methods. Connections are only
+    awaited, never blocking the event loop: one worker serves as many requests as the pool allows.
+    """
+
+    # asyncio pools belong to one event loop: one registry of pools per loop
+    _pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, AsyncConnectionPool]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, db_connector: "DBConnector"):
+        """Initialize the connector with the settings of a DBConnector.
+
+        Parameters
+        ----------
+        db_connector : DBConnector
+            Connector whose database, schema and pool settings are used.
+        """
+        self.db_connector = db_connector
+
+    async def get_pool(self) -> AsyncConnectionPool:
+        """Return the pool of the running event loop for this database and schema, opening it on first use."""
+        db = self.db_connector
+        pools = self._pools.setdefault(asyncio.get_running_loop(), {})
+        pool = pools.get(db.pool_key)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                kwargs={
+                    "host": db.host,
+                    "port": db.port,
+                    "dbname": db.database,
+                    "user": db.user,
+                    "password": db.password,
+                    "options": f"-c search_path={db.schema}",
+                    "row_factory": dict_row,
+                    "cursor_factory": InstrumentedAsyncCursor,
+                },
+                min_size=db.pool_min_size,
+                max_size=db.pool_max_size,
+                timeout=db.pool_timeout,
+                open=False,
+            )
+            pools[db.pool_key] = pool
+        # Does nothing once the pool is open
+        await pool.open()
+        return pool
+
+    @classmethod
+    async def close_all(cls):
+        """Close the pools of the running event loop, e.g. when the application shuts down."""
+        pools = cls._pools.pop(asyncio.get_running_loop(), {})
+        for pool in pools.values():
+            await pool.close()
+
+    async def pool_stats(self) -> dict:
+        """Return the usage metrics of the connection pool of the running event loop."""
+        return (await self.get_pool()).get_stats()
+
+    def open_pool_stats(self) -> Optional[dict]:
+        """Return the usage metrics of the pools already opened in every event loop, added up.
+
+        Not a coroutine, so it can be read from outside the event loops (e.g. by /metrics).
+        The keys are the ones of DBConnector.pool_stats. None if no async query opened a pool yet.
+        """
+        key = self.db_connector.pool_key
+        pools = [loop_pools[key] for loop_pools in list(self._pools.values()) if key in loop_pools]
+        if not pools:
+            return None
+        totals: Counter = Counter()
+        for pool in pools:
+            totals.update(pool.get_stats())
+        return {
+            "max_size": totals["pool_max"],
+            "size": totals["pool_size"],
+            "idle": totals["pool_available"],
+            "in_use": totals["pool_size"] - totals["pool_available"],
+            "waiting": totals["requests_waiting"],
+            "checkouts": totals["requests_num"],
+            "checkout_timeouts": totals["requests_errors"],
+            "connections_created": totals["connections_num"],
+            "connections_discarded": totals["returns_bad"] + totals["connections_lost"],
+            "wait_time_total": totals["requests_wait_ms"] / 1000,
+        }
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Run several statements on one pooled connection, in a single transaction.
+
+        Yields a cursor. The transaction is committed when the block ends and
+        rolled back if it raises.
+        """
+        pool = await self.get_pool()
+        async with pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                yield cursor
+
+    async def sql_query(
+        self,
+        query: str,
+        data: Optional[Union[tuple, list, dict]] = None,
+        return_type: Optional[Literal["one", "all"]] = "one",
+    ):
+        """Run a query on a pooled connection and commit it, like DBConnector.sql_query."""
+        try:
+            async with self.transaction() as cursor:
+                await cursor.execute(query, data)
+                if return_type is None:
+                    return None
+                if return_type == "one":
+                    return await cursor.fetchone()
+                return await cursor.fetchall()
+        except Exception as e:
+            logger.error("Query failed: %s", e)
+            raise e
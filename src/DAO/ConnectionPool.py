@@ -0,0 +1,226 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections shared by every DBConnector of a process.
+
+    Connections are opened lazily up to max_size, kept open between queries and
+    checked before being handed out again.
+    """
+
+    _pools: Dict[tuple, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(
+        self,
+        connect_kwargs: dict,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ):
+        """Initialize the pool and open min_size connections.
+
+        Parameters
+        ----------
+        connect_kwargs : dict
+            Keyword arguments given to psycopg2.connect (host, port, database, user, password, options).
+        min_size : int
+            Number of connections opened upfront and kept idle.
+        max_size : int
+            Maximum number of connections open at the same time.
+        timeout : float
+            Maximum number of seconds to wait for a free connection before raising PoolError.
+        health_check_interval : float
+            A connection idle for more than this number of seconds is pinged before being reused.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: 0 <= min_size <= max_size and max_size >= 1 required")
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: List[tuple] = []  # (connection, time it was released)
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "checkouts": 0,
+            "checkout_timeouts": 0,
+            "health_check_failures": 0,
+            "wait_time_total": 0.0,
+        }
+        self._waiting = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    @classmethod
+    def get_pool(cls, key: tuple, connect_kwargs: dict, **pool_kwargs) -> "ConnectionPool":
+        """Return the pool registered for key, creating it on first use."""
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(connect_kwargs, **pool_kwargs)
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def find_pool(cls, key: tuple) -> Optional["ConnectionPool"]:
+        """Return the pool registered for key, or None if it was not created yet."""
+        with cls._pools_lock:
+            return cls._pools.get(key)
+
+    @classmethod
+    def close_all(cls):
+        """Close every registered pool and forget them."""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def _connect(self):
+        """Open a new physical connection."""
+        connection = psycopg2.connect(cursor_factory=RealDictCursor, **self.connect_kwargs)
+        with self._condition:
+            self._stats["connections_created"] += 1
+        return connection
+
+    def _discard(self, connection):
+        """Close a connection and free its slot. Must be called with the condition held."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._size -= 1
+        self._stats["connections_discarded"] += 1
+        self._condition.notify()
+
+    def _is_healthy(self, connection, released_at: float) -> bool:
+        """Check that a connection taken from the idle list can be reused.
+
+        Connections released recently are trusted, older ones are pinged with SELECT 1.
+        """
+        if connection.closed:
+            return False
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            with self._condition:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    def getconn(self):
+        """Check a connection out of the pool.
+
+        Raises
+        ------
+        PoolError
+            If the pool is closed or no connection is available within timeout seconds.
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            connection = None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise PoolError("Connection pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["checkout_timeouts"] += 1
+                        raise PoolError(f"No database connection available after {self.timeout}s")
+                    self._waiting += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                else:
+                    # Reserve the slot now, the connection is opened outside the lock
+                    self._size += 1
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif not self._is_healthy(connection, released_at):
+                with self._condition:
+                    self._discard(connection)
+                continue
+
+            with self._condition:
+                self._stats["checkouts"] += 1
+                self._stats["wait_time_total"] += time.monotonic() - start
+            return connection
+
+    def putconn(self, connection):
+        """Give a connection back to the pool, rolling back any unfinished transaction."""
+        if not connection.closed and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+        with self._condition:
+            if self._closed or connection.closed or connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                self._discard(connection)
+                return
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager checking a connection out and giving it back afterwards."""
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    def close(self):
+        """Close all idle connections. Connections in use are closed when given back."""
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._discard(connection)
+            self._closed = True
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Return a snapshot of the pool usage metrics."""
+        with self._condition:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                **self._stats,
+            }
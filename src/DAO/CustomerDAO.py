@@ -1,11 +1,18 @@
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from src.DAO.DBConnector import DBConnector
 from src.DAO.UserRepo import UserRepo
 from src.Model.Customer import Customer
 from src.utils.log_decorator import log
 
+CUSTOMER_NAMES_QUERY = """
+    SELECT c.id_customer, u.user_name
+    FROM customer c
+    JOIN users u ON c.id_user = u.id_user
+    WHERE c.id_customer = ANY(%s);
+"""
+
 
 class CustomerDAO:
     """Class providing access to the Customer table of the database"""
@@ -181,3 +188,38 @@ class CustomerDAO:
             return None
         return raw_customer["id_customer"]
 
+    @log
+    def get_user_names(self, customer_ids: List[int]) -> Dict[int, str]:
+        """Retrieve the usernames of several customers in a single query.
+
+        Parameters
+        ----------
+        customer_ids : List[int]
+            The IDs of the customers.
+
+        Returns
+        -------
+        Dict[int, str]
+            A mapping from customer ID to username. IDs that do not exist are missing.
+            Returns an empty dict if an error occurs.
+        """
+        if not customer_ids:
+            return {}
+        try:
+            rows = self.db_connector.sql_query(CUSTOMER_NAMES_QUERY, [list(customer_ids)], "all")
+            return {row["id_customer"]: row["user_name"] for row in rows}
+        except Exception as e:
+            logging.info(e)
+            return {}
+
+    @log
+    async def get_user_names_async(self, customer_ids: List[int]) -> Dict[int, str]:
+        """Retrieve the usernames of several customers like get_user_names, without blocking the event loop."""
+        if not customer_ids:
+            return {}
+        try:
+            rows = await self.db_connector.async_connector.sql_query(CUSTOMER_NAMES_QUERY, [list(customer_ids)], "all")
+            return {row["id_customer"]: row["user_name"] for row in rows}
+        except Exception as e:
+            logging.info(e)
+            return {}
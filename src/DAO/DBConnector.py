@@ -1,12 +1,21 @@
+import logging
 import os
-from typing import Literal, Optional, Union
+import uuid
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, Union
 
-import psycopg2
 from dotenv import load_dotenv
-from psycopg2.extras import RealDictCursor
+
+from src.DAO.ConnectionPool import ConnectionPool
+from src.DAO.QueryStats import InstrumentedCursor, query_stats
+
+if TYPE_CHECKING:
+    from src.DAO.AsyncDBConnector import AsyncDBConnector
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class DBConnector:
     def __init__(self, config=None, test: bool = False):
@@ -17,6 +26,9 @@ class DBConnector:
             self.user = config["user"]
             self.password = config["password"]
             self.schema = config["schema"]
+            self.pool_min_size = int(config.get("pool_min_size", 1))
+            self.pool_max_size = int(config.get("pool_max_size", 10))
+            self.pool_timeout = float(config.get("pool_timeout", 30))
         else:
             self.host = os.environ["POSTGRES_HOST"]
             self.port = os.environ["POSTGRES_PORT"]
@@ -24,37 +36,108 @@ class DBConnector:
             self.user = os.environ["POSTGRES_USER"]
             self.password = os.environ["POSTGRES_PASSWORD"]
             self.schema = os.environ["POSTGRES_SCHEMA"] if not test else "test"
+            self.pool_min_size = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 1))
+            self.pool_max_size = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 10))
+            self.pool_timeout = float(os.environ.get("POSTGRES_POOL_TIMEOUT", 30))
+        self._async_connector = None
+
+    @property
+    def pool_key(self) -> tuple:
+        """Key of the connection pool, the same for every DBConnector pointing to the same database and schema."""
+        return (self.host, str(self.port), self.database, self.user, self.schema)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool shared by every DBConnector pointing to the same database and schema."""
+        return ConnectionPool.get_pool(
+            self.pool_key,
+            {
+                "host": self.host,
+                "port": self.port,
+                "database": self.database,
+                "user": self.user,
+                "password": self.password,
+                "options": f"-c search_path={self.schema}",
+            },
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            timeout=self.pool_timeout,
+        )
+
+    @property
+    def async_connector(self) -> "AsyncDBConnector":
+        """Asyncio connector to the same database and schema, for the async DAO methods."""
+        if self._async_connector is None:
+            # psycopg 3 is only imported by the code paths that use it
+            from src.DAO.AsyncDBConnector import AsyncDBConnector
+
+            self._async_connector = AsyncDBConnector(self)
+        return self._async_connector
+
+    def pool_stats(self) -> dict:
+        """Return the usage metrics of the connection pool."""
+        return self.pool.stats()
+
+    def open_pool_stats(self) -> Optional[dict]:
+        """Return the usage metrics of the connection pool, or None if no query opened it yet."""
+        pool = ConnectionPool.find_pool(self.pool_key)
+        return pool.stats() if pool is not None else None
+
+    def query_stats(self) -> dict:
+        """Return the duration aggregates of every query executed in this process, by SQL fingerprint."""
+        return query_stats.snapshot()
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one pooled connection, in a single transaction.
+
+        Yields a cursor. The transaction is committed when the block ends and
+        rolled back if it raises.
+        """
+        with self.pool.connection() as connection:
+            with connection:
+                with connection.cursor(cursor_factory=InstrumentedCursor) as cursor:
+                    yield cursor
 
     def sql_query(
         self,
         query: str,
         data: Optional[Union[tuple, list, dict]] = None,
-        return_type: Union[Literal["one"], Literal["all"]] = "one",
+        return_type: Optional[Literal["one", "all"]] = "one",
     ):
         try:
-            with psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                options=f"-c search_path={self.schema}",
-                cursor_factory=RealDictCursor,
-            ) as connection:
-                with connection.cursor() as cursor:
-                    cursor.execute(query, data)
-                    if return_type is None:
-                        connection.commit()
-                        return
-                    if return_type in ["one", "all"]:
-                        result = (
-                            cursor.fetchone()
-                            if return_type == "one"
-                            else cursor.fetchall()
-                        )
-                        connection.commit()
-                        return result
+            with self.pool.connection() as connection:
+                with connection:
+                    with connection.cursor(cursor_factory=InstrumentedCursor) as cursor:
+                        cursor.execute(query, data)
+                        if return_type is None:
+                            return
+                        if return_type in ["one", "all"]:
+                            return cursor.fetchone() if return_type == "one" else cursor.fetchall()
+        except Exception as e:
+            logger.error("Query failed: %s", e)
+            raise e
+
+    def stream_query(
+        self,
+        query: str,
+        data: Optional[Union[tuple, list, dict]] = None,
+        fetch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Yield the rows of a query one by one through a server-side (named) cursor.
+
+        Rows are fetched from the server fetch_size at a time, so memory use does not
+        depend on the number of rows. The pooled connection stays checked out until
+        the iterator is exhausted or closed.
+        """
+        try:
+            with self.pool.connection() as connection:
+                with connection:
+                    name = f"stream_{uuid.uuid4().hex}"
+                    with connection.cursor(name=name, cursor_factory=InstrumentedCursor) as cursor:
+                        cursor.itersize = fetch_size
+                        cursor.execute(query, data)
+                        yield from cursor
         except Exception as e:
-            print("ERROR")
-            print(e)
+            logger.error("Query failed: %s", e)
             raise e
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from src.DAO.DBConnector import DBConnector
 from src.DAO.UserRepo import UserRepo
@@ -7,6 +7,13 @@ from src.Model.Driver import Driver
 from src.utils.log_decorator import log
 from src.utils.securite import hash_password
 
+DRIVER_NAMES_QUERY = """
+    SELECT d.id_driver, u.user_name
+    FROM driver d
+    JOIN users u ON d.id_user = u.id_user
+    WHERE d.id_driver = ANY(%s);
+"""
+
 
 class DriverDAO:
     """Class providing access to the Driver table of the database"""
@@ -284,3 +291,39 @@ class DriverDAO:
         if raw_driver is None:
             return None
         return raw_driver["id_driver"]
+
+    @log
+    def get_user_names(self, driver_ids: List[int]) -> Dict[int, str]:
+        """Retrieve the usernames of several drivers in a single query.
+
+        Parameters
+        ----------
+        driver_ids : List[int]
+            The IDs of the drivers.
+
+        Returns
+        -------
+        Dict[int, str]
+            A mapping from driver ID to username. IDs that do not exist are missing.
+            Returns an empty dict if an error occurs.
+        """
+        if not driver_ids:
+            return {}
+        try:
+            rows = self.db_connector.sql_query(DRIVER_NAMES_QUERY, [list(driver_ids)], "all")
+            return {row["id_driver"]: row["user_name"] for row in rows}
+        except Exception as e:
+            logging.info(e)
+            return {}
+
+    @log
+    async def get_user_names_async(self, driver_ids: List[int]) -> Dict[int, str]:
+        """Retrieve the usernames of several drivers like get_user_names, without blocking the event loop."""
+        if not driver_ids:
+            return {}
+        try:
+            rows = await self.db_connector.async_connector.sql_query(DRIVER_NAMES_QUERY, [list(driver_ids)], "all")
+            return {row["id_driver"]: row["user_name"] for row in rows}
+        except Exception as e:
+            logging.info(e)
+            return {}
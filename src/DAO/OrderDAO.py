@@ -1,21 +1,33 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from src.DAO.DBConnector import DBConnector
 from src.DAO.ProductDAO import ProductDAO
 from src.Model.Address import Address
 from src.Model.Order import Order
+from src.Model.OrderLine import OrderLine
 from src.utils.log_decorator import log
 
+# Addresses and products of several orders, shared by the blocking and the async methods
+ORDERS_ADDRESSES_QUERY = "SELECT * FROM address WHERE id_address = ANY(%s)"
+ORDERS_PRODUCTS_QUERY = """
+    SELECT op.id_order, p.id_product, p.name, p.price, p.product_type, op.quantity
+    FROM order_products op
+    JOIN product p ON p.id_product = op.id_product
+    WHERE op.id_order = ANY(%s)
+"""
+
 
 class OrderDAO:
     """Class providing access to the Order table of the database"""
 
-    def __init__(self, db_connector=None):
-        """Initialize OrderDAO with a DB connector."""
+    def __init__(self, db_connector=None, productdao: Optional[ProductDAO] = None):
+        """Initialize OrderDAO with a DB connector, and optionally the ProductDAO to reuse."""
         self.db_connector = db_connector if db_connector is not None else DBConnector()
-        self.productdao = ProductDAO(self.db_connector)
+        self.productdao = productdao if productdao is not None else ProductDAO(self.db_connector)
 
     @log
     def create_order(self, order: Order) -> Optional[int]:
@@ -62,15 +74,106 @@ class OrderDAO:
             print(f"Error creating order: {e}")
             return None
 
+    @log
+    def create_order_with_products(self, order: Order, lines: List[OrderLine]) -> Optional[int]:
+        """Create an order together with all its products in a single transaction.
+
+        This method:
+            1) Decrements the stock of every product with one multi-row UPDATE.
+            2) Inserts the order, with nb_items and total_amount computed from the lines
+               (10% discount on promotion lines).
+            3) Inserts all the order_products rows with one multi-row INSERT.
+        If a product is unknown or out of stock, nothing is written.
+
+        Parameters
+        ----------
+        order : Order
+            The order to create. Its nb_items and total_amount are overwritten.
+        lines : List[OrderLine]
+            The products of the order. A product may appear in several lines.
+
+        Returns
+        -------
+        int or None
+            The ID of the newly created order if successful.
+            None if a product is missing or out of stock, or an error occurs.
+        """
+        quantities: Dict[int, int] = {}
+        for line in lines:
+            quantities[line.id_product] = quantities.get(line.id_product, 0) + line.quantity
+        product_ids = list(quantities)
+        product_quantities = [quantities[id_product] for id_product in product_ids]
+
+        try:
+            with self.db_connector.transaction() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE product p
+                    SET stock = p.stock - l.quantity
+                    FROM unnest(%(products)s::int[], %(quantities)s::int[]) AS l(id_product, quantity)
+                    WHERE p.id_product = l.id_product AND p.stock >= l.quantity
+                    RETURNING p.id_product, p.price
+                    """,
+                    {"products": product_ids, "quantities": product_quantities},
+                )
+                prices = {row["id_product"]: row["price"] for row in cursor.fetchall()}
+                if len(prices) != len(product_ids):
+                    raise ValueError(f"Stock insuffisant pour les produits {set(product_ids) - set(prices)}")
+
+                order.nb_items = sum(product_quantities)
+                order.total_amount = float(
+                    sum(
+                        prices[line.id_product] * line.quantity * (Decimal("0.9") if line.promotion else 1)
+                        for line in lines
+                    )
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO orders (id_customer, id_driver, id_address, date, status,
+                                        total_amount, payment_method, nb_items)
+                    VALUES (%(id_customer)s, %(id_driver)s, %(id_address)s, %(date)s,
+                            %(status)s, %(total_amount)s, %(payment_method)s, %(nb_items)s)
+                    RETURNING id_order;
+                    """,
+                    {
+                        "id_customer": order.id_customer,
+                        "id_driver": order.id_driver,
+                        "id_address": order.id_address,
+                        "date": order.date,
+                        "status": order.status,
+                        "total_amount": order.total_amount,
+                        "payment_method": order.payment_method,
+                        "nb_items": order.nb_items,
+                    },
+                )
+                order.id_order = cursor.fetchone()["id_order"]
+
+                cursor.execute(
+                    """
+                    INSERT INTO order_products (id_order, id_product, quantity)
+                    SELECT %(order)s, l.id_product, l.quantity
+                    FROM unnest(%(products)s::int[], %(quantities)s::int[]) AS l(id_product, quantity)
+                    """,
+                    {"order": order.id_order, "products": product_ids, "quantities": product_quantities},
+                )
+            return order.id_order
+
+        except Exception as e:
+            logging.error(f"Erreur create_order_with_products: {e}")
+            order.id_order = None
+            return None
+
     @log
     def add_product(self, order_id: int, product_id: int, quantity: int = 1, promotion: bool = False) -> bool:
         """Add a product to an existing order, update stock, and adjust order totals.
 
-        This method:
-            1) Decrements the product stock via ProductDAO.
-            2) Inserts the product into the order_products table.
+        This method runs a single statement, hence a single transaction and round trip, that:
+            1) Decrements the product stock if it is sufficient and the order exists.
+            2) Inserts the product into the order_products table, or increases its quantity
+               if it is already in the order (INSERT ... ON CONFLICT).
             3) Updates the order's nb_items and total_amount fields.
             4) Applies a 10% discount if promotion=True.
+        If any step fails, nothing is written.
 
         Parameters
         ----------
@@ -87,79 +190,51 @@ class OrderDAO:
         -------
         bool
             True if the product was successfully added and the order updated.
-            False if stock is insufficient or an error occurs (stock is restored in that case).
+            False if stock is insufficient, the order or product does not exist, or an error occurs.
         """
         try:
-            success = self.productdao.decrement_stock(product_id, quantity)
-            if not success:
-                logging.warning(f"Stock insuffisant pour le produit {product_id}")
-                return False
-
-            already_here = self.db_connector.sql_query(
+            res = self.db_connector.sql_query(
                 """
-                SELECT * FROM order_products WHERE id_order = %(order)s and id_product = %(product)s""",
-                {"order" : order_id, "product" : product_id},
-                "one"
-            )
-
-            if already_here is None :
-
-                self.db_connector.sql_query(
-                    """
+                WITH stock AS (
+                    UPDATE product
+                    SET stock = stock - %(quantity)s
+                    WHERE id_product = %(product)s
+                      AND stock >= %(quantity)s
+                      AND EXISTS (SELECT 1 FROM orders WHERE id_order = %(order)s)
+                    RETURNING id_product, price
+                ),
+                line AS (
                     INSERT INTO order_products (id_order, id_product, quantity)
-                    VALUES (%s, %s, %s)
-                    """,
-                    [order_id, product_id, quantity],
-                    return_type=None,
+                    SELECT %(order)s, id_product, %(quantity)s FROM stock
+                    ON CONFLICT (id_order, id_product)
+                    DO UPDATE SET quantity = order_products.quantity + EXCLUDED.quantity
+                    RETURNING id_order
                 )
-
-            else :
-                quantity_before = self.db_connector.sql_query(
-                    """select quantity from order_products where id_order = %(order)s and id_product = %(product)s;""",
-                    {"order" : order_id, "product" : product_id},
-                    "one"
-                )
-
-                new_quantity = quantity_before['quantity'] + quantity
-
-                self.db_connector.sql_query(
-                    """update order_products set quantity = %(quantity)s
-                    where id_order = %(order)s and id_product = %(product)s;""",
-                    {"quantity" : new_quantity,
-                    "order" : order_id,
-                    "product" : product_id},
-                    return_type = None
-                )
-
-            product = self.db_connector.sql_query(
-                "SELECT price FROM product WHERE id_product = %s",
-                [product_id],
-                "one",
-            )
-            if not product:
-                raise Exception("Produit introuvable pour mise à jour commande")
-
-            if promotion:
-                total_add = float(product["price"]) * quantity * 0.9
-            else:
-                total_add = float(product["price"]) * quantity
-
-            self.db_connector.sql_query(
-                """
                 UPDATE orders
-                SET nb_items = COALESCE(nb_items, 0) + %s,
-                    total_amount = COALESCE(total_amount, 0) + %s
-                WHERE id_order = %s
+                SET nb_items = COALESCE(nb_items, 0) + %(quantity)s,
+                    total_amount = COALESCE(total_amount, 0)
+                                   + (SELECT price FROM stock) * %(quantity)s * %(factor)s
+                WHERE id_order = %(order)s
+                  AND EXISTS (SELECT 1 FROM line)
+                RETURNING id_order;
                 """,
-                [quantity, total_add, order_id],
-                return_type=None,
+                {
+                    "order": order_id,
+                    "product": product_id,
+                    "quantity": quantity,
+                    "factor": Decimal("0.9") if promotion else Decimal(1),
+                },
+                "one",
             )
-
+            if res is None:
+                logging.warning(
+                    f"Produit {product_id} non ajouté à la commande {order_id} (stock insuffisant ou introuvable)"
+                )
+                return False
             return True
 
         except Exception as e:
             logging.error(f"Erreur add_product: {e}")
-            self.productdao.increment_stock(product_id, quantity)
             return False
 
     @log
@@ -348,16 +423,64 @@ class OrderDAO:
             raw_order = self.db_connector.sql_query("SELECT * FROM orders WHERE id_order = %s", [order_id], "one")
             if not raw_order:
                 return None
+            return self._hydrate_orders([raw_order])[0]
 
-            raw_address = self.db_connector.sql_query(
-                "SELECT * FROM address WHERE id_address = %s",
-                [raw_order["id_address"]],
-                "one",
-            )
-            address = Address(**raw_address) if raw_address else None
+        except Exception as e:
+            print(f"Error fetching order: get by id {e}")
+            return None
+
+    def _hydrate_orders(self, raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the order dictionaries of several orders with a fixed number of queries.
+
+        The addresses and the products of all the orders are fetched in one query each,
+        instead of three queries per order.
+
+        Parameters
+        ----------
+        raw_orders : List[Dict[str, Any]]
+            Rows of the orders table, in the order they should be returned.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            A list of dictionaries with the keys "order", "address" and "products",
+            in the same order as raw_orders.
+        """
+        if not raw_orders:
+            return []
 
-            products = self.get_order_products(order_id)
+        address_ids = list({o["id_address"] for o in raw_orders})
+        raw_addresses = self.db_connector.sql_query(ORDERS_ADDRESSES_QUERY, [address_ids], "all")
+        order_ids = [o["id_order"] for o in raw_orders]
+        raw_products = self.db_connector.sql_query(ORDERS_PRODUCTS_QUERY, [order_ids], "all")
+        return self._build_orders(raw_orders, raw_addresses, raw_products)
 
+    async def _hydrate_orders_async(self, raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same as _hydrate_orders, with the addresses and products queries run concurrently."""
+        if not raw_orders:
+            return []
+
+        address_ids = list({o["id_address"] for o in raw_orders})
+        order_ids = [o["id_order"] for o in raw_orders]
+        connector = self.db_connector.async_connector
+        raw_addresses, raw_products = await asyncio.gather(
+            connector.sql_query(ORDERS_ADDRESSES_QUERY, [address_ids], "all"),
+            connector.sql_query(ORDERS_PRODUCTS_QUERY, [order_ids], "all"),
+        )
+        return self._build_orders(raw_orders, raw_addresses, raw_products)
+
+    @staticmethod
+    def _build_orders(
+        raw_orders: List[Dict[str, Any]], raw_addresses: List[Dict[str, Any]], raw_products: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Assemble the rows of the orders with the rows of their addresses and products."""
+        addresses = {a["id_address"]: Address(**a) for a in raw_addresses}
+        products = {o["id_order"]: [] for o in raw_orders}
+        for row in raw_products:
+            products[row.pop("id_order")].append(row)
+
+        result = []
+        for raw_order in raw_orders:
             order_obj = Order(
                 id_order=raw_order["id_order"],
                 id_customer=raw_order["id_customer"],
@@ -369,12 +492,14 @@ class OrderDAO:
                 total_amount=float(raw_order["total_amount"]),
                 payment_method=raw_order["payment_method"],
             )
-
-            return {"order": order_obj, "address": address, "products": products}
-
-        except Exception as e:
-            print(f"Error fetching order: get by id {e}")
-            return None
+            result.append(
+                {
+                    "order": order_obj,
+                    "address": addresses.get(raw_order["id_address"]),
+                    "products": products[raw_order["id_order"]],
+                }
+            )
+        return result
 
     @log
     def list_all_orders(self) -> List[Dict[str, Any]]:
@@ -391,17 +516,202 @@ class OrderDAO:
         """
         try:
             raw_orders = self.db_connector.sql_query("SELECT * FROM orders", [], "all")
-            result = []
-            for o in raw_orders:
-                order_id = o['id_order']
-                order_data = self.get_by_id(order_id)
-                if order_data:
-                    result.append(order_data)
-            return result
+            return self._hydrate_orders(raw_orders)
         except Exception as e:
             print(f"Error listing all orders: list all orders {e}")
             return []
 
+    @log
+    async def list_all_orders_async(self) -> List[Dict[str, Any]]:
+        """Retrieve all orders along with their addresses and products, without blocking the event loop.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Same as list_all_orders.
+        """
+        try:
+            raw_orders = await self.db_connector.async_connector.sql_query("SELECT * FROM orders", [], "all")
+            return await self._hydrate_orders_async(raw_orders)
+        except Exception as e:
+            print(f"Error listing all orders: list all orders {e}")
+            return []
+
+    @log
+    def count_orders_by_status(self) -> Dict[str, int]:
+        """Count the orders of each status.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of orders by status. Statuses without any order are absent.
+            Returns an empty dictionary if an error occurs.
+        """
+        try:
+            rows = self.db_connector.sql_query("SELECT status, COUNT(*) AS nb FROM orders GROUP BY status", [], "all")
+            return {row["status"]: row["nb"] for row in rows}
+        except Exception as e:
+            print(f"Error counting orders by status: {e}")
+            return {}
+
+    @log
+    def list_orders_page(
+        self,
+        limit: int,
+        status: Optional[str] = None,
+        id_customer: Optional[int] = None,
+        id_driver: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve one page of orders, most recent first, using keyset pagination on (date, id_order).
+
+        All filters are applied in SQL, so the cost of a page does not depend on the size of the history.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum number of orders returned.
+        status : str, optional
+            Only return orders with this status.
+        id_customer : int, optional
+            Only return orders placed by this customer.
+        id_driver : int, optional
+            Only return orders assigned to this driver.
+        date_from : datetime, optional
+            Only return orders dated on or after this timestamp.
+        date_to : datetime, optional
+            Only return orders dated strictly before this timestamp.
+        after : Tuple[datetime, int], optional
+            (date, id_order) of the last order of the previous page. Only older orders are returned.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            A list of dictionaries with the keys "order", "address" and "products",
+            sorted by date then id_order, descending.
+            Returns an empty list if no orders are found or an error occurs.
+        """
+        query, params = self._orders_page_query(limit, status, id_customer, id_driver, date_from, date_to, after)
+        try:
+            raw_orders = self.db_connector.sql_query(query, params, "all")
+            return self._hydrate_orders(raw_orders)
+        except Exception as e:
+            print(f"Error listing orders page: {e}")
+            return []
+
+    @log
+    async def list_orders_page_async(
+        self,
+        limit: int,
+        status: Optional[str] = None,
+        id_customer: Optional[int] = None,
+        id_driver: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve one page of orders like list_orders_page, without blocking the event loop.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Same as list_orders_page.
+        """
+        query, params = self._orders_page_query(limit, status, id_customer, id_driver, date_from, date_to, after)
+        try:
+            raw_orders = await self.db_connector.async_connector.sql_query(query, params, "all")
+            return await self._hydrate_orders_async(raw_orders)
+        except Exception as e:
+            print(f"Error listing orders page: {e}")
+            return []
+
+    @staticmethod
+    def _orders_page_query(
+        limit: int,
+        status: Optional[str],
+        id_customer: Optional[int],
+        id_driver: Optional[int],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        after: Optional[Tuple[datetime, int]],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """SQL query and parameters of a page of orders, shared by list_orders_page and its async version."""
+        conditions = []
+        params: Dict[str, Any] = {"limit": limit}
+        if status is not None:
+            conditions.append("status = %(status)s")
+            params["status"] = status
+        if id_customer is not None:
+            conditions.append("id_customer = %(id_customer)s")
+            params["id_customer"] = id_customer
+        if id_driver is not None:
+            conditions.append("id_driver = %(id_driver)s")
+            params["id_driver"] = id_driver
+        if date_from is not None:
+            conditions.append("date >= %(date_from)s")
+            params["date_from"] = date_from
+        if date_to is not None:
+            conditions.append("date < %(date_to)s")
+            params["date_to"] = date_to
+        if after is not None:
+            conditions.append("(date, id_order) < (%(after_date)s, %(after_id)s)")
+            params["after_date"], params["after_id"] = after
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+                SELECT * FROM orders
+                {where}
+                ORDER BY date DESC, id_order DESC
+                LIMIT %(limit)s
+                """
+        return query, params
+
+    def stream_orders(self, fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream every order, oldest first, with its address, usernames and products.
+
+        Each row is built by a single query read through a server-side cursor,
+        so the whole history is never loaded in memory.
+
+        Parameters
+        ----------
+        fetch_size : int, optional
+            Number of rows fetched from the server per round trip (default is 1000).
+
+        Yields
+        ------
+        Dict[str, Any]
+            One row per order with the order columns, address, city, postal_code,
+            username_customer, username_driver, products_name and products_quantity.
+        """
+        return self.db_connector.stream_query(
+            """
+            SELECT o.id_order, o.status, o.total_amount, o.nb_items, o.date, o.payment_method,
+                   o.id_customer, cu.user_name AS username_customer,
+                   o.id_driver, du.user_name AS username_driver,
+                   a.address, a.city, a.postal_code,
+                   COALESCE(items.products_name, ARRAY[]::varchar[]) AS products_name,
+                   COALESCE(items.products_quantity, ARRAY[]::int[]) AS products_quantity
+            FROM orders o
+            JOIN address a ON a.id_address = o.id_address
+            LEFT JOIN customer c ON c.id_customer = o.id_customer
+            LEFT JOIN users cu ON cu.id_user = c.id_user
+            LEFT JOIN driver d ON d.id_driver = o.id_driver
+            LEFT JOIN users du ON du.id_user = d.id_user
+            LEFT JOIN LATERAL (
+                SELECT array_agg(p.name ORDER BY p.id_product) AS products_name,
+                       array_agg(op.quantity ORDER BY p.id_product) AS products_quantity
+                FROM order_products op
+                JOIN product p ON p.id_product = op.id_product
+                WHERE op.id_order = o.id_order
+            ) items ON TRUE
+            ORDER BY o.date, o.id_order
+            """,
+            None,
+            fetch_size=fetch_size,
+        )
+
     @log
     def get_assigned_orders(self, driver_id: int) -> List[Dict[str, Any]]:
         """Retrieve all orders ready that are assigned to a specific driver.
@@ -426,7 +736,7 @@ class OrderDAO:
                 [driver_id],
                 "all",
             )
-            return [self.get_by_id(o["id_order"]) for o in raw_orders]
+            return self._hydrate_orders(raw_orders)
         except Exception as e:
             print(f"Error fetching assigned orders: {e}")
             return []
@@ -464,6 +774,50 @@ class OrderDAO:
             print(f"Error assigning order to driver: {e}")
             return False
 
+    @log
+    def claim_next_ready_order(self, id_driver: int, candidate_ids: Optional[List[int]] = None) -> Optional[int]:
+        """Atomically assign the oldest unassigned ready order to a driver and mark it as 'On the way'.
+
+        The order is selected with FOR UPDATE SKIP LOCKED: drivers claiming at the same time
+        each get a different order, without waiting for one another.
+
+        Parameters
+        ----------
+        id_driver : int
+            The ID of the driver claiming an order.
+        candidate_ids : List[int], optional
+            Only claim one of these orders (for example the ones close enough for a bike).
+            All ready orders are candidates if None.
+
+        Returns
+        -------
+        int or None
+            The ID of the claimed order.
+            None if no order is available or an error occurs.
+        """
+        candidates_condition = "AND id_order = ANY(%(candidates)s)" if candidate_ids is not None else ""
+        try:
+            res = self.db_connector.sql_query(
+                f"""
+                UPDATE orders
+                SET id_driver = %(driver)s, status = 'On the way', date = %(now)s
+                WHERE id_order = (
+                    SELECT id_order FROM orders
+                    WHERE status = 'Ready' AND id_driver IS NULL {candidates_condition}
+                    ORDER BY date, id_order
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id_order
+                """,
+                {"driver": id_driver, "now": datetime.now(), "candidates": candidate_ids},
+                "one",
+            )
+            return res["id_order"] if res else None
+        except Exception as e:
+            print(f"Error claiming order: {e}")
+            return None
+
     @log
     def get_orders_by_id_user(self, id_customer: int):
         """Retrieve all orders placed by a specific customer, including their products and address.
@@ -486,19 +840,14 @@ class OrderDAO:
             raw_orders = self.db_connector.sql_query(
                 "SELECT * FROM orders WHERE id_customer = %s", [id_customer], "all"
             )
-            result = []
-            for o in raw_orders:
-                order_data = self.get_by_id(o["id_order"])
-                if order_data:
-                    result.append(order_data)
-            return result
+            return self._hydrate_orders(raw_orders)
         except Exception as e:
             print(f"Error listing all orders: {e}")
             return []
 
 
     def list_all_orders_ready(self) -> List[Dict[str, Any]]:
-        """Retrieve all orders that are marked as 'Ready' along with their associated addresses and products.
+        """Retrieve all orders that are marked as 'Ready', oldest first, along with their addresses and products.
 
         Returns
         -------
@@ -511,14 +860,9 @@ class OrderDAO:
         """
         try:
             raw_orders = self.db_connector.sql_query(
-                "SELECT * FROM orders WHERE status = 'Ready'", [], "all"
+                "SELECT * FROM orders WHERE status = 'Ready' ORDER BY date, id_order", [], "all"
             )
-            result = []
-            for o in raw_orders:
-                order_data = self.get_by_id(o["id_order"])
-                if order_data:
-                    result.append(order_data)
-            return result
+            return self._hydrate_orders(raw_orders)
         except Exception as e:
             print(f"Error listing all orders ready: {e}")
             return []
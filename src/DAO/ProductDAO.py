@@ -215,6 +215,7 @@ class ProductDAO:
         -------
         list[dict]
             A list of dictionaries, each containing the fields:
+            - id_product
             - name
             - description
             - price
@@ -224,7 +225,7 @@ class ProductDAO:
         Returns an empty list if no products are available or if an error occurs."""
         try:
             raw = self.db_connector.sql_query(
-                "SELECT name, description, price, product_type, stock FROM product WHERE stock > 0",
+                "SELECT id_product, name, description, price, product_type, stock FROM product WHERE stock > 0",
                 [],
                 "all",
             )
@@ -260,6 +261,20 @@ class ProductDAO:
             [product_id],
             "one"
         )
+        return self._to_product(product_id, raw_product)
+
+    @log
+    async def get_product_by_id_async(self, product_id: int):
+        """Returns product where id_product = product_id, without blocking the event loop"""
+        raw_product = await self.db_connector.async_connector.sql_query(
+            """select * from product where id_product = %s;""",
+            [product_id],
+            "one",
+        )
+        return self._to_product(product_id, raw_product)
+
+    @staticmethod
+    def _to_product(product_id: int, raw_product):
         if raw_product is None:
             return None
         product = Product(
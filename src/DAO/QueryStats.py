@@ -0,0 +1,164 @@
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the duration histogram buckets, in seconds
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """Normalize a query so that executions differing only by their values are grouped together.
+
+    Comments are removed, literals and placeholders are replaced with ?, lists of values with
+    (...) and whitespace is collapsed.
+
+    Parameters
+    ----------
+    query : str
+        SQL query, as given to cursor.execute.
+
+    Returns
+    -------
+    str
+        e.g. "SELECT * FROM orders WHERE id_order = ? AND status IN (...)"
+    """
+    query = _COMMENTS.sub(" ", query)
+    query = _STRINGS.sub("?", query)
+    query = _PLACEHOLDERS.sub("?", query)
+    query = _NUMBERS.sub("?", query)
+    query = _VALUE_LISTS.sub("(...)", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class QueryStats:
+    """Thread-safe in-process aggregates of the query durations, grouped by fingerprint."""
+
+    def __init__(self, slow_threshold: Optional[float] = None):
+        """Initialize empty statistics.
+
+        Parameters
+        ----------
+        slow_threshold : float, optional
+            Queries lasting at least this number of seconds are logged as warnings. None disables the slow-query log.
+        """
+        self.slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        self._queries: Dict[str, dict] = {}
+
+    def record(self, query: str, duration: float, rows: int = 0, error: bool = False):
+        """Add one execution of a query.
+
+        Parameters
+        ----------
+        query : str
+            SQL query executed.
+        duration : float
+            Execution time in seconds.
+        rows : int
+            Number of rows returned or affected.
+        error : bool
+            True if the query failed.
+        """
+        key = fingerprint(query)
+        bucket = bisect_left(HISTOGRAM_BUCKETS, duration)
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is None:
+                entry = self._queries[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "buckets": [0] * (len(HISTOGRAM_BUCKETS) + 1),
+                }
+            entry["count"] += 1
+            entry["errors"] += error
+            entry["rows"] += rows
+            entry["total_time"] += duration
+            entry["max_time"] = max(entry["max_time"], duration)
+            entry["buckets"][bucket] += 1
+
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            logger.warning("Slow query: %.1f ms, %d rows - %s", duration * 1000, rows, key)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return a copy of the aggregates by fingerprint.
+
+        Returns
+        -------
+        dict
+            fingerprint -> count, errors, rows, total_time, mean_time and max_time (seconds), and
+            buckets, the cumulative number of executions lasting at most each bound ("+Inf" for all).
+        """
+        with self._lock:
+            entries = {key: {**entry, "buckets": list(entry["buckets"])} for key, entry in self._queries.items()}
+        for entry in entries.values():
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip((*HISTOGRAM_BUCKETS, "+Inf"), entry["buckets"], strict=True):
+                cumulative += count
+                buckets[bound] = cumulative
+            entry["buckets"] = buckets
+            entry["mean_time"] = entry["total_time"] / entry["count"]
+        return entries
+
+    def top(self, n: int = 10, key: str = "total_time") -> List[dict]:
+        """Return the n queries with the highest value of key (total_time, max_time, mean_time, count...)."""
+        entries = [{"query": query, **entry} for query, entry in self.snapshot().items()]
+        return sorted(entries, key=lambda entry: entry[key], reverse=True)[:n]
+
+    def reset(self):
+        """Forget every recorded query."""
+        with self._lock:
+            self._queries.clear()
+
+
+def _slow_threshold_from_env() -> Optional[float]:
+    """POSTGRES_SLOW_QUERY_MS in seconds, 500 ms by default. An empty value disables the slow-query log."""
+    value = os.getenv("POSTGRES_SLOW_QUERY_MS", "500")
+    return float(value) / 1000 if value else None
+
+
+# Statistics of every query executed through a DBConnector of this process
+query_stats = QueryStats(slow_threshold=_slow_threshold_from_env())
+
+
+class InstrumentedCursor(RealDictCursor):
+    """RealDictCursor recording the duration and row count of each execute in query_stats."""
+
+    def execute(self, query, vars=None):  # noqa: A002 - same signature as psycopg2
+        start = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            query_stats.record(self._query_text(query), time.perf_counter() - start, error=True)
+            raise
+        # rowcount is -1 for server-side cursors, whose rows are only known once fetched
+        query_stats.record(self._query_text(query), time.perf_counter() - start, max(self.rowcount, 0))
+        return result
+
+    def _query_text(self, query) -> str:
+        """Text of a query given as a string, bytes or a psycopg2.sql object."""
+        if isinstance(query, str):
+            return query
+        if isinstance(query, bytes):
+            return query.decode()
+        return query.as_string(self)
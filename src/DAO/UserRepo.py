@@ -3,6 +3,7 @@ from typing import Optional
 
 from src.Model.User import User
 from src.utils.log_decorator import log
+from src.utils.principal_cache import principal_cache
 
 from .DBConnector import DBConnector
 
@@ -75,6 +76,7 @@ class UserRepo:
                 {"user_id": user_id},
                 "one",
             )
+            principal_cache.invalidate_user(user_id)
             return res is not None
         except Exception as e:
             logging.info(e)
@@ -203,6 +205,7 @@ class UserRepo:
             },
             "one",
             )
+            principal_cache.invalidate_user(user.id)
             return res is not None
         except Exception as e:
             logging.info(e)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+
+class OrderLine(BaseModel):
+    """
+    Class representing one line of an order being placed.
+
+    Attributes
+    ----------
+    id_product : int
+                The ID of the ordered product.
+    quantity : int
+                The number of units ordered. Must be strictly greater than 0.
+    promotion : bool
+                Whether the line is part of a menu and gets the 10% discount. Defaults to False.
+    """
+
+    id_product: int
+    quantity: int = Field(default=1, gt=0)
+    promotion: bool = False
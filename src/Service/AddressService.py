@@ -1,4 +1,8 @@
+from typing import Dict, List
+
 from src.Model.Address import Address
+from src.Service.Google_Maps.cache import normalize_address
+from src.Service.Google_Maps.map import compute_durations
 from src.utils.log_decorator import log
 
 ALLOWED_ADDRESSES = {
@@ -11,6 +15,21 @@ ALLOWED_ADDRESSES = {
     35700: "Rennes",
 }
 
+# Every delivery starts from the restaurant
+DELIVERY_ORIGIN = "ENSAI, Rennes, France"
+# Transport modes whose travel time is stored in delivery_zone when an address is stored
+DELIVERY_ZONE_MODES = ("bicycling",)
+
+
+def format_destination(address: Address) -> str:
+    """Format an address the way it is sent to Google Maps."""
+    return f"{address.address}, {address.postal_code} {address.city}"
+
+
+def zone_key(address: Address) -> str:
+    """Key of an address in delivery_zone: the same for every address row with the same destination."""
+    return normalize_address(format_destination(address))
+
 
 class AddressService:
     """Service class providing operations related to address validation and creation."""
@@ -69,4 +88,61 @@ class AddressService:
         """
         addressdao = self.addressdao
         new_address = Address(address=address, city=city, postal_code=postal_code)
-        return addressdao.add_address(new_address)
+        stored = addressdao.add_address(new_address)
+        # The travel time is stored now so that dispatch only reads delivery_zone. It is computed
+        # once per destination: an order to a destination already served sends no Google Maps request
+        if stored:
+            for transport_mode in DELIVERY_ZONE_MODES:
+                self.fill_delivery_zone([stored], transport_mode)
+        return stored
+
+    @log
+    def fill_delivery_zone(self, addresses: List[Address], transport_mode: str) -> int:
+        """Compute and store the travel time to the destinations that are not yet in delivery_zone.
+
+        A destination already served costs one read and no Google Maps request. The new ones are
+        computed with one batched Google Maps request and stored with one statement.
+
+        Parameters
+        ----------
+        addresses : list of Address
+        transport_mode : str
+            Google Maps transport mode, e.g. "bicycling".
+
+        Returns
+        -------
+        int
+            Number of destinations added to delivery_zone.
+        """
+        destinations = {zone_key(address): format_destination(address) for address in addresses}
+        known = self.addressdao.get_delivery_durations(list(destinations), transport_mode)
+        missing = {key: destination for key, destination in destinations.items() if key not in known}
+        if not missing:
+            return 0
+        computed = compute_durations(DELIVERY_ORIGIN, list(missing.values()), transport_mode)
+        durations = {
+            key: computed[destination] for key, destination in missing.items() if computed.get(destination) is not None
+        }
+        return len(durations) if self.addressdao.add_delivery_durations(durations, transport_mode) else 0
+
+    @log
+    def get_delivery_durations(self, addresses: List[Address], transport_mode: str) -> Dict[int, int]:
+        """Get the travel time from the restaurant to several addresses.
+
+        Only reads the delivery_zone table, filled when the addresses were stored: no Google Maps request.
+
+        Parameters
+        ----------
+        addresses : list of Address
+            Addresses with their id_address set.
+        transport_mode : str
+            Google Maps transport mode, e.g. "bicycling".
+
+        Returns
+        -------
+        dict
+            Duration in seconds by id_address. Addresses whose duration is unknown are missing.
+        """
+        keys = {address.id_address: zone_key(address) for address in addresses}
+        durations = self.addressdao.get_delivery_durations(list(set(keys.values())), transport_mode)
+        return {id_address: durations[key] for id_address, key in keys.items() if key in durations}
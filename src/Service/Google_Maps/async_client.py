@@ -0,0 +1,191 @@
+import asyncio
+import random
+import threading
+import weakref
+from collections import Counter
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+# Errors worth retrying: network problems, timeouts and transient API statuses
+RETRYABLE_STATUSES = ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+
+
+def _is_retryable(error: Exception) -> bool:
+    # googlemaps is imported on first request only, it is slow to import
+    from googlemaps.exceptions import ApiError, Timeout, TransportError
+
+    if isinstance(error, (asyncio.TimeoutError, Timeout, TransportError)):
+        return True
+    return isinstance(error, ApiError) and error.status in RETRYABLE_STATUSES
+
+
+def _release(semaphore: asyncio.Semaphore, call: asyncio.Future):
+    """Give back the slot of a finished call, and mark its outcome as retrieved if it was abandoned."""
+    semaphore.release()
+    if not call.cancelled():
+        call.exception()
+
+
+class AsyncMapsClient:
+    """Asyncio front end for a blocking googlemaps.Client.
+
+    Each request runs in a worker thread so the event loop is never blocked. On top of it:
+    - at most max_concurrency requests are sent at the same time,
+    - each attempt is given timeout seconds, and keeps its slot until its thread is done,
+    - timeouts, network errors and OVER_QUERY_LIMIT are retried with exponential backoff and jitter,
+    - identical requests already in flight share the same result instead of being sent twice.
+    """
+
+    def __init__(
+        self,
+        client_provider: Callable[[], Any],
+        max_concurrency: int = 8,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        """Initialize the client.
+
+        Parameters
+        ----------
+        client_provider : callable
+            Returns the blocking client (googlemaps.Client or StandInMapsClient) to send requests with.
+            Called for each request, so the client can be replaced at runtime.
+        max_concurrency : int
+            Maximum number of requests in flight at the same time.
+        timeout : float
+            Maximum number of seconds for one attempt.
+        retries : int
+            Number of new attempts after a retryable error.
+        backoff : float
+            Base delay in seconds between attempts, doubled after each one.
+        """
+        self.client_provider = client_provider
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # asyncio primitives belong to one event loop, keep one set per loop
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+        # (method, outcome) -> number of requests, outcome being sent, coalesced, retried or failed
+        self._calls: Counter = Counter()
+        self._calls_lock = threading.Lock()
+
+    def _count(self, method: str, outcome: str):
+        with self._calls_lock:
+            self._calls[(method, outcome)] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the number of requests by method and outcome.
+
+        sent counts the attempts actually sent to the API, coalesced the requests served by an
+        identical one in flight, retried the attempts followed by a new one and failed the
+        requests ending with an error.
+        """
+        with self._calls_lock:
+            calls = dict(self._calls)
+        stats: Dict[str, Dict[str, int]] = {}
+        for (method, outcome), count in calls.items():
+            stats.setdefault(method, {"sent": 0, "coalesced": 0, "retried": 0, "failed": 0})[outcome] = count
+        return stats
+
+    def _state(self):
+        """Return the semaphore and in-flight requests of the running event loop."""
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.max_concurrency), {})
+            self._loop_state[loop] = state
+        return state
+
+    async def geocode(self, address: str, **kwargs) -> List[dict]:
+        """Geocode an address."""
+        return await self._request("geocode", address, **kwargs)
+
+    async def directions(self, origin: str, destination: str, mode: str = "driving", **kwargs) -> List[dict]:
+        """Compute the directions between two places."""
+        return await self._request("directions", origin=origin, destination=destination, mode=mode, **kwargs)
+
+    async def distance_matrix(
+        self, origins: List[str], destinations: List[str], mode: str = "driving", **kwargs
+    ) -> dict:
+        """Compute the travel distances and durations between origins and destinations."""
+        return await self._request("distance_matrix", origins=origins, destinations=destinations, mode=mode, **kwargs)
+
+    async def _request(self, method: str, *args, **kwargs):
+        """Send a request, or wait for the identical one already in flight."""
+        semaphore, in_flight = self._state()
+        key = (method, repr(args), repr(sorted(kwargs.items())))
+        future = in_flight.get(key)
+        if future is not None:
+            self._count(method, "coalesced")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        in_flight[key] = future
+        try:
+            result = await self._send(semaphore, method, args, kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._count(method, "failed")
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del in_flight[key]
+
+    async def _send(self, semaphore: asyncio.Semaphore, method: str, args: tuple, kwargs: dict):
+        """Call the blocking client in a worker thread, with timeout and retries."""
+        attempt = 0
+        while True:
+            try:
+                await semaphore.acquire()
+                try:
+                    func = getattr(self.client_provider(), method)
+                    call = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+                except BaseException:
+                    semaphore.release()
+                    raise
+                # A thread cannot be stopped: the slot is only given back when the call really ends,
+                # so calls abandoned after a timeout still count against max_concurrency
+                call.add_done_callback(lambda done: _release(semaphore, done))
+                self._count(method, "sent")
+                return await asyncio.wait_for(asyncio.shield(call), self.timeout)
+            except Exception as e:
+                if attempt >= self.retries or not _is_retryable(e):
+                    if isinstance(e, asyncio.TimeoutError):
+                        from googlemaps.exceptions import Timeout
+
+                        raise Timeout() from e
+                    raise
+                self._count(method, "retried")
+                await asyncio.sleep(random.uniform(0, self.backoff * 2**attempt))
+                attempt += 1
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop running in a daemon thread, shared by every synchronous caller."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="google-maps", daemon=True).start()
+        return _loop
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """Run a coroutine on the background event loop and wait for its result.
+
+    Lets synchronous code (CLI, sync FastAPI routes) use the async client, even from a thread
+    that already runs its own event loop. Must not be called from the background loop itself.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, _background_loop()).result()
@@ -0,0 +1,163 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Relative paths are resolved against the project root, so that the CLI and the API share one cache
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DEFAULT_CACHE_PATH = os.path.join(".cache", "maps_cache.sqlite")
+# Expired rows are deleted when the file is opened, then every PURGE_EVERY writes
+PURGE_EVERY = 1000
+
+
+def cache_path_from_env() -> Optional[str]:
+    """Path of the SQLite file backing the Maps caches.
+
+    Set MAPS_CACHE_PATH to change it, or to an empty string to keep the caches in memory only.
+    A relative path is taken from the root of the project, whatever the working directory.
+    """
+    path = os.getenv("MAPS_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not path:
+        return None
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def normalize_address(address: str) -> str:
+    """Normalize an address so that the same place typed differently gives the same cache key.
+
+    Case, accents, punctuation and repeated spaces are ignored.
+    """
+    text = unicodedata.normalize("NFKD", address)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = re.sub(r"[^\w]+", " ", text)
+    return " ".join(text.split())
+
+
+class MapsCache:
+    """In-memory LRU cache with a time to live, optionally persisted in a SQLite table.
+
+    Values must be JSON serializable. The SQLite file is only opened on first use,
+    and entries found there are promoted to memory.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int = 1024, path: Optional[str] = None):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        name : str
+            Name of the cache, used as the SQLite table name.
+        ttl : float
+            Number of seconds an entry stays valid.
+        max_size : int
+            Maximum number of entries kept in memory. The least recently used one is evicted first.
+        path : str, optional
+            SQLite file used for persistence. Memory only if None.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file on first use. Must be called with the lock held."""
+        if self.path is None:
+            return None
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.name} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._purge_expired()
+        return self._db
+
+    def _purge_expired(self):
+        """Delete the expired rows of the SQLite table. Must be called with the lock held."""
+        self._db.execute(f"DELETE FROM {self.name} WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        """Store an entry in memory and evict the least recently used ones. Must be called with the lock held."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value cached for key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    f"SELECT value, expires_at FROM {self.name} WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """Cache value for key for ttl seconds."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    f"INSERT OR REPLACE INTO {self.name} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                db.commit()
+                self._writes += 1
+                if self._writes % PURGE_EVERY == 0:
+                    self._purge_expired()
+
+    def clear(self):
+        """Remove every entry, in memory and on disk, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            db = self._connection()
+            if db is not None:
+                db.execute(f"DELETE FROM {self.name}")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit and miss counters of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
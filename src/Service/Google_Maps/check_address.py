@@ -1,14 +1,44 @@
-import os
 from typing import Dict, List, Tuple
 
-import googlemaps
-from dotenv import load_dotenv
+from src.Service.Google_Maps.async_client import run_sync
+from src.Service.Google_Maps.cache import MapsCache, cache_path_from_env, normalize_address
+from src.Service.Google_Maps.client import get_async_client
 
-load_dotenv()
-load_dotenv(".env")
-load_dotenv("/PROJET_INFO_2A/.env")
-API_KEY = os.getenv("API_KEY_GOOGLE_MAPS")
-gmaps = googlemaps.Client(key=API_KEY)
+GEOCODE_TTL = 30 * 24 * 3600  # addresses rarely move, keep results for 30 days
+geocode_cache = MapsCache("geocode", ttl=GEOCODE_TTL, max_size=4096, path=cache_path_from_env())
+
+
+async def geocode_async(adresse: str) -> List[dict]:
+    """
+    Geocodes an address, going through the geocoding cache first.
+    Empty results are not cached, so an address that was not found is looked up again next time.
+    ---------
+    Parameters:
+    adresse: str
+
+    Returns:
+    List[dict]: GeocodeResult items returned by Google Maps
+    """
+    key = normalize_address(adresse)
+    results = geocode_cache.get(key)
+    if results is None:
+        results = await get_async_client().geocode(adresse)
+        if results:
+            geocode_cache.set(key, results)
+    return results
+
+
+def geocode(adresse: str) -> List[dict]:
+    """
+    Synchronous version of geocode_async.
+    ---------
+    Parameters:
+    adresse: str
+
+    Returns:
+    List[dict]: GeocodeResult items returned by Google Maps
+    """
+    return run_sync(geocode_async(adresse))
 
 
 def check_address(adresse: str) -> bool:
@@ -23,7 +53,7 @@ def check_address(adresse: str) -> bool:
     """
     if adresse is None:
         return False
-    result = gmaps.geocode(adresse)
+    result = geocode(adresse)
     return bool(result)
 
 
@@ -41,7 +71,7 @@ def is_address_sufficient_for_routing(adresse: str) -> Tuple[bool, str]:
     if not adresse or len(adresse.strip()) < 3:
         return False, ""
 
-    results = gmaps.geocode(adresse)
+    results = geocode(adresse)
     # Returns a list of GeocodeResult items that represents places that matched 'adresse'
     # Check https://developers.google.com/maps/documentation/geocoding/geocoding?hl=fr for more information
     # about the parameters in GeocodeResult
@@ -82,7 +112,7 @@ def get_address_suggestions(adresse: str, max_results: int = 5) -> List[Dict[str
     if not adresse:
         return []
 
-    results = gmaps.geocode(adresse)
+    results = geocode(adresse)
     # Returns a list of GeocodeResult items that represents places that matched 'adresse'
     suggestions = []
 
@@ -0,0 +1,58 @@
+import os
+import threading
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+from src.Service.Google_Maps.async_client import AsyncMapsClient
+
+# Seconds given to one request, by the HTTP client and by AsyncMapsClient
+MAPS_TIMEOUT = 10.0
+# Retries are made by AsyncMapsClient only. The googlemaps client gives up once this delay has passed
+# since its first attempt, i.e. it never retries a request that reached the API, and never waits on
+# OVER_QUERY_LIMIT.
+MAPS_RETRY_TIMEOUT = 0.01
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+# Shared by every Maps helper so the concurrency limit applies to the whole process
+async_client = AsyncMapsClient(lambda: get_client(), timeout=MAPS_TIMEOUT)
+
+
+def get_client():
+    """Return the Google Maps client shared by the whole process.
+
+    The client (and the googlemaps package itself) is only loaded on first use, so importing
+    the Maps helpers does not slow down the CLI or API startup.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import googlemaps
+
+                load_dotenv()
+                load_dotenv(".env")
+                load_dotenv("/PROJET_INFO_2A/.env")
+                _client = googlemaps.Client(
+                    key=os.getenv("API_KEY_GOOGLE_MAPS"),
+                    timeout=MAPS_TIMEOUT,
+                    retry_timeout=MAPS_RETRY_TIMEOUT,
+                    retry_over_query_limit=False,
+                )
+    return _client
+
+
+def set_client(client):
+    """Replace the shared Google Maps client (e.g. by a StandInMapsClient when offline).
+
+    Passing None resets it, the real client is then created again on next use.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def get_async_client() -> AsyncMapsClient:
+    """Return the asyncio client sending requests through the shared Google Maps client."""
+    return async_client
@@ -1,21 +1,49 @@
+import asyncio
+import hashlib
+import json
 import os
-from datetime import datetime
+import tempfile
+import time
+from typing import Dict, List, Optional
 
-import folium
-import googlemaps
-from dotenv import load_dotenv
+from src.Service.Google_Maps.async_client import run_sync
+from src.Service.Google_Maps.cache import MapsCache, cache_path_from_env, normalize_address
+from src.Service.Google_Maps.client import get_async_client
+from src.Service.Google_Maps.polyline import decode_steps, simplify
 
-load_dotenv()
-load_dotenv(".env")
-load_dotenv("/PROJET_INFO_2A/.env")
-API_KEY = os.getenv("API_KEY_GOOGLE_MAPS")
+ROUTE_TTL = 6 * 3600  # travel times drift with traffic, keep routes for 6 hours
+route_cache = MapsCache("directions", ttl=ROUTE_TTL, max_size=1024, path=cache_path_from_env())
+duration_cache = MapsCache("durations", ttl=ROUTE_TTL, max_size=4096, path=cache_path_from_env())
 
-gmaps = googlemaps.Client(key=API_KEY)
+MATRIX_MAX_DESTINATIONS = 25  # Distance Matrix API limit of destinations per request
 
+# Rendered maps are written here, one file per order and route
+MAPS_OUTPUT_DIR = os.getenv("MAPS_OUTPUT_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
+MAP_TOLERANCE = 5.0  # meters, points closer than this to the simplified path are dropped
+# Rendered maps are deleted once their route has expired from the cache, and only the most
+# recently used MAPS_MAX_FILES are kept
+MAP_RETENTION = ROUTE_TTL
+MAPS_MAX_FILES = 500
 
-def compute_itinerary(origin: str, destination: str, transport_mode: str) -> gmaps.directions:
+
+def route_key(origin: str, destination: str, transport_mode: str) -> str:
     """
-    Computes the itinerary between two addresses.
+    Builds the route cache key from the normalized origin, destination and mode.
+    ----------
+    Parameters:
+    origin: str
+    destination: str
+    transport_mode: str
+
+    Returns:
+    str
+    """
+    return "|".join((normalize_address(origin), normalize_address(destination), transport_mode.strip().lower()))
+
+
+async def compute_itinerary_async(origin: str, destination: str, transport_mode: str):
+    """
+    Computes the itinerary between two addresses, going through the route cache first.
     ----------
     Parameters:
     origin: str
@@ -25,10 +53,18 @@ def compute_itinerary(origin: str, destination: str, transport_mode: str) -> gma
     Retuns:
     googlemaps.directions: List[Dict]
     """
+    key = route_key(origin, destination, transport_mode)
+    directions = route_cache.get(key)
+    if directions is not None:
+        return directions
+
     try:
-        directions = gmaps.directions(origin=origin, destination=destination, mode=transport_mode, units="metric")
+        directions = await get_async_client().directions(
+            origin=origin, destination=destination, mode=transport_mode, units="metric"
+        )
 
         if directions:
+            route_cache.set(key, directions)
             print("Itinerary successfully computed")
             return directions
         else:
@@ -40,6 +76,97 @@ def compute_itinerary(origin: str, destination: str, transport_mode: str) -> gma
         return None
 
 
+def compute_itinerary(origin: str, destination: str, transport_mode: str) -> Optional[List[dict]]:
+    """
+    Computes the itinerary between two addresses. Synchronous version of compute_itinerary_async.
+    ----------
+    Parameters:
+    origin: str
+    destination: str
+    transport_mode: str
+
+    Retuns:
+    googlemaps.directions: List[Dict]
+    """
+    return run_sync(compute_itinerary_async(origin, destination, transport_mode))
+
+
+async def _matrix_durations(origin: str, destinations: List[str], transport_mode: str) -> List[Optional[int]]:
+    """
+    Asks the Distance Matrix API the durations from one origin to at most MATRIX_MAX_DESTINATIONS destinations.
+    ----------
+    Parameters:
+    origin: str
+    destinations: List[str]
+    transport_mode: str
+
+    Returns:
+    List[Optional[int]]: Duration in seconds for each destination, None if no route was found
+    """
+    matrix = await get_async_client().distance_matrix(
+        origins=[origin], destinations=destinations, mode=transport_mode, units="metric"
+    )
+    elements = matrix["rows"][0]["elements"]
+    return [element["duration"]["value"] if element.get("status") == "OK" else None for element in elements]
+
+
+async def compute_durations_async(
+    origin: str, destinations: List[str], transport_mode: str
+) -> Dict[str, Optional[int]]:
+    """
+    Computes the travel durations from one origin to many destinations with batched Distance Matrix requests.
+    Durations already cached are not asked again, the other destinations are sent in chunks of
+    MATRIX_MAX_DESTINATIONS, concurrently.
+    ----------
+    Parameters:
+    origin: str
+    destinations: List[str]
+    transport_mode: str
+
+    Returns:
+    Dict[str, Optional[int]]: Duration in seconds by destination, None if it could not be computed
+    """
+    durations = {}
+    missing = []
+    for destination in dict.fromkeys(destinations):
+        duration = duration_cache.get(route_key(origin, destination, transport_mode))
+        if duration is None:
+            missing.append(destination)
+        else:
+            durations[destination] = duration
+
+    chunks = [missing[i : i + MATRIX_MAX_DESTINATIONS] for i in range(0, len(missing), MATRIX_MAX_DESTINATIONS)]
+    results = await asyncio.gather(
+        *(_matrix_durations(origin, chunk, transport_mode) for chunk in chunks), return_exceptions=True
+    )
+    for chunk, chunk_durations in zip(chunks, results, strict=True):
+        if isinstance(chunk_durations, Exception):
+            print(f"Error computing the durations: {chunk_durations}")
+            chunk_durations = [None] * len(chunk)
+        for destination, duration in zip(chunk, chunk_durations, strict=True):
+            durations[destination] = duration
+            if duration is not None:
+                duration_cache.set(route_key(origin, destination, transport_mode), duration)
+
+    return durations
+
+
+def compute_durations(origin: str, destinations: List[str], transport_mode: str) -> Dict[str, Optional[int]]:
+    """
+    Computes the travel durations from one origin to many destinations.
+    Synchronous version of compute_durations_async.
+    ----------
+    Parameters:
+    origin: str
+    destinations: List[str]
+    transport_mode: str
+
+    Returns:
+    Dict[str, Optional[int]]: Duration in seconds by destination, None if it could not be computed
+    """
+    return run_sync(compute_durations_async(origin, destinations, transport_mode))
+
+
 def display_itinerary_details(directions):
     """
     Displays the itinerary's details in the command line.
@@ -75,26 +202,31 @@ def display_itinerary_details(directions):
         print(f"   {i}. {instruction} ({step['distance']['text']})")
 
 
-def create_map(origin, destination, transport_mode):
+def create_map(origin, destination, transport_mode, directions=None, order_id=None, output_dir=None):
     """
     Creates and saves an interactive map where we can see the starting and ending points of the path computed,
     as well as the route path the deliverer has to take.
+    The file name is derived from the order and the content of the map, so an already rendered map
+    is reused and two drivers never overwrite each other's map.
     ----------
     Parameters:
     origin: str
     destination: str
     transport_mode: str
+    directions: googlemaps.directions, optional
+        Directions already computed for this route. Looked up with compute_itinerary otherwise.
+    order_id: int, optional
+        Order delivered along this route, used in the file name.
+    output_dir: str, optional
+        Folder where the map is written. MAPS_OUTPUT_DIR by default.
 
     Returns:
     output_path: str
     """
-    now = datetime.now()
-    directions = gmaps.directions(
-        origin,
-        destination,
-        mode=transport_mode,
-        departure_time=now,
-    )
+    if directions is None:
+        directions = compute_itinerary(origin, destination, transport_mode)
+    if not directions:
+        return None
 
     leg = directions[0]["legs"][0]  # Accessing the 'legs' item in directions
     distance = leg["distance"]["text"]  # Accessing the 'text' value of the 'distance' dicitonary
@@ -106,6 +238,25 @@ def create_map(origin, destination, transport_mode):
     print(f" Distance : {distance}")
     print(f" Estimated Duration : {duration}")
 
+    # Flat array of lat, lng coordinates, simplified so long routes stay light to draw
+    path = simplify(decode_steps(leg["steps"]), MAP_TOLERANCE)
+
+    # Name the file after everything drawn on the map
+    digest = hashlib.sha256(
+        json.dumps([origin, destination, transport_mode, distance, duration, start_location, end_location]).encode()
+    )
+    digest.update(path.tobytes())
+    prefix = f"delivery_{order_id}_" if order_id is not None else "delivery_"
+    output_dir = output_dir or MAPS_OUTPUT_DIR
+    output_path = os.path.join(output_dir, f"{prefix}{digest.hexdigest()[:16]}.html")
+    if os.path.exists(output_path):
+        # Mark the map as recently used so prune_maps keeps it
+        os.utime(output_path)
+        return output_path
+
+    # folium is slow to import, only load it when a map is drawn
+    import folium
+
     m = folium.Map(location=[start_location["lat"], start_location["lng"]], zoom_start=6)   # Creates a folium map
 
     # Adding a starting point marker
@@ -124,19 +275,62 @@ def create_map(origin, destination, transport_mode):
         icon=folium.Icon(color="red"),
     ).add_to(m)
 
-    path = []
-
     # Adding a polyline to the map
 
-    for step in leg["steps"]:
-        polyline = step["polyline"]["points"]
-        decoded_points = googlemaps.convert.decode_polyline(polyline)
-        path.extend((point["lat"], point["lng"]) for point in decoded_points)
+    locations = [(path[i], path[i + 1]) for i in range(0, len(path), 2)]
+    if locations:
+        folium.PolyLine(locations, color="blue", weight=5, opacity=0.7).add_to(m)
 
-    folium.PolyLine(path, color="blue", weight=5, opacity=0.7).add_to(m)
+    # Write to a temporary file first so a map being written is never read half done
+    os.makedirs(output_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".html.tmp")
+    os.close(fd)
+    try:
+        m.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    prune_maps(output_dir)
+    return output_path
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, "delivery_path.html")
-    m.save(output_path)
 
-    return output_path
+def prune_maps(output_dir: str, max_age: Optional[float] = None, max_files: Optional[int] = None) -> int:
+    """
+    Deletes the rendered maps not used for max_age seconds, then the least recently used ones
+    beyond max_files.
+    ----------
+    Parameters:
+    output_dir: str
+    max_age: float, optional
+        MAP_RETENTION by default.
+    max_files: int, optional
+        MAPS_MAX_FILES by default.
+
+    Returns:
+    int: Number of maps deleted
+    """
+    max_age = MAP_RETENTION if max_age is None else max_age
+    max_files = MAPS_MAX_FILES if max_files is None else max_files
+    maps = []
+    for entry in os.scandir(output_dir):
+        if entry.name.startswith("delivery_") and entry.name.endswith(".html"):
+            try:
+                maps.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+    maps.sort(reverse=True)
+    oldest_kept = time.time() - max_age
+
+    deleted = 0
+    for rank, (modified, path) in enumerate(maps):
+        if rank >= max_files or modified < oldest_kept:
+            try:
+                os.remove(path)
+                deleted += 1
+            except FileNotFoundError:
+                # Already deleted by another process
+                pass
+    return deleted
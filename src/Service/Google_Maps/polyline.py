@@ -0,0 +1,117 @@
+import math
+from array import array
+from typing import Iterable, Optional
+
+# Approximate length of one degree of latitude, in meters
+METERS_PER_DEGREE = 111_320.0
+
+
+def decode_polyline(encoded: str, points: Optional[array] = None) -> array:
+    """Decode a Google encoded polyline into a flat array of coordinates.
+
+    Parameters
+    ----------
+    encoded : str
+        Polyline in the Encoded Polyline Algorithm Format, as returned in the directions steps.
+    points : array, optional
+        Array the coordinates are appended to. A new one is created if None.
+
+    Returns
+    -------
+    array
+        Coordinates as doubles: lat0, lng0, lat1, lng1, ...
+    """
+    if points is None:
+        points = array("d")
+    index = lat = lng = 0
+    length = len(encoded)
+    while index < length:
+        for coordinate in range(2):
+            result = shift = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            delta = ~(result >> 1) if result & 1 else result >> 1
+            if coordinate == 0:
+                lat += delta
+            else:
+                lng += delta
+        points.append(lat * 1e-5)
+        points.append(lng * 1e-5)
+    return points
+
+
+def decode_steps(steps: Iterable[dict]) -> array:
+    """Decode the polylines of every step of a directions leg into one flat array.
+
+    The first point of a step is the last point of the previous one, it is only kept once.
+    """
+    points = array("d")
+    for step in steps:
+        start = len(points)
+        decode_polyline(step["polyline"]["points"], points)
+        if start and len(points) > start and points[start : start + 2] == points[start - 2 : start]:
+            del points[start : start + 2]
+    return points
+
+
+def simplify(points: array, tolerance: float = 5.0) -> array:
+    """Simplify a path with the Douglas-Peucker algorithm.
+
+    Parameters
+    ----------
+    points : array
+        Flat array of coordinates (lat0, lng0, lat1, lng1, ...).
+    tolerance : float
+        Maximum distance in meters between the original path and the simplified one.
+
+    Returns
+    -------
+    array
+        Flat array of the points kept, always including the first and the last one.
+    """
+    n = len(points) // 2
+    if n < 3 or tolerance <= 0:
+        return array("d", points)
+
+    # Project on a plane in meters, good enough at the scale of a city
+    lng_scale = METERS_PER_DEGREE * math.cos(math.radians(points[0]))
+    xs = [points[2 * i + 1] * lng_scale for i in range(n)]
+    ys = [points[2 * i] * METERS_PER_DEGREE for i in range(n)]
+
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = xs[first], ys[first]
+        dx, dy = xs[last] - x1, ys[last] - y1
+        length_sq = dx * dx + dy * dy
+        max_distance_sq = 0.0
+        farthest = first
+        for i in range(first + 1, last):
+            px, py = xs[i] - x1, ys[i] - y1
+            if length_sq:
+                # Distance to the segment, not to the infinite line
+                t = max(0.0, min(1.0, (px * dx + py * dy) / length_sq))
+                px, py = px - t * dx, py - t * dy
+            distance_sq = px * px + py * py
+            if distance_sq > max_distance_sq:
+                max_distance_sq = distance_sq
+                farthest = i
+        if max_distance_sq > tolerance_sq:
+            keep[farthest] = 1
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    simplified = array("d")
+    for i in range(n):
+        if keep[i]:
+            simplified.append(points[2 * i])
+            simplified.append(points[2 * i + 1])
+    return simplified
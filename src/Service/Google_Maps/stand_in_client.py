@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional
+
+
+class StandInMapsClient:
+    """Offline replacement for googlemaps.Client.
+
+    Answers geocode and directions requests from fixed tables instead of calling Google Maps,
+    and records every request so tests can count them.
+    """
+
+    def __init__(
+        self,
+        geocode_results: Optional[Dict[str, List[dict]]] = None,
+        directions_results: Optional[Dict[tuple, List[dict]]] = None,
+        durations: Optional[Dict[tuple, int]] = None,
+    ):
+        """Initialize the client.
+
+        Parameters
+        ----------
+        geocode_results : dict, optional
+            GeocodeResult lists to return, by address. Unknown addresses give an empty list.
+        directions_results : dict, optional
+            Directions to return, by (origin, destination, mode). Unknown routes give an empty list.
+        durations : dict, optional
+            Travel durations in seconds returned by distance_matrix, by (origin, destination, mode).
+            Unknown routes give a NOT_FOUND element.
+        """
+        self.geocode_results = geocode_results or {}
+        self.directions_results = directions_results or {}
+        self.durations = durations or {}
+        self.calls: List[tuple] = []
+
+    def geocode(self, address: str, **kwargs) -> List[dict]:
+        """Return the results registered for address."""
+        self.calls.append(("geocode", address))
+        return self.geocode_results.get(address, [])
+
+    def directions(self, origin: str, destination: str, mode: str = "driving", **kwargs) -> List[dict]:
+        """Return the directions registered for (origin, destination, mode)."""
+        self.calls.append(("directions", origin, destination, mode))
+        return self.directions_results.get((origin, destination, mode), [])
+
+    def distance_matrix(self, origins: List[str], destinations: List[str], mode: str = "driving", **kwargs) -> dict:
+        """Return a distance matrix built from the registered durations."""
+        self.calls.append(("distance_matrix", tuple(origins), tuple(destinations), mode))
+        rows = []
+        for origin in origins:
+            elements = []
+            for destination in destinations:
+                duration = self.durations.get((origin, destination, mode))
+                if duration is None:
+                    elements.append({"status": "NOT_FOUND"})
+                else:
+                    elements.append({"status": "OK", "duration": {"value": duration, "text": f"{duration // 60} mins"}})
+            rows.append({"elements": elements})
+        return {"status": "OK", "rows": rows}
@@ -1,5 +1,7 @@
 import os
+import threading
 import time
+from collections import OrderedDict
 
 import jwt
 
@@ -11,12 +13,16 @@ class JwtService:
     Handler for JWT encryption and validation
     """
 
-    def __init__(self, secret: str = "", algorithm: str = "HS256"):
+    def __init__(self, secret: str = "", algorithm: str = "HS256", cache_size: int = 1024):
         if secret == "":
             self.secret = os.environ["JWT_SECRET"]
         else:
             self.secret = secret
         self.algorithm = algorithm
+        # Claims of the tokens already validated, least recently used first, kept until the token expires
+        self.cache_size = cache_size
+        self._validated: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
 
     def encode_jwt(self, user_id: int) -> JWTResponse:
         """
@@ -33,12 +39,40 @@ class JwtService:
         """
         return jwt.decode(token, self.secret, algorithms=[self.algorithm])
 
+    def validate_claims(self, token: str) -> dict:
+        """
+        Returns the claims of a valid JWT
+        Throws in case of invalid or expired JWT
+        The signature of a token is only verified once, then its claims are cached until it expires
+        """
+        now = time.time()
+        with self._lock:
+            claims = self._validated.get(token)
+            if claims is not None:
+                if claims["expiry_timestamp"] >= now:
+                    self._validated.move_to_end(token)
+                    return dict(claims)
+                del self._validated[token]
+
+        claims = self.decode_jwt(token)
+        if claims["expiry_timestamp"] < now:
+            raise jwt.ExpiredSignatureError("Expired JWT")
+        with self._lock:
+            self._validated[token] = claims
+            if len(self._validated) > self.cache_size:
+                self._validated.popitem(last=False)
+        return dict(claims)
+
     def validate_user_jwt(self, token: str) -> str:
         """
         Returns the id of the user authenticated by the JWT
         Throws in case of invalid or expired JWT
         """
-        decoded_jwt = self.decode_jwt(token)
-        if decoded_jwt["expiry_timestamp"] < time.time():
-            raise jwt.ExpiredSignatureError("Expired JWT")
-        return decoded_jwt["user_id"]
+        return self.validate_claims(token)["user_id"]
+
+    def clear_cache(self):
+        """
+        Forgets every validated token, e.g. after changing the secret
+        """
+        with self._lock:
+            self._validated.clear()
@@ -1,12 +1,36 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from src.DAO.CustomerDAO import CustomerDAO
 from src.DAO.DriverDAO import DriverDAO
 from src.DAO.OrderDAO import OrderDAO
 from src.Model.Order import Order
-from src.Service.CustomerService import CustomerService
+from src.Model.OrderLine import OrderLine
 from src.utils.log_decorator import log
 
+ORDER_STATUSES = ("Ready", "On the way", "Delivered")
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = (
+    "id_order",
+    "status",
+    "total_amount",
+    "nb_items",
+    "date",
+    "payment_method",
+    "id_customer",
+    "username_customer",
+    "address",
+    "id_driver",
+    "username_driver",
+    "products_name",
+    "products_quantity",
+)
+
 
 class OrderService:
     """Service class providing business logic related to orders."""
@@ -58,6 +82,48 @@ class OrderService:
             return self.get_by_id(order.id_order)
         return None
 
+    @log
+    def place_order(
+        self, id_customer: int, id_address: int, lines: List[OrderLine], payment_method: str
+    ) -> Optional[Dict[str, Any]]:
+        """Create an order with all its products at once.
+
+        The order, its products and the stock decrements are written in a single transaction:
+        either everything is saved, or nothing is.
+
+        Parameters
+        ----------
+        id_customer : int
+            ID of the customer placing the order.
+        id_address : int
+            ID of the delivery address.
+        lines : list of OrderLine
+            Products ordered, with their quantity and whether they are part of a menu.
+        payment_method : str
+            Payment method chosen by the customer.
+
+        Returns
+        -------
+        dict or None
+            The created order with its address and products (same format as OrderDAO.get_by_id),
+            or None if the order is empty, a product is out of stock or an error occurs.
+        """
+        if id_customer <= 0 or id_address <= 0 or not lines:
+            return None
+        order = Order(
+            id_customer=id_customer,
+            id_driver=None,
+            id_address=id_address,
+            nb_items=0,
+            total_amount=0,
+            payment_method=payment_method,
+            status="Ready",
+        )
+        id_order = self.orderdao.create_order_with_products(order, lines)
+        if id_order:
+            return self.orderdao.get_by_id(id_order)
+        return None
+
     @log
     def add_product_to_order(self, order_id: int, product_id: int, quantity: int = 1, promotion: bool = False) -> bool:
         """Add a product to an existing order and decrement stock.
@@ -185,44 +251,270 @@ class OrderService:
         list of dict
             List of all orders with detailed information.
         """
-        customerdao = CustomerDAO(self.orderdao.db_connector)
-        customerservice = CustomerService(customerdao)
-        driverdao = DriverDAO(self.orderdao.db_connector)
+        return self._format_orders(self.orderdao.list_all_orders())
 
-        raw_orders = self.orderdao.list_all_orders()
-        orders = []
+    @log
+    def count_by_status(self) -> Dict[str, int]:
+        """Count the orders of each status.
+
+        Returns
+        -------
+        dict
+            Number of orders for each of "Ready", "On the way" and "Delivered" (0 if none).
+        """
+        counts = dict.fromkeys(ORDER_STATUSES, 0)
+        counts.update(self.orderdao.count_orders_by_status())
+        return counts
+
+    @log
+    def list_orders_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        id_customer: Optional[int] = None,
+        id_driver: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """List one page of orders, most recent first, with optional filters.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of orders in the page (default is 50).
+        cursor : str, optional
+            Token returned as next_cursor by the previous page. None for the first page.
+        status : str, optional
+            Only list orders with this status.
+        id_customer : int, optional
+            Only list orders placed by this customer.
+        id_driver : int, optional
+            Only list orders assigned to this driver.
+        date_from : datetime, optional
+            Only list orders dated on or after this timestamp.
+        date_to : datetime, optional
+            Only list orders dated strictly before this timestamp.
+
+        Returns
+        -------
+        dict
+            "orders": the orders of the page, formatted like list_all_orders.
+            "next_cursor": token to request the next page, or None if this is the last one.
+
+        Raises
+        ------
+        ValueError
+            If limit is not positive or the cursor is invalid.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        after = self.decode_cursor(cursor) if cursor else None
+
+        raw_orders = self.orderdao.list_orders_page(
+            limit=limit + 1,
+            status=status,
+            id_customer=id_customer,
+            id_driver=id_driver,
+            date_from=date_from,
+            date_to=date_to,
+            after=after,
+        )
+        raw_orders, next_cursor = self._cut_page(raw_orders, limit)
+        return {"orders": self._format_orders(raw_orders), "next_cursor": next_cursor}
 
+    @log
+    async def list_orders_page_async(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        id_customer: Optional[int] = None,
+        id_driver: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """List one page of orders like list_orders_page, without blocking the event loop.
+
+        Raises
+        ------
+        ValueError
+            If limit is not positive or the cursor is invalid.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        after = self.decode_cursor(cursor) if cursor else None
+
+        raw_orders = await self.orderdao.list_orders_page_async(
+            limit=limit + 1,
+            status=status,
+            id_customer=id_customer,
+            id_driver=id_driver,
+            date_from=date_from,
+            date_to=date_to,
+            after=after,
+        )
+        raw_orders, next_cursor = self._cut_page(raw_orders, limit)
+        return {"orders": await self._format_orders_async(raw_orders), "next_cursor": next_cursor}
+
+    def _cut_page(self, raw_orders: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keep the first limit orders, and the cursor to the next page if one more order was read."""
+        if len(raw_orders) <= limit:
+            return raw_orders, None
+        raw_orders = raw_orders[:limit]
+        last_order = raw_orders[-1]["order"]
+        return raw_orders, self.encode_cursor(last_order.date, last_order.id_order)
+
+    @staticmethod
+    def encode_cursor(date: datetime, id_order: int) -> str:
+        """Build the opaque pagination token pointing after the order (date, id_order)."""
+        payload = json.dumps({"date": date.isoformat(), "id_order": id_order})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Read a token built by encode_cursor.
+
+        Raises
+        ------
+        ValueError
+            If the token is malformed.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(payload["date"]), int(payload["id_order"])
+        except Exception as e:
+            raise ValueError("Invalid cursor") from e
+
+    def export_orders(self, file_format: str = "ndjson", fetch_size: int = 1000) -> Iterator[str]:
+        """Export the full order history as NDJSON or CSV, one line at a time.
+
+        Rows are streamed from the database through a server-side cursor, so memory
+        use stays flat whatever the number of orders.
+
+        Parameters
+        ----------
+        file_format : str, optional
+            "ndjson" (one JSON object per line) or "csv" (default is "ndjson").
+        fetch_size : int, optional
+            Number of rows fetched from the database per round trip (default is 1000).
+
+        Yields
+        ------
+        str
+            Lines of the export, each ending with a newline. For CSV the first line is the header.
+
+        Raises
+        ------
+        ValueError
+            If file_format is not supported.
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        return self._export_lines(file_format, fetch_size)
+
+    def _export_lines(self, file_format: str, fetch_size: int) -> Iterator[str]:
+        """Generator behind export_orders, so that the format is checked before streaming starts."""
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        for row in self.orderdao.stream_orders(fetch_size=fetch_size):
+            order_d = {
+                "id_order": row["id_order"],
+                "status": row["status"],
+                "total_amount": float(row["total_amount"]),
+                "nb_items": row["nb_items"],
+                "date": row["date"].isoformat(),
+                "payment_method": row["payment_method"],
+                "id_customer": row["id_customer"],
+                "username_customer": row["username_customer"],
+                "address": f"{row['address']} {row['city']} {row['postal_code']}",
+                "id_driver": row["id_driver"],
+                "username_driver": row["username_driver"],
+                "products_name": row["products_name"],
+                "products_quantity": row["products_quantity"],
+            }
+            if file_format == "ndjson":
+                yield json.dumps(order_d) + "\n"
+            else:
+                order_d["products_name"] = "|".join(order_d["products_name"])
+                order_d["products_quantity"] = "|".join(str(q) for q in order_d["products_quantity"])
+                writer.writerow(order_d[column] for column in EXPORT_COLUMNS)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    def _format_orders(self, raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Flatten hydrated orders into the dictionaries exposed by the API.
+
+        Customer and driver usernames are resolved with one query per role for the
+        whole list: each distinct ID is fetched once, however many orders share it.
+
+        Parameters
+        ----------
+        raw_orders : list of dict
+            Orders as returned by OrderDAO, with the keys "order", "address" and "products".
+
+        Returns
+        -------
+        list of dict
+            Orders with usernames, formatted address and product names and quantities.
+        """
+        raw_orders = [order_dict for order_dict in raw_orders if order_dict["order"] is not None]
+
+        customer_ids = {order_dict["order"].id_customer for order_dict in raw_orders}
+        driver_ids = {order_dict["order"].id_driver for order_dict in raw_orders} - {None}
+        customer_names = CustomerDAO(self.orderdao.db_connector).get_user_names(list(customer_ids))
+        driver_names = DriverDAO(self.orderdao.db_connector).get_user_names(list(driver_ids))
+        return self._flatten_orders(raw_orders, customer_names, driver_names)
+
+    async def _format_orders_async(self, raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same as _format_orders, with the customer and driver usernames queried concurrently."""
+        raw_orders = [order_dict for order_dict in raw_orders if order_dict["order"] is not None]
+
+        customer_ids = {order_dict["order"].id_customer for order_dict in raw_orders}
+        driver_ids = {order_dict["order"].id_driver for order_dict in raw_orders} - {None}
+        customer_names, driver_names = await asyncio.gather(
+            CustomerDAO(self.orderdao.db_connector).get_user_names_async(list(customer_ids)),
+            DriverDAO(self.orderdao.db_connector).get_user_names_async(list(driver_ids)),
+        )
+        return self._flatten_orders(raw_orders, customer_names, driver_names)
+
+    @staticmethod
+    def _flatten_orders(
+        raw_orders: List[Dict[str, Any]], customer_names: Dict[int, str], driver_names: Dict[int, str]
+    ) -> List[Dict[str, Any]]:
+        """Build the dictionaries exposed by the API from hydrated orders and the usernames."""
+        orders = []
         for order_dict in raw_orders:
-            order_d = {}
             raw_order = order_dict["order"]
-            if raw_order is not None:
-                raw_address = order_dict["address"]
-                order_d["id_order"] = raw_order.id_order
-                order_d["status"] = raw_order.status
-                order_d["total_amount"] = raw_order.total_amount
-                order_d["nb_items"] = raw_order.nb_items
-                order_d["date"] = raw_order.date
-                order_d["id_customer"] = raw_order.id_customer
-
-                customer = customerservice.get_by_id(raw_order.id_customer)
-                order_d["username_customer"] = customer.user_name
-
-                order_d["address"] = f"{raw_address.address} {raw_address.city} {raw_address.postal_code}"
-
-                order_d["id_driver"] = raw_order.id_driver
-                if order_d["id_driver"] is None:
-                    order_d["username_driver"] = None
-                else:
-                    driver = driverdao.get_by_id(raw_order.id_driver)
-                    order_d["username_driver"] = driver.user_name
-
-                order_d["products_name"] = []
-                order_d["products_quantity"] = []
-                for raw_product in order_dict["products"]:
-                    order_d["products_name"].append(raw_product["name"])
-                    order_d["products_quantity"].append(raw_product["quantity"])
-
-                orders.append(order_d)
+            raw_address = order_dict["address"]
+            order_d = {}
+            order_d["id_order"] = raw_order.id_order
+            order_d["status"] = raw_order.status
+            order_d["total_amount"] = raw_order.total_amount
+            order_d["nb_items"] = raw_order.nb_items
+            order_d["date"] = raw_order.date
+            order_d["id_customer"] = raw_order.id_customer
+            order_d["username_customer"] = customer_names.get(raw_order.id_customer)
+
+            order_d["address"] = f"{raw_address.address} {raw_address.city} {raw_address.postal_code}"
+
+            order_d["id_driver"] = raw_order.id_driver
+            order_d["username_driver"] = driver_names.get(raw_order.id_driver)
+
+            order_d["products_name"] = []
+            order_d["products_quantity"] = []
+            for raw_product in order_dict["products"]:
+                order_d["products_name"].append(raw_product["name"])
+                order_d["products_quantity"].append(raw_product["quantity"])
+
+            orders.append(order_d)
 
         return orders
 
@@ -275,6 +567,33 @@ class OrderService:
             return False
         return self.orderdao.assign_order(id_driver, id_order)
 
+    @log
+    def claim_next_ready_order(
+        self, id_driver: int, candidate_ids: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Claim the oldest unassigned ready order for a driver and mark it as on the way.
+
+        Safe when several drivers claim at the same time: an order is never given to two drivers.
+
+        Parameters
+        ----------
+        id_driver : int
+            ID of the driver.
+        candidate_ids : list of int, optional
+            Restrict the claim to these orders. All ready orders if None.
+
+        Returns
+        -------
+        dict or None
+            The claimed order with its address and products, or None if no order is available.
+        """
+        if id_driver <= 0:
+            return None
+        id_order = self.orderdao.claim_next_ready_order(id_driver, candidate_ids)
+        if id_order:
+            return self.orderdao.get_by_id(id_order)
+        return None
+
     @log
     def get_all_orders_by_id_customer(self, id_customer: int) -> List[Dict[str, Any]]:
         """Retrieve all orders placed by a specific customer.
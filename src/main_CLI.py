@@ -3,12 +3,15 @@ import logging
 import dotenv
 
 from src.CLI.opening.openingview import OpeningView
+from src.utils.log_context import set_correlation_id
 from src.utils.log_init import initialize_logs
 
 if __name__ == "__main__":
     dotenv.load_dotenv(override=True)
 
     initialize_logs("Application")
+    # One correlation id for the whole CLI session
+    set_correlation_id()
 
     current_view = OpeningView("Welcome")
     error_count = 0
@@ -39,3 +39,17 @@ class TestAddressDAO:
         result = dao.add_address(address)
         assert result is None
         assert address.id_address is None
+
+    def test_add_delivery_durations(self, dao):
+        """Test: Durations of several destinations are stored together, then refreshed."""
+        brest, isly = "3 rue de brest 35000 rennes", "1 rue d isly 35000 rennes"
+        assert dao.add_delivery_durations({brest: 840, isly: 600}, "bicycling") is True
+        assert dao.add_delivery_durations({brest: 900}, "bicycling") is True
+        assert dao.get_delivery_durations([brest, isly], "bicycling") == {brest: 900, isly: 600}
+        assert dao.get_delivery_durations([brest], "driving") == {}
+        assert dao.add_delivery_durations({}, "bicycling") is False
+
+    def test_get_delivery_durations_missing(self, dao):
+        """Test: Destinations without precomputed durations are left out."""
+        assert dao.get_delivery_durations(["unknown destination"], "bicycling") == {}
+        assert dao.get_delivery_durations([], "bicycling") == {}
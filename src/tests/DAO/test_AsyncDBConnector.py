@@ -0,0 +1,105 @@
+import asyncio
+
+import psycopg
+import pytest
+from dotenv import load_dotenv
+
+from src.DAO.AsyncDBConnector import AsyncDBConnector
+from src.DAO.DBConnector import DBConnector
+from src.DAO.QueryStats import fingerprint, query_stats
+
+load_dotenv()
+
+
+def run(coroutine):
+    """Run a coroutine in a new event loop, closing the pools it opened"""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await AsyncDBConnector.close_all()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def db():
+    return DBConnector(test=True)
+
+
+class TestAsyncDBConnector:
+    """Tests for AsyncDBConnector and its connection pool"""
+
+    def test_connector_shared(self, db):
+        """Test: A DBConnector always gives the same async connector."""
+        assert db.async_connector is db.async_connector
+        assert db.async_connector.db_connector is db
+
+    def test_sql_query(self, db):
+        """Test: Rows are dictionaries read from the schema of the DBConnector, like with sql_query."""
+        row = run(db.async_connector.sql_query("SELECT name FROM product WHERE id_product = %s", [997], "one"))
+        assert row == db.sql_query("SELECT name FROM product WHERE id_product = %s", [997], "one")
+
+        rows = run(db.async_connector.sql_query("SELECT generate_series(1, %(n)s) AS n", {"n": 3}, "all"))
+        assert rows == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    def test_pool_shared_in_loop(self, db):
+        """Test: Connectors on the same database and schema share one pool in an event loop."""
+
+        async def pools():
+            return await db.async_connector.get_pool(), await DBConnector(test=True).async_connector.get_pool()
+
+        first, second = run(pools())
+        assert first is second
+        assert first.closed
+
+    def test_concurrent_queries(self, db):
+        """Test: Concurrent queries run on several pooled connections at the same time."""
+
+        async def sleep_pids():
+            return await asyncio.gather(
+                *(db.async_connector.sql_query("SELECT pg_backend_pid() AS pid, pg_sleep(0.2)") for _ in range(4))
+            )
+
+        rows = run(sleep_pids())
+        assert len({row["pid"] for row in rows}) > 1
+
+    def test_transaction_rollback(self, db):
+        """Test: Statements of a failed transaction are all rolled back."""
+
+        async def abort():
+            async with db.async_connector.transaction() as cursor:
+                await cursor.execute("UPDATE product SET stock = stock + 100 WHERE id_product = 997")
+                raise ValueError("abort")
+
+        with pytest.raises(ValueError):
+            run(abort())
+        assert db.sql_query("SELECT stock FROM product WHERE id_product = 997")["stock"] < 100
+
+    def test_error_returns_connection(self, db):
+        """Test: A failing query is recorded in query_stats and gives its connection back to the pool."""
+        query = "SELECT * FROM async_table_that_does_not_exist"
+
+        async def fail_then_stats():
+            with pytest.raises(psycopg.Error):
+                await db.async_connector.sql_query(query)
+            return await db.async_connector.pool_stats()
+
+        stats = run(fail_then_stats())
+        assert stats["pool_size"] - stats["pool_available"] == 0
+        assert query_stats.snapshot()[fingerprint(query)]["errors"] >= 1
+
+    def test_open_pool_stats(self, db):
+        """Test: open_pool_stats reads the opened pools with the keys of DBConnector.pool_stats, without opening one."""
+
+        async def query_then_stats():
+            await db.async_connector.sql_query("SELECT 1 AS one")
+            return db.async_connector.open_pool_stats()
+
+        stats = run(query_then_stats())
+        assert stats.keys() >= {"size", "idle", "in_use", "waiting", "max_size", "checkouts", "wait_time_total"}
+        assert stats["size"] >= 1
+        assert stats["in_use"] == 0
+        # The pools of the closed event loop are gone
+        assert db.async_connector.open_pool_stats() is None
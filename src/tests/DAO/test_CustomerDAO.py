@@ -187,3 +187,12 @@ class TestCustomerDAO:
         """Test: Retrieve a customer's ID by their non-existent user ID."""
         retrieved = dao.get_id_customer_by_id_user(999999)
         assert retrieved is None
+
+    def test_get_user_names(self, dao):
+        """Test: Retrieve the usernames of several customers at once."""
+        names = dao.get_user_names([999, 998, 999999])
+        assert names == {999: "AliceM", 998: "BobD"}
+
+    def test_get_user_names_empty(self, dao):
+        """Test: No query result for an empty list of customers."""
+        assert dao.get_user_names([]) == {}
@@ -0,0 +1,128 @@
+import psycopg2
+import pytest
+from dotenv import load_dotenv
+from psycopg2.pool import PoolError
+
+from src.DAO.ConnectionPool import ConnectionPool
+from src.DAO.DBConnector import DBConnector
+
+load_dotenv()
+
+
+@pytest.fixture
+def pool():
+    """Small standalone pool on the test schema"""
+    db = DBConnector(test=True)
+    pool = ConnectionPool(
+        {
+            "host": db.host,
+            "port": db.port,
+            "database": db.database,
+            "user": db.user,
+            "password": db.password,
+            "options": "-c search_path=test",
+        },
+        min_size=1,
+        max_size=2,
+        timeout=0.2,
+    )
+    yield pool
+    pool.close()
+
+
+class TestDBConnector:
+    """Tests for DBConnector and its connection pool"""
+
+    def test_sql_query_reuses_connection(self):
+        """Test: Two queries in a row are served by the same pooled connection."""
+        db = DBConnector(test=True)
+        first = db.sql_query("SELECT pg_backend_pid() AS pid", None, "one")
+        second = db.sql_query("SELECT pg_backend_pid() AS pid", None, "one")
+        assert first["pid"] == second["pid"]
+
+    def test_pool_shared_between_connectors(self):
+        """Test: Connectors on the same database and schema share one pool."""
+        assert DBConnector(test=True).pool is DBConnector(test=True).pool
+
+    def test_open_pool_stats(self):
+        """Test: open_pool_stats does not create a pool that no query opened."""
+        db = DBConnector(test=True)
+        db.schema = "schema_without_pool"
+        assert db.open_pool_stats() is None
+        assert ConnectionPool.find_pool(db.pool_key) is None
+
+    def test_sql_query_error_returns_connection(self):
+        """Test: A failing query rolls back and gives its connection back to the pool."""
+        db = DBConnector(test=True)
+        with pytest.raises(psycopg2.Error):
+            db.sql_query("SELECT * FROM table_that_does_not_exist", None, "one")
+        stats = db.pool_stats()
+        assert stats["in_use"] == 0
+        assert db.sql_query("SELECT 1 AS one", None, "one")["one"] == 1
+
+    def test_transaction_rollback(self):
+        """Test: Statements of a failed transaction are all rolled back."""
+        db = DBConnector(test=True)
+        with pytest.raises(ValueError):
+            with db.transaction() as cursor:
+                cursor.execute("UPDATE product SET stock = stock + 100 WHERE id_product = 997")
+                raise ValueError("abort")
+        assert db.sql_query("SELECT stock FROM product WHERE id_product = 997")["stock"] < 100
+
+    def test_stream_query(self):
+        """Test: stream_query yields every row and gives its connection back when closed early."""
+        db = DBConnector(test=True)
+        rows = list(db.stream_query("SELECT generate_series(1, 5) AS n", None, fetch_size=2))
+        assert [row["n"] for row in rows] == [1, 2, 3, 4, 5]
+
+        stream = db.stream_query("SELECT generate_series(1, 5) AS n", None, fetch_size=2)
+        assert next(stream)["n"] == 1
+        stream.close()
+        assert db.pool_stats()["in_use"] == 0
+
+    def test_pool_config_from_env(self, monkeypatch):
+        """Test: Pool sizes and timeout are read from the environment."""
+        monkeypatch.setenv("POSTGRES_POOL_MAX_SIZE", "4")
+        monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "2.5")
+        db = DBConnector(test=True)
+        assert db.pool_max_size == 4
+        assert db.pool_timeout == 2.5
+
+    def test_checkout_timeout(self, pool):
+        """Test: Checking out more than max_size connections raises PoolError after the timeout."""
+        conn1 = pool.getconn()
+        conn2 = pool.getconn()
+        with pytest.raises(PoolError):
+            pool.getconn()
+        assert pool.stats()["checkout_timeouts"] == 1
+        pool.putconn(conn1)
+        pool.putconn(conn2)
+
+    def test_closed_connection_replaced(self, pool):
+        """Test: A connection closed while idle is discarded on checkout."""
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.close()
+        new_conn = pool.getconn()
+        assert new_conn is not conn
+        assert not new_conn.closed
+        assert pool.stats()["connections_discarded"] == 1
+        pool.putconn(new_conn)
+
+    def test_health_check_pings_old_connection(self, pool):
+        """Test: Connections idle for longer than health_check_interval are pinged before reuse."""
+        pool.health_check_interval = 0
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.getconn() is conn
+        pool.putconn(conn)
+
+    def test_stats(self, pool):
+        """Test: Pool metrics reflect checkouts and connections in use."""
+        conn = pool.getconn()
+        stats = pool.stats()
+        assert stats["in_use"] == 1
+        assert stats["checkouts"] == 1
+        assert stats["max_size"] == 2
+        pool.putconn(conn)
+        assert pool.stats()["idle"] == 1
@@ -285,5 +285,15 @@ class TestDriverDAO:
         assert retrieved is None
 
 
+    def test_get_user_names(self, dao):
+        """Test: Retrieve the usernames of several drivers at once."""
+        names = dao.get_user_names([999, 998, 999999])
+        assert names == {999: "ChaCha", 998: "DiDi"}
+
+    def test_get_user_names_empty(self, dao):
+        """Test: No query result for an empty list of drivers."""
+        assert dao.get_user_names([]) == {}
+
+
     if __name__ == "__main__":
         pytest.main([__file__])
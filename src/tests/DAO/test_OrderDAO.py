@@ -1,8 +1,10 @@
+import asyncio
 from datetime import datetime
 
 import pytest
 from dotenv import load_dotenv
 
+from src.DAO.AsyncDBConnector import AsyncDBConnector
 from src.DAO.DBConnector import DBConnector
 from src.DAO.DriverDAO import DriverDAO
 from src.DAO.OrderDAO import OrderDAO
@@ -17,6 +19,18 @@ from src.utils.reset_database import ResetDatabase
 load_dotenv()
 
 
+def run(coroutine):
+    """Run a coroutine in a new event loop, closing the pools it opened"""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await AsyncDBConnector.close_all()
+
+    return asyncio.run(main())
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
     """Reset DB before tests"""
@@ -177,6 +191,77 @@ class TestOrderDAO:
         )
         assert raw["stock"] == 5
 
+    def test_add_product_twice_single_statement(self, dao, productdao, monkeypatch):
+        """Adding the same product twice merges the lines and updates totals, one query per call."""
+        product = Product(
+            name="Produit Test Add Twice",
+            price=2.0,
+            production_cost=1.0,
+            product_type="drink",
+            description="Pour test add_product twice",
+            stock=10,
+        )
+        productdao.create_product(product)
+        addr = create_test_address()
+        order = Order(
+            id_customer=999,
+            id_driver=None,
+            id_address=addr.id_address,
+            nb_items=0,
+            total_amount=0,
+            payment_method="Card",
+        )
+        order_id = dao.create_order(order)
+
+        queries = []
+        original_sql_query = dao.db_connector.sql_query
+
+        def counting_sql_query(*args, **kwargs):
+            queries.append(args[0])
+            return original_sql_query(*args, **kwargs)
+
+        monkeypatch.setattr(dao.db_connector, "sql_query", counting_sql_query)
+        assert dao.add_product(order_id, product.id_product, 2) is True
+        assert dao.add_product(order_id, product.id_product, 1, promotion=True) is True
+        assert len(queries) == 2
+        monkeypatch.undo()
+
+        data = dao.get_by_id(order_id)
+        assert data["products"][0]["quantity"] == 3
+        assert data["order"].nb_items == 3
+        assert data["order"].total_amount == pytest.approx(5.8)
+
+    def test_add_product_insufficient_stock(self, dao, productdao):
+        """Adding more than the stock fails without writing anything."""
+        product = Product(
+            name="Produit Test No Stock",
+            price=2.0,
+            production_cost=1.0,
+            product_type="drink",
+            description="Pour test add_product stock",
+            stock=1,
+        )
+        productdao.create_product(product)
+        addr = create_test_address()
+        order = Order(
+            id_customer=999,
+            id_driver=None,
+            id_address=addr.id_address,
+            nb_items=0,
+            total_amount=0,
+            payment_method="Card",
+        )
+        order_id = dao.create_order(order)
+
+        assert dao.add_product(order_id, product.id_product, 2) is False
+        data = dao.get_by_id(order_id)
+        assert data["products"] == []
+        assert data["order"].nb_items == 0
+        raw = productdao.db_connector.sql_query(
+            "SELECT stock FROM product WHERE id_product = %s", [product.id_product], "one"
+        )
+        assert raw["stock"] == 1
+
     def test_remove_product_ok(self, dao, productdao):
         """Removing a product from an order succeeds and restores stock."""
         product = Product(
@@ -340,6 +425,94 @@ class TestOrderDAO:
             assert "order" in entry and "products" in entry
             assert isinstance(entry["order"], Order)
 
+    def test_count_orders_by_status(self, dao):
+        """Order counts by status match the listed orders."""
+        counts = dao.count_orders_by_status()
+        orders = dao.list_all_orders()
+        assert sum(counts.values()) == len(orders)
+        for status, count in counts.items():
+            assert count == sum(1 for entry in orders if entry["order"].status == status)
+
+    def test_list_all_orders_fixed_number_of_queries(self, dao, productdao, monkeypatch):
+        """Orders are hydrated with one query per table, whatever the number of orders."""
+        product = Product(
+            name="Produit Test Hydration",
+            price=2.0,
+            production_cost=1.0,
+            product_type="drink",
+            description="Pour test list_all_orders",
+            stock=20,
+        )
+        productdao.create_product(product)
+
+        order_ids = []
+        for _ in range(3):
+            addr = create_test_address()
+            order = Order(
+                id_customer=999,
+                id_driver=None,
+                id_address=addr.id_address,
+                nb_items=0,
+                total_amount=0,
+                payment_method="Cash",
+            )
+            order_id = dao.create_order(order)
+            dao.add_product(order_id, 997, 1)
+            dao.add_product(order_id, product.id_product, 2)
+            order_ids.append(order_id)
+
+        queries = []
+        original_sql_query = dao.db_connector.sql_query
+
+        def counting_sql_query(*args, **kwargs):
+            queries.append(args[0])
+            return original_sql_query(*args, **kwargs)
+
+        monkeypatch.setattr(dao.db_connector, "sql_query", counting_sql_query)
+        orders = dao.list_all_orders()
+
+        assert len(queries) == 3
+        by_id = {o["order"].id_order: o for o in orders}
+        for order_id in order_ids:
+            entry = by_id[order_id]
+            assert entry["address"].id_address == entry["order"].id_address
+            lines = sorted((p["id_product"], p["quantity"]) for p in entry["products"])
+            assert lines == sorted([(997, 1), (product.id_product, 2)])
+            assert "id_order" not in entry["products"][0]
+
+    def test_list_orders_page(self, dao):
+        """Orders are paginated on (date, id_order) and filtered in SQL."""
+        addr = create_test_address()
+        order_ids = []
+        for day in range(1, 4):
+            order = Order(
+                id_customer=998,
+                id_driver=998,
+                id_address=addr.id_address,
+                date=datetime(2020, 1, day),
+                nb_items=0,
+                total_amount=0,
+                payment_method="Card",
+            )
+            order_ids.append(dao.create_order(order))
+
+        filters = {"id_driver": 998, "date_from": datetime(2020, 1, 1), "date_to": datetime(2020, 1, 4)}
+        first_page = dao.list_orders_page(limit=2, **filters)
+        assert [o["order"].id_order for o in first_page] == [order_ids[2], order_ids[1]]
+
+        last = first_page[-1]["order"]
+        second_page = dao.list_orders_page(limit=2, after=(last.date, last.id_order), **filters)
+        assert [o["order"].id_order for o in second_page] == [order_ids[0]]
+
+        assert dao.list_orders_page(limit=10, status="Delivered", **filters) == []
+
+    def test_list_orders_async(self, dao):
+        """The async listings return the same orders as the blocking ones."""
+        filters = {"date_from": datetime(2020, 1, 1)}
+        assert run(dao.list_orders_page_async(limit=5, **filters)) == dao.list_orders_page(limit=5, **filters)
+        assert run(dao.list_orders_page_async(limit=5, id_customer=-1)) == []
+        assert run(dao.list_all_orders_async()) == dao.list_all_orders()
+
     def test_get_assigned_orders_ok(self, dao):
         """Retrieve orders assigned to a specific driver."""
         addr = create_test_address()
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 from dotenv import load_dotenv
 
+from src.DAO.AsyncDBConnector import AsyncDBConnector
 from src.DAO.DBConnector import DBConnector
 from src.DAO.ProductDAO import ProductDAO
 from src.Model.Product import Product
@@ -9,6 +12,18 @@ from src.utils.reset_database import ResetDatabase
 load_dotenv()
 
 
+def run(coroutine):
+    """Run a coroutine in a new event loop, closing the pools it opened"""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await AsyncDBConnector.close_all()
+
+    return asyncio.run(main())
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
     """Initialize the test database environment"""
@@ -320,3 +335,8 @@ class TestProductDAO:
         result = dao.update_product(non_existent_id, updated_product)
 
         assert result is None
+
+    def test_get_product_by_id_async(self, dao):
+        """Test: The async version returns the same product, and None for an unknown id"""
+        assert run(dao.get_product_by_id_async(997)) == dao.get_product_by_id(997)
+        assert run(dao.get_product_by_id_async(123456)) is None
@@ -0,0 +1,89 @@
+import logging
+
+import psycopg2
+import pytest
+from dotenv import load_dotenv
+
+from src.DAO.DBConnector import DBConnector
+from src.DAO.QueryStats import QueryStats, fingerprint, query_stats
+
+load_dotenv()
+
+
+@pytest.fixture
+def stats():
+    """Process-wide query statistics, emptied before and after the test"""
+    query_stats.reset()
+    yield query_stats
+    query_stats.reset()
+
+
+class TestQueryStats:
+    """Tests for the query timing statistics"""
+
+    def test_fingerprint(self):
+        """Test: Values, placeholders, comments and whitespace do not change the fingerprint."""
+        assert fingerprint("SELECT *\n  FROM orders -- comment\n WHERE id_order = %s AND status = 'Ready'") == (
+            "SELECT * FROM orders WHERE id_order = ? AND status = ?"
+        )
+        assert fingerprint("SELECT * FROM orders WHERE id_order IN (1, 2, 3)") == fingerprint(
+            "SELECT * FROM orders WHERE id_order IN (%s, %s)"
+        )
+        assert fingerprint("SELECT * FROM table_2 WHERE x = %(x)s") == "SELECT * FROM table_2 WHERE x = ?"
+
+    def test_record_and_snapshot(self):
+        """Test: Executions are grouped by fingerprint, with counts, times and cumulative buckets."""
+        stats = QueryStats()
+        stats.record("SELECT * FROM product WHERE id_product = 1", 0.002, rows=1)
+        stats.record("SELECT * FROM product WHERE id_product = 2", 0.3, rows=1)
+        stats.record("SELECT * FROM product WHERE id_product = 3", 0.004, error=True)
+
+        entry = stats.snapshot()["SELECT * FROM product WHERE id_product = ?"]
+        assert entry["count"] == 3
+        assert entry["errors"] == 1
+        assert entry["rows"] == 2
+        assert entry["max_time"] == 0.3
+        assert entry["mean_time"] == pytest.approx(0.102)
+        assert entry["buckets"][0.001] == 0
+        assert entry["buckets"][0.005] == 2
+        assert entry["buckets"][0.25] == 2
+        assert entry["buckets"][0.5] == 3
+        assert entry["buckets"]["+Inf"] == 3
+
+    def test_top(self):
+        """Test: top sorts the queries by total time."""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.01)
+        stats.record("SELECT * FROM orders", 0.5)
+        stats.record("SELECT 1", 0.01)
+
+        top = stats.top(1)
+        assert len(top) == 1
+        assert top[0]["query"] == "SELECT * FROM orders"
+
+    def test_slow_query_log(self, caplog):
+        """Test: Only queries above the threshold are logged as slow."""
+        stats = QueryStats(slow_threshold=0.1)
+        with caplog.at_level(logging.WARNING, logger="src.DAO.QueryStats"):
+            stats.record("SELECT * FROM orders WHERE id_order = 5", 0.05)
+            stats.record("SELECT * FROM orders WHERE id_order = 6", 0.25, rows=1)
+
+        assert len(caplog.records) == 1
+        assert "250.0 ms" in caplog.records[0].getMessage()
+        assert "id_order = ?" in caplog.records[0].getMessage()
+
+    def test_db_connector_records_queries(self, stats):
+        """Test: Queries run through sql_query and transaction are recorded, failures as errors."""
+        db = DBConnector(test=True)
+        db.sql_query("SELECT generate_series(1, %s) AS n", [4], "all")
+        db.sql_query("SELECT generate_series(1, %s) AS n", [2], "all")
+        with db.transaction() as cursor:
+            cursor.execute("SELECT 1 AS one")
+        with pytest.raises(psycopg2.Error):
+            db.sql_query("SELECT * FROM table_that_does_not_exist", None, "one")
+
+        snapshot = db.query_stats()
+        assert snapshot["SELECT generate_series(...) AS n"]["count"] == 2
+        assert snapshot["SELECT generate_series(...) AS n"]["rows"] == 6
+        assert snapshot["SELECT ? AS one"]["count"] == 1
+        assert snapshot["SELECT * FROM table_that_does_not_exist"]["errors"] == 1
@@ -7,6 +7,7 @@ from src.DAO.DBConnector import DBConnector
 from src.DAO.UserRepo import UserRepo
 from src.Model.User import User
 from src.Service.PasswordService import create_salt
+from src.utils.principal_cache import principal_cache
 from src.utils.reset_database import ResetDatabase
 from src.utils.securite import hash_password
 
@@ -131,3 +132,23 @@ class TestUserRepo:
         assert deleted
         retrieved = dao.get_by_id(created)
         assert retrieved is None
+
+    def test_update_user_invalidates_principal(self, dao):
+        """Updating a user drops the cached principals built from it"""
+        username = unique_username("user_test")
+        user = User(
+            user_name=username,
+            first_name="User",
+            last_name="Test",
+            password="1234password",
+            email="user.test6@gmail.com",
+            salt=create_salt(),
+        )
+        created = dao.add_user(user)
+        principal_cache.set("user", created, created, "cached profile")
+        principal_cache.set("admin", 12345, created, "cached admin profile")
+
+        user.first_name = "Renamed"
+        assert dao.update_user(user)
+        assert principal_cache.get("user", created) is None
+        assert principal_cache.get("admin", 12345) is None
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from googlemaps.exceptions import ApiError, Timeout, TransportError
+
+from src.Service.Google_Maps.async_client import AsyncMapsClient, run_sync
+
+
+class SlowClient:
+    """Blocking client answering after a delay and recording how many requests run at once"""
+
+    def __init__(self, delay=0.05, errors=None):
+        self.delay = delay
+        self.errors = list(errors or [])
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def geocode(self, address, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            error = self.errors.pop(0) if self.errors else None
+        try:
+            time.sleep(self.delay)
+            if error:
+                raise error
+            return [{"formatted_address": address}]
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class TestAsyncMapsClient:
+    """Tests for the asyncio Google Maps client"""
+
+    def test_coalescing(self):
+        """Test: Identical requests in flight are sent once."""
+        client = SlowClient()
+        maps = AsyncMapsClient(lambda: client)
+
+        async def lookup():
+            return await asyncio.gather(*(maps.geocode("Rennes") for _ in range(5)))
+
+        results = asyncio.run(lookup())
+        assert results == [[{"formatted_address": "Rennes"}]] * 5
+        assert client.calls == 1
+        assert maps.stats()["geocode"] == {"sent": 1, "coalesced": 4, "retried": 0, "failed": 0}
+
+    def test_concurrency_limit(self):
+        """Test: No more than max_concurrency requests run at the same time."""
+        client = SlowClient()
+        maps = AsyncMapsClient(lambda: client, max_concurrency=2)
+
+        async def lookup():
+            return await asyncio.gather(*(maps.geocode(f"{i} Rue de Rennes") for i in range(6)))
+
+        assert len(asyncio.run(lookup())) == 6
+        assert client.calls == 6
+        assert client.max_running == 2
+
+    def test_retry(self):
+        """Test: Transient errors are retried."""
+        client = SlowClient(delay=0, errors=[TransportError("reset"), ApiError("OVER_QUERY_LIMIT")])
+        maps = AsyncMapsClient(lambda: client, retries=2, backoff=0.01)
+        assert asyncio.run(maps.geocode("Rennes")) == [{"formatted_address": "Rennes"}]
+        assert client.calls == 3
+        assert maps.stats()["geocode"] == {"sent": 3, "coalesced": 0, "retried": 2, "failed": 0}
+
+    def test_no_retry_on_invalid_request(self):
+        """Test: Errors that would fail again are raised right away."""
+        client = SlowClient(delay=0, errors=[ApiError("INVALID_REQUEST")])
+        maps = AsyncMapsClient(lambda: client, retries=2, backoff=0.01)
+        with pytest.raises(ApiError):
+            asyncio.run(maps.geocode("Rennes"))
+        assert client.calls == 1
+        assert maps.stats()["geocode"]["failed"] == 1
+
+    def test_timeout(self):
+        """Test: A request slower than timeout is retried, then raises Timeout."""
+        client = SlowClient(delay=0.2)
+        maps = AsyncMapsClient(lambda: client, timeout=0.02, retries=1, backoff=0.01)
+        with pytest.raises(Timeout):
+            asyncio.run(maps.geocode("Rennes"))
+        assert client.calls == 2
+
+    def test_timeout_keeps_slot(self):
+        """Test: A timed out request keeps its slot until its thread is done."""
+        client = SlowClient(delay=0.1)
+        maps = AsyncMapsClient(lambda: client, max_concurrency=1, timeout=0.02, retries=1, backoff=0)
+
+        async def lookup():
+            return await asyncio.gather(*(maps.geocode(f"{i} Rue de Rennes") for i in range(2)), return_exceptions=True)
+
+        assert all(isinstance(result, Timeout) for result in asyncio.run(lookup()))
+        assert client.max_running == 1
+
+    def test_run_sync(self):
+        """Test: run_sync works from a thread that already runs an event loop."""
+        client = SlowClient(delay=0)
+        maps = AsyncMapsClient(lambda: client)
+
+        async def handler():
+            return run_sync(maps.geocode("Rennes"))
+
+        assert asyncio.run(handler()) == [{"formatted_address": "Rennes"}]
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+
+from freezegun import freeze_time
+
+from src.Service.Google_Maps import cache as cache_module
+from src.Service.Google_Maps.cache import MapsCache, cache_path_from_env
+
+
+class TestMapsCache:
+    """Tests for the Google Maps results cache"""
+
+    def test_get_set(self):
+        """Test: A cached value is returned, a missing key gives None."""
+        cache = MapsCache("test", ttl=60)
+        assert cache.get("paris") is None
+        cache.set("paris", [{"formatted_address": "Paris, France"}])
+        assert cache.get("paris") == [{"formatted_address": "Paris, France"}]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl(self):
+        """Test: Entries expire after ttl seconds."""
+        cache = MapsCache("test", ttl=60)
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+            cache.set("paris", [])
+            frozen.tick(59)
+            assert cache.get("paris") == []
+            frozen.tick(2)
+            assert cache.get("paris") is None
+
+    def test_lru_eviction(self):
+        """Test: The least recently used entry is evicted when the cache is full."""
+        cache = MapsCache("test", ttl=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_persistence(self, tmp_path):
+        """Test: Entries survive in the SQLite file and are found by a new cache."""
+        path = str(tmp_path / "maps_cache.sqlite")
+        MapsCache("geocode", ttl=60, path=path).set("paris", [{"formatted_address": "Paris, France"}])
+        cache = MapsCache("geocode", ttl=60, path=path)
+        assert cache.get("paris") == [{"formatted_address": "Paris, France"}]
+        assert cache.stats()["size"] == 1
+
+    def test_clear(self, tmp_path):
+        """Test: clear empties memory and disk."""
+        path = str(tmp_path / "maps_cache.sqlite")
+        cache = MapsCache("geocode", ttl=60, path=path)
+        cache.set("paris", [])
+        cache.clear()
+        assert MapsCache("geocode", ttl=60, path=path).get("paris") is None
+        assert cache.get("paris") is None
+
+    def test_expired_rows_deleted(self, tmp_path, monkeypatch):
+        """Test: Expired rows are deleted from the SQLite file on open and every PURGE_EVERY writes."""
+        path = str(tmp_path / "maps_cache.sqlite")
+
+        def rows():
+            with sqlite3.connect(path) as db:
+                return sorted(key for (key,) in db.execute("SELECT key FROM geocode"))
+
+        with freeze_time("2025-01-01 12:00:00") as frozen:
+            MapsCache("geocode", ttl=60, path=path).set("old", [])
+            frozen.tick(61)
+            cache = MapsCache("geocode", ttl=60, path=path)
+            cache.set("new", [])
+            assert rows() == ["new"]
+
+            monkeypatch.setattr(cache_module, "PURGE_EVERY", 2)
+            frozen.tick(61)
+            cache.set("newer", [])
+            assert rows() == ["newer"]
+
+    def test_path_from_project_root(self, monkeypatch):
+        """Test: A relative cache path does not depend on the working directory."""
+        monkeypatch.setenv("MAPS_CACHE_PATH", os.path.join(".cache", "maps.sqlite"))
+        assert cache_path_from_env() == os.path.join(cache_module.PROJECT_ROOT, ".cache", "maps.sqlite")
+        assert os.path.isdir(os.path.join(cache_module.PROJECT_ROOT, "src"))
+        monkeypatch.setenv("MAPS_CACHE_PATH", "")
+        assert cache_path_from_env() is None
@@ -1,8 +1,39 @@
+import os
+import time
 from unittest.mock import patch
 
 import pytest
 
-from src.Service.Google_Maps.map import compute_itinerary, create_map
+from src.Service.Google_Maps import client as client_module
+from src.Service.Google_Maps import map as map_module
+from src.Service.Google_Maps.cache import MapsCache
+from src.Service.Google_Maps.client import get_client, set_client
+from src.Service.Google_Maps.map import compute_durations, compute_itinerary, create_map, prune_maps, route_key
+from src.Service.Google_Maps.stand_in_client import StandInMapsClient
+
+
+@pytest.fixture(autouse=True)
+def maps_client(monkeypatch):
+    """Offline Google Maps client shared by the Maps helpers during a test"""
+    client = StandInMapsClient()
+    monkeypatch.setattr(client_module, "_client", client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def route_cache(monkeypatch):
+    """Fresh in-memory route cache for each test"""
+    cache = MapsCache("directions", ttl=60)
+    monkeypatch.setattr(map_module, "route_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def duration_cache(monkeypatch):
+    """Fresh in-memory duration cache for each test"""
+    cache = MapsCache("durations", ttl=60)
+    monkeypatch.setattr(map_module, "duration_cache", cache)
+    return cache
 
 
 @pytest.fixture
@@ -20,12 +51,12 @@ def mock_directions_valid():
                         {
                             "html_instructions": "<b>Turn left</b> onto Main St",
                             "distance": {"text": "100 m"},
-                            "polyline": {"points": "test_polyline"},
+                            "polyline": {"points": "wheiHgljMoAcB"},
                         },
                         {
                             "html_instructions": "Continue straight",
                             "distance": {"text": "200 m"},
-                            "polyline": {"points": "test_polyline_2"},
+                            "polyline": {"points": "gkeiHkojMcBwB"},
                         },
                     ],
                 }
@@ -42,8 +73,9 @@ def mock_directions_empty():
 
 def test_compute_itinerary_ok(mock_directions_valid):
     """Path successfully computed"""
-    with patch(
-        "src.Service.Google_Maps.map.gmaps.directions",
+    with patch.object(
+        get_client(),
+        "directions",
         return_value=mock_directions_valid,
     ):
         result = compute_itinerary("Paris", "Lyon", "driving")
@@ -54,8 +86,9 @@ def test_compute_itinerary_ok(mock_directions_valid):
 
 def test_compute_itinerary_ko(mock_directions_empty):
     """No itinerary found"""
-    with patch(
-        "src.Service.Google_Maps.map.gmaps.directions",
+    with patch.object(
+        get_client(),
+        "directions",
         return_value=mock_directions_empty,
     ):
         result = compute_itinerary("Paris", "Adresse invalide", "driving")
@@ -65,8 +98,9 @@ def test_compute_itinerary_ko(mock_directions_empty):
 
 def test_compute_itinerary_exception():
     """Exception during the computing of the itinerary"""
-    with patch(
-        "src.Service.Google_Maps.map.gmaps.directions",
+    with patch.object(
+        get_client(),
+        "directions",
         side_effect=Exception("API error"),
     ):
         result = compute_itinerary("Paris", "Lyon", "driving")
@@ -74,39 +108,117 @@ def test_compute_itinerary_exception():
         assert result is None
 
 
-@patch("src.Service.Google_Maps.map.folium.Map")
-@patch("src.Service.Google_Maps.map.folium.Marker")
-@patch("src.Service.Google_Maps.map.folium.PolyLine")
-@patch("src.Service.Google_Maps.map.googlemaps.convert.decode_polyline")
+@patch("folium.Marker")
+@patch("folium.PolyLine")
 def test_create_map_ok(
-    mock_decode_polyline,
     mock_polyline,
     mock_marker,
-    mock_map,
     mock_directions_valid,
     tmp_path,
 ):
     """Map successfully created"""
-    mock_decode_polyline.return_value = [{"lat": 48.8566, "lng": 2.3522}]
-
-    with patch(
-        "src.Service.Google_Maps.map.gmaps.directions",
+    with patch.object(
+        get_client(),
+        "directions",
         return_value=mock_directions_valid,
     ):
-        with patch("src.Service.Google_Maps.map.datetime") as mock_datetime:
-            mock_datetime.now.return_value = "2024-01-01"
-
-            with patch(
-                "src.Service.Google_Maps.map.os.path.dirname",
-                return_value=str(tmp_path),
-            ):
-                with patch(
-                    "src.Service.Google_Maps.map.os.path.join",
-                    return_value=str(tmp_path / "test_map.html"),
-                ):
-                    result = create_map("Paris", "Lyon", "driving")
-
-                    assert result == str(tmp_path / "test_map.html")
-                    mock_map.assert_called_once()
-                    assert mock_marker.call_count == 2
-                    mock_polyline.assert_called_once()
+        result = create_map("Paris", "Lyon", "driving", order_id=12, output_dir=str(tmp_path))
+
+        assert os.path.dirname(result) == str(tmp_path)
+        assert os.path.basename(result).startswith("delivery_12_")
+        assert os.path.exists(result)
+        assert mock_marker.call_count == 2
+        mock_polyline.assert_called_once()
+        assert mock_polyline.call_args.args[0][0] == pytest.approx((48.8566, 2.3522))
+        assert mock_polyline.call_args.args[0][-1] == pytest.approx((48.8575, 2.3533))
+
+
+def test_prune_maps(tmp_path):
+    """Maps not used for max_age seconds are deleted, then the least recently used beyond max_files"""
+    now = time.time()
+    for i, age in enumerate([0, 10, 20, 5000]):
+        path = tmp_path / f"delivery_{i}_map.html"
+        path.write_text("<html></html>")
+        os.utime(path, (now - age, now - age))
+    (tmp_path / "other.html").write_text("<html></html>")
+
+    assert prune_maps(str(tmp_path), max_age=3600, max_files=2) == 2
+    assert sorted(os.listdir(tmp_path)) == ["delivery_0_map.html", "delivery_1_map.html", "other.html"]
+
+
+def test_compute_itinerary_cached(mock_directions_valid, route_cache):
+    """The same route is only asked once to Google Maps"""
+    client = StandInMapsClient(directions_results={("ENSAI, Rennes", "Paris", "bicycling"): mock_directions_valid})
+    set_client(client)
+    first = compute_itinerary("ENSAI, Rennes", "Paris", "bicycling")
+    second = compute_itinerary("ensai rennes", "PARIS", "bicycling")
+
+    assert first == second == mock_directions_valid
+    assert len(client.calls) == 1
+    assert route_cache.stats()["hits"] == 1
+
+
+def test_compute_itinerary_not_found_not_cached():
+    """A route not found is asked again next time"""
+    client = StandInMapsClient()
+    set_client(client)
+    assert compute_itinerary("Paris", "Nowhere", "driving") is None
+    assert compute_itinerary("Paris", "Nowhere", "driving") is None
+
+    assert len(client.calls) == 2
+
+
+def test_route_key_depends_on_mode():
+    """Routes with different transport modes have different keys"""
+    assert route_key("Paris", "Lyon", "driving") != route_key("Paris", "Lyon", "bicycling")
+    assert route_key("Paris ", "lyon", "Driving") == route_key("paris", "Lyon", "driving")
+
+
+def test_create_map_reuses_directions(mock_directions_valid, tmp_path):
+    """create_map does not call Google Maps when directions are given"""
+    client = StandInMapsClient()
+    set_client(client)
+    result = create_map("Paris", "Lyon", "driving", mock_directions_valid, output_dir=str(tmp_path))
+
+    assert os.path.exists(result)
+    assert client.calls == []
+
+
+def test_create_map_reuses_rendered_map(mock_directions_valid, tmp_path):
+    """A map already rendered for the same order and route is not drawn again"""
+    first = create_map("Paris", "Lyon", "driving", mock_directions_valid, order_id=7, output_dir=str(tmp_path))
+    with patch("folium.Map") as mock_map:
+        second = create_map("Paris", "Lyon", "driving", mock_directions_valid, order_id=7, output_dir=str(tmp_path))
+    other_order = create_map("Paris", "Lyon", "driving", mock_directions_valid, order_id=8, output_dir=str(tmp_path))
+
+    assert second == first
+    mock_map.assert_not_called()
+    assert other_order != first
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(other_order)])
+
+
+def test_compute_durations_chunked():
+    """Destinations are sent in batches no larger than the provider limit"""
+    destinations = [f"{i} Rue de Rennes, Rennes" for i in range(60)]
+    client = StandInMapsClient(durations={("ENSAI", d, "bicycling"): 600 + i for i, d in enumerate(destinations)})
+    set_client(client)
+    durations = compute_durations("ENSAI", destinations, "bicycling")
+
+    assert durations == {d: 600 + i for i, d in enumerate(destinations)}
+    assert sorted(len(call[2]) for call in client.calls) == [10, 25, 25]
+
+
+def test_compute_durations_cached():
+    """Durations already known are not asked again, unknown routes give None"""
+    client = StandInMapsClient(durations={("ENSAI", "Rennes", "bicycling"): 900})
+    set_client(client)
+    assert compute_durations("ENSAI", ["Rennes", "Nowhere"], "bicycling") == {"Rennes": 900, "Nowhere": None}
+    assert compute_durations("ENSAI", ["rennes", "Nowhere"], "bicycling") == {"rennes": 900, "Nowhere": None}
+
+    assert [call[2] for call in client.calls] == [("Rennes", "Nowhere"), ("Nowhere",)]
+
+
+def test_compute_durations_error():
+    """A failing batch gives None for its destinations"""
+    with patch.object(get_client(), "distance_matrix", side_effect=Exception("API error")):
+        assert compute_durations("ENSAI", ["Rennes"], "bicycling") == {"Rennes": None}
@@ -2,11 +2,33 @@ from unittest.mock import patch
 
 import pytest
 
+from src.Service.Google_Maps import check_address as check_address_module
+from src.Service.Google_Maps import client as client_module
+from src.Service.Google_Maps.cache import MapsCache
 from src.Service.Google_Maps.check_address import (
     check_address,
     get_address_suggestions,
     is_address_sufficient_for_routing,
+    normalize_address,
 )
+from src.Service.Google_Maps.client import get_client, set_client
+from src.Service.Google_Maps.stand_in_client import StandInMapsClient
+
+
+@pytest.fixture(autouse=True)
+def maps_client(monkeypatch):
+    """Offline Google Maps client shared by the Maps helpers during a test"""
+    client = StandInMapsClient()
+    monkeypatch.setattr(client_module, "_client", client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def geocode_cache(monkeypatch):
+    """Fresh in-memory geocoding cache for each test"""
+    cache = MapsCache("geocode", ttl=60)
+    monkeypatch.setattr(check_address_module, "geocode_cache", cache)
+    return cache
 
 
 @pytest.fixture
@@ -55,8 +77,9 @@ def mock_geocode_empty():
 
 def test_check_address_ok(mock_geocode_valid):
     """Address exists and is valid"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_valid,
     ):
         result = check_address("10 Rue de Paris, Paris")
@@ -66,8 +89,9 @@ def test_check_address_ok(mock_geocode_valid):
 
 def test_check_address_ko(mock_geocode_empty):
     """Address does not exist"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_empty,
     ):
         result = check_address("Adresse qui n'existe pas")
@@ -84,8 +108,9 @@ def test_check_address_none():
 
 def test_is_address_sufficient_for_routing_with_street_and_city(mock_geocode_valid):
     """Address with street and city is routable"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_valid,
     ):
         is_routable, complete_address = is_address_sufficient_for_routing("10 Rue de Paris, Paris")
@@ -96,8 +121,9 @@ def test_is_address_sufficient_for_routing_with_street_and_city(mock_geocode_val
 
 def test_is_address_sufficient_for_routing_only_city(mock_geocode_only_city):
     """Address with only a city is routable"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_only_city,
     ):
         is_routable, complete_address = is_address_sufficient_for_routing("Paris")
@@ -108,8 +134,9 @@ def test_is_address_sufficient_for_routing_only_city(mock_geocode_only_city):
 
 def test_is_address_sufficient_for_routing_vague_address(mock_geocode_vague):
     """Address too vague not routable"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_vague,
     ):
         is_routable, complete_address = is_address_sufficient_for_routing("France")
@@ -128,8 +155,9 @@ def test_is_address_sufficient_for_routing_empty_address():
 
 def test_get_address_suggestions_ok(mock_geocode_valid):
     """Retrieving address suggestions"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_valid,
     ):
         suggestions = get_address_suggestions("10 Rue de Paris", max_results=3)
@@ -145,8 +173,9 @@ def test_get_address_suggestions_ok(mock_geocode_valid):
 
 def test_get_address_suggestions_empty(mock_geocode_empty):
     """No suggestions found"""
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=mock_geocode_empty,
     ):
         suggestions = get_address_suggestions("Adresse inexistante")
@@ -157,10 +186,66 @@ def test_get_address_suggestions_empty(mock_geocode_empty):
 def test_get_address_suggestions_max_results(mock_geocode_valid):
     """Respecting max_results limit"""
     multiple_results = mock_geocode_valid * 3
-    with patch(
-        "src.Service.Google_Maps.check_address.gmaps.geocode",
+    with patch.object(
+        get_client(),
+        "geocode",
         return_value=multiple_results,
     ):
         suggestions = get_address_suggestions("Paris", max_results=2)
 
         assert len(suggestions) == 2
+
+
+def test_geocode_cache_shared_between_functions(mock_geocode_valid):
+    """The three functions share one geocoding lookup"""
+    with patch.object(
+        get_client(),
+        "geocode",
+        return_value=mock_geocode_valid,
+    ) as mock_geocode:
+        assert check_address("10 Rue de Paris, Paris") is True
+        assert is_address_sufficient_for_routing("10 rue de Paris  Paris")[0] is True
+        assert len(get_address_suggestions("10 RUE DE PARIS, PARIS")) == 1
+
+        mock_geocode.assert_called_once()
+
+
+def test_geocode_cache_counters(geocode_cache, mock_geocode_valid):
+    """Hits and misses are counted"""
+    client = StandInMapsClient({"10 Rue de Paris, Paris": mock_geocode_valid})
+    set_client(client)
+    assert check_address("10 Rue de Paris, Paris") is True
+    assert check_address("10 Rue de Paris, Paris") is True
+
+    assert client.calls == [("geocode", "10 Rue de Paris, Paris")]
+    stats = geocode_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_geocode_empty_not_cached(geocode_cache):
+    """An address that was not found is looked up again"""
+    client = StandInMapsClient()
+    set_client(client)
+    assert check_address("Adresse inconnue") is False
+    assert check_address("Adresse inconnue") is False
+
+    assert client.calls == [("geocode", "Adresse inconnue")] * 2
+    assert geocode_cache.stats()["size"] == 0
+
+
+def test_normalize_address():
+    """Case, accents, punctuation and spaces are ignored in the cache key"""
+    assert normalize_address("  12, Rue de l'Église  RENNES ") == normalize_address("12 rue de l eglise rennes")
+
+
+def test_set_client(mock_geocode_valid):
+    """A stand-in client answers geocoding requests offline"""
+    client = StandInMapsClient({"10 Rue de Paris, Paris": mock_geocode_valid})
+    set_client(client)
+    assert is_address_sufficient_for_routing("10 Rue de Paris, Paris") == (
+        True,
+        "10 Rue de Paris, 75001 Paris, France",
+    )
+    assert get_client() is client
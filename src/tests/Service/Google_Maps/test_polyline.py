@@ -0,0 +1,65 @@
+import math
+import random
+
+import googlemaps.convert
+import pytest
+
+from src.Service.Google_Maps.polyline import decode_polyline, decode_steps, simplify
+
+
+class TestPolyline:
+    """Tests for polyline decoding and simplification"""
+
+    def test_decode_polyline(self):
+        """Test: The example of the Google documentation is decoded into a flat array."""
+        points = decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+        assert list(points) == pytest.approx([38.5, -120.2, 40.7, -120.95, 43.252, -126.453])
+
+    def test_decode_polyline_matches_googlemaps(self):
+        """Test: Decoding gives the same points as googlemaps."""
+        rng = random.Random(0)
+        coordinates = [(48.1 + rng.uniform(0, 0.1), -1.7 + rng.uniform(0, 0.1)) for _ in range(200)]
+        encoded = googlemaps.convert.encode_polyline(coordinates)
+        expected = [c for p in googlemaps.convert.decode_polyline(encoded) for c in (p["lat"], p["lng"])]
+        assert list(decode_polyline(encoded)) == pytest.approx(expected)
+
+    def test_decode_steps_skips_shared_points(self):
+        """Test: The point shared by two consecutive steps is kept once."""
+        steps = [{"polyline": {"points": "wheiHgljMoAcB"}}, {"polyline": {"points": "gkeiHkojMcBwB"}}]
+        assert list(decode_steps(steps)) == pytest.approx([48.8566, 2.3522, 48.857, 2.3527, 48.8575, 2.3533])
+
+    def test_simplify_straight_line(self):
+        """Test: Points on a straight line are dropped, the ends are kept."""
+        points = decode_polyline(googlemaps.convert.encode_polyline([(48.1, -1.7 + i * 0.001) for i in range(50)]))
+        simplified = simplify(points, tolerance=1.0)
+        assert list(simplified) == pytest.approx([48.1, -1.7, 48.1, -1.651])
+
+    def test_simplify_keeps_corners(self):
+        """Test: Points farther than the tolerance from the path are kept."""
+        points = decode_polyline(googlemaps.convert.encode_polyline([(48.1, -1.7), (48.1, -1.69), (48.11, -1.69)]))
+        assert len(simplify(points, tolerance=5.0)) == 6
+
+    def test_simplify_tolerance(self):
+        """Test: The simplified path stays within the tolerance of every original point."""
+        rng = random.Random(1)
+        coordinates = [(48.1 + i * 1e-4 + rng.uniform(-2e-5, 2e-5), -1.7 + i * 1e-4) for i in range(500)]
+        points = decode_polyline(googlemaps.convert.encode_polyline(coordinates))
+        simplified = simplify(points, tolerance=5.0)
+        assert len(simplified) < len(points) / 4
+
+        kept = {(simplified[i], simplified[i + 1]) for i in range(0, len(simplified), 2)}
+        # Each dropped point lies within 5 m of the segment between the kept points around it
+        pairs = [(points[i], points[i + 1]) for i in range(0, len(points), 2)]
+        previous = pairs[0]
+        scale = 111_320.0
+        for i, point in enumerate(pairs):
+            if point in kept:
+                previous = point
+                continue
+            following = next(p for p in pairs[i:] if p in kept)
+            dx = (following[1] - previous[1]) * scale * math.cos(math.radians(48.1))
+            dy = (following[0] - previous[0]) * scale
+            px = (point[1] - previous[1]) * scale * math.cos(math.radians(48.1))
+            py = (point[0] - previous[0]) * scale
+            t = max(0.0, min(1.0, (px * dx + py * dy) / (dx * dx + dy * dy)))
+            assert math.hypot(px - t * dx, py - t * dy) <= 5.0 + 1e-6
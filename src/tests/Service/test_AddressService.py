@@ -3,7 +3,11 @@ import pytest
 from src.DAO.AddressDAO import AddressDAO
 from src.DAO.DBConnector import DBConnector
 from src.Model.Address import Address
-from src.Service.AddressService import AddressService
+from src.Service.AddressService import DELIVERY_ORIGIN, AddressService, zone_key
+from src.Service.Google_Maps import client as client_module
+from src.Service.Google_Maps import map as map_module
+from src.Service.Google_Maps.cache import MapsCache
+from src.Service.Google_Maps.stand_in_client import StandInMapsClient
 from src.utils.reset_database import ResetDatabase
 
 
@@ -13,6 +17,20 @@ def reset_db():
     ResetDatabase(test=True).lancer()
 
 
+@pytest.fixture(autouse=True)
+def maps_client(monkeypatch):
+    """Offline Google Maps client and empty duration cache"""
+    client = StandInMapsClient(
+        durations={
+            (DELIVERY_ORIGIN, "24 Rue de la Paix, 35000 Rennes", "bicycling"): 900,
+            (DELIVERY_ORIGIN, "10 Maple Street, 35000 Rennes", "bicycling"): 1500,
+        }
+    )
+    monkeypatch.setattr(client_module, "_client", client)
+    monkeypatch.setattr(map_module, "duration_cache", MapsCache("durations", ttl=60))
+    return client
+
+
 @pytest.fixture
 def dao():
     """DAO configured for testing"""
@@ -50,3 +68,47 @@ class TestAddressService:
         assert new_addr.address == "24 Rue de la Paix"
         assert new_addr.city == "Rennes"
         assert new_addr.postal_code == 35000
+
+    def test_add_address_fills_zone(self, service, dao, maps_client):
+        """Test: Storing an address stores its travel time, once per destination"""
+        new_addr = service.add_address(address="24 Rue de la Paix", city="Rennes", postal_code=35000)
+        assert len(maps_client.calls) == 1
+        assert dao.get_delivery_durations([zone_key(new_addr)], "bicycling") == {zone_key(new_addr): 900}
+
+        maps_client.calls.clear()
+        same_addr = service.add_address(address="24 rue de la Paix ", city="Rennes", postal_code=35000)
+        assert same_addr.id_address != new_addr.id_address
+        assert maps_client.calls == []
+
+    def test_get_delivery_durations(self, service, maps_client):
+        """Test: Durations are only read from delivery_zone, addresses without one are missing"""
+        new_addr = service.add_address(address="24 Rue de la Paix", city="Rennes", postal_code=35000)
+        old_addr = Address(id_address=999, address="10 Maple Street", postal_code=35000, city="Rennes")
+        maps_client.calls.clear()
+
+        assert service.get_delivery_durations([new_addr, old_addr], "bicycling") == {new_addr.id_address: 900}
+        assert maps_client.calls == []
+
+    def test_get_delivery_durations_unknown_route(self, service):
+        """Test: An address whose travel time cannot be computed is missing from the result"""
+        new_addr = service.add_address(address="1 Nowhere Street", city="Rennes", postal_code=35000)
+        assert new_addr.id_address is not None
+        assert service.get_delivery_durations([new_addr], "bicycling") == {}
+
+    def test_fill_delivery_zone(self, service, dao, maps_client):
+        """Test: Addresses stored without a travel time are filled with one request, same text counted once"""
+        first = dao.add_address(Address(address="24 Rue de la Paix", city="Rennes", postal_code=35000))
+        second = dao.add_address(Address(address="24 Rue de la Paix", city="Rennes", postal_code=35000))
+        old_addr = Address(id_address=999, address="10 Maple Street", postal_code=35000, city="Rennes")
+
+        assert service.fill_delivery_zone([first, second, old_addr], "bicycling") == 2
+        assert len(maps_client.calls) == 1
+        assert service.get_delivery_durations([first, second, old_addr], "bicycling") == {
+            first.id_address: 900,
+            second.id_address: 900,
+            999: 1500,
+        }
+
+        maps_client.calls.clear()
+        assert service.fill_delivery_zone([first, old_addr], "bicycling") == 0
+        assert maps_client.calls == []
@@ -0,0 +1,88 @@
+import time
+from typing import Annotated
+from unittest.mock import patch
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.Service.JWTService import JwtService
+
+
+@pytest.fixture
+def service():
+    return JwtService(secret="test-secret", cache_size=2)
+
+
+class TestJwtService:
+    """Tests for JWT creation, validation and the validated token cache"""
+
+    def test_validate_user_jwt(self, service):
+        """Test: The user id is read back from a token."""
+        token = service.encode_jwt(42).access_token
+        assert service.validate_user_jwt(token) == 42
+
+    def test_signature_verified_once(self, service):
+        """Test: A token already validated is not decoded again."""
+        token = service.encode_jwt(42).access_token
+        with patch.object(service, "decode_jwt", wraps=service.decode_jwt) as decode:
+            for _ in range(3):
+                assert service.validate_claims(token)["user_id"] == 42
+        assert decode.call_count == 1
+
+    def test_invalid_token_not_cached(self, service):
+        """Test: A token signed with another secret is rejected every time."""
+        token = JwtService(secret="other-secret").encode_jwt(42).access_token
+        for _ in range(2):
+            with pytest.raises(jwt.InvalidSignatureError):
+                service.validate_claims(token)
+
+    def test_expired_token(self, service):
+        """Test: A cached token is rejected once it has expired."""
+        token = service.encode_jwt(42).access_token
+        service.validate_claims(token)
+        with patch("src.Service.JWTService.time.time", return_value=time.time() + 1201):
+            with pytest.raises(jwt.ExpiredSignatureError):
+                service.validate_claims(token)
+
+    def test_cache_bounded(self, service):
+        """Test: The least recently used token is evicted when the cache is full."""
+        tokens = [service.encode_jwt(user_id).access_token for user_id in (1, 2, 3)]
+        for token in tokens:
+            service.validate_claims(token)
+
+        with patch.object(service, "decode_jwt", wraps=service.decode_jwt) as decode:
+            service.validate_claims(tokens[2])
+            assert decode.call_count == 0
+            service.validate_claims(tokens[0])
+            assert decode.call_count == 1
+
+    def test_claims_copy(self, service):
+        """Test: Changing the returned claims does not change the cached ones."""
+        token = service.encode_jwt(42).access_token
+        service.validate_claims(token)["user_id"] = 7
+        assert service.validate_user_jwt(token) == 42
+
+
+class TestJWTBearer:
+    """Tests for the JWTBearer dependency"""
+
+    def test_principal_passed_to_endpoint(self):
+        """Test: The endpoint receives the claims and user id of the validated token."""
+        from src.App.init_app import jwt_service
+        from src.App.JWTBearer import JWTBearer, JWTCredentials
+
+        app = FastAPI()
+
+        @app.get("/whoami")
+        def whoami(credentials: Annotated[JWTCredentials, Depends(JWTBearer())]):
+            return {"user_id": credentials.user_id, "claims": sorted(credentials.claims)}
+
+        client = TestClient(app)
+        token = jwt_service.encode_jwt(42).access_token
+        response = client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+        assert response.json() == {"user_id": 42, "claims": ["expiry_timestamp", "user_id"]}
+
+        response = client.get("/whoami", headers={"Authorization": "Bearer not-a-token"})
+        assert response.status_code == 403
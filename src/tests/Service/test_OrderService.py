@@ -1,13 +1,32 @@
+import asyncio
+import csv
+import json
+import threading
+
 import pytest
 
+from src.DAO.AsyncDBConnector import AsyncDBConnector
 from src.DAO.DBConnector import DBConnector
 from src.DAO.OrderDAO import OrderDAO
+from src.Model.OrderLine import OrderLine
 from src.Service.OrderService import OrderService
 from src.utils.reset_database import ResetDatabase
 
 ADDRESS_ID = 999
 
 
+def run(coroutine):
+    """Run a coroutine in a new event loop, closing the pools it opened"""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await AsyncDBConnector.close_all()
+
+    return asyncio.run(main())
+
+
 @pytest.fixture(autouse=True)
 def reset_db():
     """Reset the test database before each test."""
@@ -36,6 +55,32 @@ class TestOrderService:
         assert order_data.id_customer == 999
         assert order_data.total_amount == 0.0
 
+    def test_place_order_ok(self, service):
+        """Test: Place an order with a menu line and a single product line"""
+        lines = [
+            OrderLine(id_product=999, quantity=1, promotion=True),
+            OrderLine(id_product=997, quantity=2),
+            OrderLine(id_product=999, quantity=1),
+        ]
+        placed = service.place_order(999, ADDRESS_ID, lines, "Card")
+        assert placed is not None
+        assert placed["order"].nb_items == 4
+        assert placed["order"].total_amount == pytest.approx(3.0 * 0.9 + 1.5 * 2 + 3.0)
+        assert sorted((p["id_product"], p["quantity"]) for p in placed["products"]) == [(997, 2), (999, 2)]
+
+    def test_place_order_out_of_stock(self, service):
+        """Test: Nothing is written when a product is out of stock"""
+        nb_orders = len(service.list_all_orders())
+        lines = [OrderLine(id_product=997, quantity=1), OrderLine(id_product=998, quantity=100)]
+        assert service.place_order(999, ADDRESS_ID, lines, "Card") is None
+        assert len(service.list_all_orders()) == nb_orders
+        stock = service.orderdao.db_connector.sql_query("SELECT stock FROM product WHERE id_product = 997")
+        assert stock["stock"] == 20
+
+    def test_place_order_empty(self, service):
+        """Test: An order without products is refused"""
+        assert service.place_order(999, ADDRESS_ID, [], "Card") is None
+
     def test_add_product_to_order_ok(self, service):
         """Test: Add a product to an existing order"""
         order = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
@@ -74,12 +119,151 @@ class TestOrderService:
         orders = service.list_all_orders()
         assert any(o["id_order"] == order.id_order for o in orders)
 
+    def test_count_by_status(self, service):
+        """Test: A new order is counted as Ready and every status is present"""
+        before = service.count_by_status()
+        service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+        after = service.count_by_status()
+        assert set(after) == {"Ready", "On the way", "Delivered"}
+        assert after["Ready"] == before["Ready"] + 1
+
+    def test_list_all_orders_usernames(self, service, monkeypatch):
+        """Test: Usernames are resolved with one query per role, whatever the number of orders"""
+        for _ in range(3):
+            order = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+            service.assign_order(998, order.id_order)
+
+        queries = []
+        original_sql_query = service.orderdao.db_connector.sql_query
+
+        def counting_sql_query(*args, **kwargs):
+            queries.append(args[0])
+            return original_sql_query(*args, **kwargs)
+
+        monkeypatch.setattr(service.orderdao.db_connector, "sql_query", counting_sql_query)
+        orders = service.list_all_orders()
+
+        assert len(queries) == 5
+        for o in orders:
+            if o["id_customer"] == 999:
+                assert o["username_customer"] == "AliceM"
+            if o["id_driver"] == 998:
+                assert o["username_driver"] == "DiDi"
+
+    def test_list_orders_page_walks_history(self, service):
+        """Test: Following next_cursor returns every order exactly once, most recent first"""
+        created = [service.create(999, ADDRESS_ID, 0, 0.0, "Cash").id_order for _ in range(5)]
+
+        seen = []
+        page = service.list_orders_page(limit=2)
+        while True:
+            assert len(page["orders"]) <= 2
+            seen.extend(o["id_order"] for o in page["orders"])
+            if page["next_cursor"] is None:
+                break
+            page = service.list_orders_page(limit=2, cursor=page["next_cursor"])
+
+        assert len(seen) == len(set(seen))
+        assert set(created) <= set(seen)
+        assert seen.index(created[-1]) < seen.index(created[0])
+
+    def test_list_orders_page_filters(self, service):
+        """Test: Filters on status and customer are applied"""
+        order = service.create(998, ADDRESS_ID, 0, 0.0, "Cash")
+        service.mark_as_delivered(order.id_order)
+        page = service.list_orders_page(limit=10, status="Delivered", id_customer=998)
+        assert page["orders"]
+        assert all(o["status"] == "Delivered" and o["id_customer"] == 998 for o in page["orders"])
+        assert any(o["id_order"] == order.id_order for o in page["orders"])
+
+    def test_list_orders_page_invalid_cursor(self, service):
+        """Test: An invalid cursor is rejected"""
+        with pytest.raises(ValueError):
+            service.list_orders_page(limit=10, cursor="not-a-cursor")
+
+    def test_list_orders_page_async(self, service):
+        """Test: The async version returns the same page and cursor"""
+        for _ in range(3):
+            service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+        page = service.list_orders_page(limit=2)
+        assert page["next_cursor"] is not None
+        assert run(service.list_orders_page_async(limit=2)) == page
+        assert run(service.list_orders_page_async(limit=2, cursor=page["next_cursor"])) == service.list_orders_page(
+            limit=2, cursor=page["next_cursor"]
+        )
+        with pytest.raises(ValueError):
+            run(service.list_orders_page_async(limit=10, cursor="not-a-cursor"))
+
+    def test_export_orders_ndjson(self, service):
+        """Test: Every order is exported as one JSON line"""
+        order = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+        service.add_product_to_order(order.id_order, 999, 2)
+        lines = list(service.export_orders("ndjson", fetch_size=1))
+        rows = [json.loads(line) for line in lines]
+        assert all(line.endswith("\n") for line in lines)
+        exported = next(r for r in rows if r["id_order"] == order.id_order)
+        assert exported["username_customer"] == "AliceM"
+        assert exported["products_name"] == ["Test Panini"]
+        assert exported["products_quantity"] == [2]
+        assert len(rows) == len(service.list_all_orders())
+
+    def test_export_orders_csv(self, service):
+        """Test: CSV export starts with a header and has one line per order"""
+        rows = list(csv.reader("".join(service.export_orders("csv")).splitlines()))
+        assert rows[0][0] == "id_order"
+        assert len(rows) == len(service.list_all_orders()) + 1
+
+    def test_export_orders_invalid_format(self, service):
+        """Test: Unknown export formats are rejected"""
+        with pytest.raises(ValueError):
+            service.export_orders("xml")
+
     def test_list_all_orders_ready(self, service):
         """Test: List all orders with status 'Ready'"""
         order = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
         orders_ready = service.list_all_orders_ready()
         assert any(o["order"].id_order == order.id_order for o in orders_ready)
 
+    def test_claim_next_ready_order(self, service):
+        """Test: The oldest unassigned ready order is claimed and marked as on the way"""
+        first = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+        second = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
+
+        claimed = service.claim_next_ready_order(998)
+        assert claimed["order"].id_order == first.id_order
+        assert claimed["order"].id_driver == 998
+        assert claimed["order"].status == "On the way"
+
+        assert service.claim_next_ready_order(999, [first.id_order]) is None
+        assert service.claim_next_ready_order(999, [second.id_order])["order"].id_order == second.id_order
+        assert service.claim_next_ready_order(999) is None
+
+    def test_claim_next_ready_order_concurrent(self, service):
+        """Test: Drivers claiming in parallel never get the same order"""
+        created = {service.create(999, ADDRESS_ID, 0, 0.0, "Cash").id_order for _ in range(20)}
+        claims = {998: [], 999: []}
+
+        def claim_all(id_driver):
+            orderdao = OrderDAO(DBConnector(test=True))
+            while True:
+                id_order = orderdao.claim_next_ready_order(id_driver)
+                if id_order is None:
+                    return
+                claims[id_driver].append(id_order)
+
+        threads = [threading.Thread(target=claim_all, args=(id_driver,)) for id_driver in (998, 999, 998, 999)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed = claims[998] + claims[999]
+        assert len(claimed) == len(set(claimed))
+        assert set(claimed) == created
+        for id_driver, id_orders in claims.items():
+            for id_order in id_orders:
+                assert service.orderdao.get_by_id(id_order)["order"].id_driver == id_driver
+
     def test_assign_and_get_assigned_orders(self, service):
         """Test: Assign an order to a driver and retrieve assigned orders"""
         order = service.create(999, ADDRESS_ID, 0, 0.0, "Cash")
@@ -0,0 +1,16 @@
+from src.utils.benchmark_imports import measure_import
+
+
+class TestBenchmarkImports:
+    """Tests for the import time benchmark"""
+
+    def test_maps_helpers_import_lazily(self):
+        """Test: Importing the Google Maps helpers does not load googlemaps nor folium."""
+        for module in ("src.Service.Google_Maps.map", "src.Service.Google_Maps.check_address"):
+            result = measure_import(module, runs=1)
+            assert result["heavy_modules_loaded"] == []
+            assert result["median_ms"] > 0
+
+    def test_api_import_lazily(self):
+        """Test: Starting the API does not load googlemaps nor folium."""
+        assert measure_import("src.App.API", runs=1)["heavy_modules_loaded"] == []
@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.App.API import app
+from src.App.dependencies import get_db_connector, get_order_dao, get_product_dao, get_product_service
+from src.App.init_app import jwt_service
+from src.DAO.DBConnector import DBConnector
+from src.utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_test_environment():
+    """Initialize the test database environment"""
+    ResetDatabase(test=True).lancer()
+
+
+@pytest.fixture
+def client():
+    """API client reading the test schema"""
+    test_connector = DBConnector(test=True)
+    app.dependency_overrides[get_db_connector] = lambda: test_connector
+    # One event loop for the whole test, whose async pools are closed by the lifespan of the app
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def headers():
+    return {"Authorization": f"Bearer {jwt_service.encode_jwt(1).access_token}"}
+
+
+class TestDependencies:
+    """Tests for the FastAPI dependency providers"""
+
+    def test_one_connector_per_process(self):
+        """Test: The connector is created once and reused."""
+        assert get_db_connector() is get_db_connector()
+
+    def test_override_connector(self, client, headers):
+        """Test: Overriding the connector makes the routers read the test schema."""
+        response = client.get("/Product/997", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["name"] == "Test Drink"
+
+    def test_async_endpoints(self, client, headers):
+        """Test: The async endpoints read the overridden database too."""
+        assert client.get("/Product/123456", headers=headers).status_code == 404
+        response = client.get("/Order/", params={"limit": 1}, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["orders"]) == 1
+        assert client.get("/Order/", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+    def test_override_service(self, client, headers):
+        """Test: A service can be replaced by a stand-in."""
+
+        class StandInProductService:
+            def get_id_by_name(self, product_name):
+                return {"id_product": 1, "name": product_name}
+
+        app.dependency_overrides[get_product_service] = StandInProductService
+        response = client.get("/Product/id/Cola", headers=headers)
+        assert response.json() == {"id_product": 1, "name": "Cola"}
+
+    def test_order_dao_reuses_product_dao(self):
+        """Test: The OrderDAO of a request is given the ProductDAO of the same request."""
+        connector = DBConnector(test=True)
+        productdao = get_product_dao(connector)
+        orderdao = get_order_dao(connector, productdao)
+        assert orderdao.productdao is productdao
+        assert orderdao.db_connector is connector
@@ -0,0 +1,100 @@
+import logging
+import re
+import threading
+
+from fastapi.testclient import TestClient
+
+from src.utils.log_context import (
+    CorrelationIdFilter,
+    get_call_depth,
+    get_correlation_id,
+    reset_correlation_id,
+    set_correlation_id,
+)
+from src.utils.log_decorator import log
+
+
+class Nested:
+    def __init__(self, barrier):
+        self.barrier = barrier
+        self.depths = []
+
+    @log
+    def outer(self):
+        self.depths.append(get_call_depth())
+        self.barrier.wait()
+        self.inner()
+        self.barrier.wait()
+        self.depths.append(get_call_depth())
+
+    @log
+    def inner(self):
+        self.depths.append(get_call_depth())
+        self.barrier.wait()
+
+
+class TestLogContext:
+    """Tests for the context-local log state"""
+
+    def test_call_depth_per_thread(self, caplog):
+        """Test: Threads running @log methods at the same time each keep their own depth."""
+        caplog.set_level(logging.INFO, logger="src.utils.log_decorator")
+        barrier = threading.Barrier(4)
+        objects = [Nested(barrier) for _ in range(4)]
+        threads = [threading.Thread(target=o.outer) for o in objects]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [o.depths for o in objects] == [[1, 2, 1]] * 4
+        assert get_call_depth() == 0
+
+    def test_correlation_id_filter(self):
+        """Test: Records get the correlation id of the context they are written in."""
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+        CorrelationIdFilter().filter(record)
+        assert record.correlation_id == "-"
+
+        token = set_correlation_id("abc123")
+        try:
+            record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+            CorrelationIdFilter().filter(record)
+            assert record.correlation_id == "abc123"
+        finally:
+            reset_correlation_id(token)
+        assert get_correlation_id() == "-"
+
+    def test_correlation_id_kept(self):
+        """Test: A record that already has a correlation id keeps it, e.g. in the thread writing queued records."""
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+        record.correlation_id = "abc123"
+        CorrelationIdFilter().filter(record)
+        assert record.correlation_id == "abc123"
+
+    def test_correlation_id_thread_isolation(self):
+        """Test: A correlation id set in a thread is not seen by the others."""
+        seen = {}
+
+        def worker(name):
+            set_correlation_id(name)
+            seen[name] = get_correlation_id()
+
+        threads = [threading.Thread(target=worker, args=(f"req{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert seen == {"req0": "req0", "req1": "req1", "req2": "req2"}
+        assert get_correlation_id() == "-"
+
+    def test_api_request_id(self):
+        """Test: The API sends back the X-Request-ID of the request, or a generated one."""
+        from src.App.API import app
+
+        client = TestClient(app)
+        response = client.get("/", headers={"X-Request-ID": "my-request"}, follow_redirects=False)
+        assert response.headers["X-Request-ID"] == "my-request"
+
+        response = client.get("/", follow_redirects=False)
+        assert re.fullmatch(r"[0-9a-f]{12}", response.headers["X-Request-ID"])
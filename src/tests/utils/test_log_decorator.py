@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.utils.log_decorator import LogIndentation, log, reset_log_settings, set_sample_rate, set_slow_threshold
+
+LOGGER = "src.utils.log_decorator"
+
+
+class Tracked:
+    """Argument counting how many times it is converted to a string"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "tracked"
+
+
+class Service:
+    @log
+    def find(self, value, password=None):
+        return [value] * 5
+
+    @log
+    def size(self, value):
+        return 1
+
+    @log
+    def fail(self):
+        raise ValueError("boom")
+
+    @log(sample_rate=0)
+    def never_logged(self):
+        return 1
+
+    @log
+    async def find_async(self, value):
+        await asyncio.sleep(0)
+        return [value] * 5
+
+    @log(slow_threshold=0.02)
+    def maybe_slow(self, delay):
+        time.sleep(delay)
+        return delay
+
+
+@pytest.fixture(autouse=True)
+def log_settings():
+    """Default decorator settings after each test"""
+    yield
+    reset_log_settings()
+
+
+class TestLogDecorator:
+    """Tests for the @log decorator"""
+
+    def test_logs_call_and_output(self, caplog):
+        """Test: Start, end and shortened output are logged, passwords are hidden."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        assert Service().find(3, password="secret") == [3] * 5
+        messages = [r.getMessage() for r in caplog.records]
+        assert messages[0] == "    Service.find(3, '*****') - START"
+        assert messages[1] == "    Service.find(3, '*****') - END"
+        assert messages[2] == "       └─> Output: ['3', '3', '3'] ... (5 elements)"
+        assert "secret" not in caplog.text
+
+    def test_disabled_level_formats_nothing(self, caplog):
+        """Test: Arguments are not formatted when INFO is disabled."""
+        caplog.set_level(logging.WARNING, logger=LOGGER)
+        arg = Tracked()
+        Service().find(arg)
+        assert arg.formatted == 0
+        assert caplog.records == []
+
+    def test_arguments_formatted_once(self, caplog):
+        """Test: Arguments are formatted once for the START and END records."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        arg = Tracked()
+        Service().size(arg)
+        assert arg.formatted == 1
+
+    def test_exception_restores_indentation(self, caplog):
+        """Test: The indentation is restored when the method raises."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        before = LogIndentation.get_indentation()
+        with pytest.raises(ValueError):
+            Service().fail()
+        assert LogIndentation.get_indentation() == before
+
+    def test_sample_rate(self, caplog):
+        """Test: Calls are not logged with a sample rate of 0, per method or per module."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        assert Service().never_logged() == 1
+        set_sample_rate(__name__.rpartition(".")[0], 0)
+        Service().find(1)
+        assert caplog.records == []
+        set_sample_rate(__name__, 1)
+        Service().find(1)
+        assert len(caplog.records) == 3
+        with pytest.raises(ValueError):
+            set_sample_rate(__name__, 2)
+
+    def test_slow_threshold(self, caplog):
+        """Test: Only calls slower than the threshold are logged."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        Service().maybe_slow(0)
+        assert caplog.records == []
+        Service().maybe_slow(0.03)
+        assert len(caplog.records) == 1
+        assert "Service.maybe_slow(0.03,) - SLOW" in caplog.records[0].getMessage()
+
+        caplog.clear()
+        set_slow_threshold(10)
+        Service().find(1)
+        assert caplog.records == []
+
+    def test_coroutine(self, caplog):
+        """Test: Coroutines are awaited, and logged with the same records."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        assert asyncio.iscoroutinefunction(Service.find_async)
+        assert asyncio.run(Service().find_async(3)) == [3] * 5
+        messages = [r.getMessage() for r in caplog.records]
+        assert messages[0] == "    Service.find_async(3,) - START"
+        assert messages[2] == "       └─> Output: ['3', '3', '3'] ... (5 elements)"
@@ -0,0 +1,195 @@
+import json
+import logging
+import logging.handlers
+import queue
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.utils import log_init
+from src.utils.log_context import reset_correlation_id, set_correlation_id
+from src.utils.log_init import BoundedQueueHandler, JsonFormatter, initialize_logs, shutdown_logs
+
+CONFIG = Path(__file__).resolve().parents[3] / "logging_config.yml"
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """Runs initialize_logs in a temporary folder and restores the logging state afterwards."""
+    shutil.copy(CONFIG, tmp_path / "logging_config.yml")
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    previous = (root.level, list(root.handlers))
+    loggers = {
+        name: logger.disabled
+        for name, logger in logging.root.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger)
+    }
+    yield tmp_path / "logs"
+    shutdown_logs()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in previous[1]:
+        root.addHandler(handler)
+    root.setLevel(previous[0])
+    for name, disabled in loggers.items():
+        logging.getLogger(name).disabled = disabled
+
+
+def read_log(log_dir):
+    return (log_dir / "my_application.log").read_text(encoding="utf8")
+
+
+class TestLogInit:
+    """Tests for the queued logging setup"""
+
+    def test_records_written_by_background_thread(self, log_dir):
+        """Test: Records go through the queue and are written once the logs are shut down."""
+        initialize_logs("Test")
+        root = logging.getLogger()
+        assert [type(handler) for handler in root.handlers] == [BoundedQueueHandler]
+
+        logging.getLogger("src.test").info("hello %s", "world")
+        shutdown_logs()
+
+        content = read_log(log_dir)
+        assert "Starting Test" in content
+        assert "hello world" in content
+        assert not root.handlers
+
+    def test_named_logger_queued(self, log_dir):
+        """Test: The named loggers of the configuration write through the queue too."""
+        initialize_logs("Test")
+        simple_logger = logging.getLogger("simpleLogger")
+        assert simple_logger.handlers == [log_init._queue_handler]
+
+        simple_logger.info("from simpleLogger")
+        shutdown_logs()
+
+        assert simple_logger.handlers == []
+        assert read_log(log_dir).count("from simpleLogger") == 1
+
+    def test_correlation_id_from_logging_thread(self, log_dir):
+        """Test: The correlation id is the one of the thread that logs, not of the writing thread."""
+        initialize_logs("Test")
+        token = set_correlation_id("abc123")
+        try:
+            logging.info("in request")
+        finally:
+            reset_correlation_id(token)
+        shutdown_logs()
+
+        assert "[abc123] in request" in read_log(log_dir)
+
+    def test_json_format(self, log_dir):
+        """Test: Each line is a JSON object when the JSON format is chosen."""
+        initialize_logs("Test", json_format=True)
+        token = set_correlation_id("abc123")
+        try:
+            logging.getLogger("src.test").warning("stock low: %d", 3)
+        finally:
+            reset_correlation_id(token)
+        shutdown_logs()
+
+        entries = [json.loads(line) for line in read_log(log_dir).splitlines()]
+        assert entries[-1]["message"] == "stock low: 3"
+        assert entries[-1]["level"] == "WARNING"
+        assert entries[-1]["logger"] == "src.test"
+        assert entries[-1]["correlation_id"] == "abc123"
+
+    def test_json_exception(self, log_dir):
+        """Test: A traceback logged through the queue is written in the exception field, not in the message."""
+        initialize_logs("Test", json_format=True)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("src.test").error("failed %s", "here", exc_info=True)
+        shutdown_logs()
+
+        entry = json.loads(read_log(log_dir).splitlines()[-1])
+        assert entry["message"] == "failed here"
+        assert "RuntimeError: boom" in entry["exception"]
+
+    def test_text_exception(self, log_dir):
+        """Test: The text format still writes the traceback after the message."""
+        initialize_logs("Test")
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("src.test").exception("failed")
+        shutdown_logs()
+
+        content = read_log(log_dir)
+        assert "failed\nTraceback" in content
+        assert content.count("RuntimeError: boom") == 1
+
+    def test_unknown_policy(self):
+        """Test: An unknown queue policy is rejected."""
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), "wait")
+
+
+class TestBoundedQueueHandler:
+    """Tests for the full queue policies"""
+
+    def make_record(self, message):
+        return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+    def test_drop_when_full(self):
+        """Test: With the drop policy, records are counted and dropped when the queue is full."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), "drop")
+        for i in range(5):
+            handler.handle(self.make_record(f"message {i}"))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_block_when_full(self):
+        """Test: With the block policy, the caller waits until the queue has some room."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), "block")
+        handler.handle(self.make_record("first"))
+        done = threading.Event()
+
+        def emit_second():
+            handler.handle(self.make_record("second"))
+            done.set()
+
+        thread = threading.Thread(target=emit_second)
+        thread.start()
+        assert not done.wait(0.1)
+
+        assert handler.queue.get().getMessage() == "first"
+        thread.join(timeout=1)
+        assert done.is_set()
+        assert handler.queue.get().getMessage() == "second"
+        assert handler.dropped == 0
+
+    def test_dropped_records_reported(self, log_dir):
+        """Test: The number of dropped records is written when the logs are shut down."""
+        initialize_logs("Test")
+        log_init._queue_handler.dropped = 4
+        assert log_init.dropped_records() == 4
+        shutdown_logs()
+
+        assert "4 log records dropped" in read_log(log_dir)
+
+
+class TestJsonFormatter:
+    """Tests for the JSON formatter"""
+
+    def test_exception(self):
+        """Test: The traceback is included in the JSON object."""
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = logging.getLogger("test").makeRecord(
+                "test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info()
+            )
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "failed"
+        assert "RuntimeError: boom" in entry["exception"]
+        assert entry["correlation_id"] == "-"
@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Tests for the in-process metrics registry"""
+
+    def test_counter_and_gauge(self):
+        """Test: Counters and gauges are rendered with their labels."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("method",))
+        requests.inc(method="GET")
+        requests.inc(2, method="GET")
+        in_flight = registry.gauge("in_flight", "In flight.")
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{method="GET"} 3' in text
+        assert "in_flight 1" in text
+
+    def test_same_metric_returned(self):
+        """Test: Asking twice for a metric returns the same one, with other labels it fails."""
+        registry = MetricsRegistry()
+        assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+        with pytest.raises(ValueError):
+            registry.gauge("a_total", "A.")
+
+    def test_wrong_labels(self):
+        """Test: Labels must match the ones declared."""
+        with pytest.raises(ValueError):
+            Counter("a_total", "A.", ("method",)).inc(route="/")
+
+    def test_histogram(self):
+        """Test: Histogram buckets are cumulative, with sum and count."""
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.5, route="/a")
+        histogram.observe(3, route="/a")
+
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+
+    def test_histogram_load(self):
+        """Test: A histogram can be filled from cumulative counts computed elsewhere."""
+        histogram = Histogram("query_seconds", "Query.", ("query",), buckets=(0.1, 1.0))
+        histogram.load([1, 3, 4], 2.5, query="SELECT ?")
+
+        lines = histogram.render()
+        assert 'query_seconds_bucket{query="SELECT ?",le="1.0"} 3' in lines
+        assert 'query_seconds_count{query="SELECT ?"} 4' in lines
+
+    def test_label_escaping(self):
+        """Test: Quotes, backslashes and new lines are escaped in label values."""
+        gauge = Gauge("g", "G.", ("query",))
+        gauge.set(1, query='SELECT "a"\n\\')
+        assert 'g{query="SELECT \\"a\\"\\n\\\\"} 1' in gauge.render()
+
+    def test_failing_collector(self):
+        """Test: A failing collector does not prevent the other metrics from being rendered."""
+        registry = MetricsRegistry()
+        registry.counter("ok_total", "Ok.").inc()
+
+        def broken():
+            raise RuntimeError("down")
+
+        registry.register_collector(broken)
+        assert "ok_total 1" in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Tests for the /metrics endpoint of the API"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """API client with a metrics token set and no order counts cached"""
+        from src.App import MetricsController
+        from src.App.API import app
+
+        monkeypatch.setattr(MetricsController, "METRICS_TOKEN", "scraper-token")
+        monkeypatch.setattr(MetricsController, "_order_counts", (0.0, {}))
+        return TestClient(app)
+
+    def test_metrics(self, client):
+        """Test: /metrics reports request latency by route template, pool, maps and order metrics."""
+        client.get("/Product/12345")
+        response = client.get("/metrics", headers={"Authorization": "Bearer scraper-token"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/Product/{product_id}",status="401"}' in text
+        assert "http_requests_in_flight 1" in text
+        assert 'db_pool_max_size{pool="sync"}' in text
+        assert 'db_pool_max_size{pool="async"}' in text
+        assert 'maps_cache_hit_ratio{cache="geocode"}' in text
+        assert 'orders{status="Ready"}' in text
+
+    def test_metrics_token_required(self, client, monkeypatch):
+        """Test: /metrics is refused without the metrics token, and to everyone when no token is set."""
+        from src.App import MetricsController
+
+        assert client.get("/metrics").status_code == 403
+        assert client.get("/metrics", headers={"Authorization": "Bearer other"}).status_code == 403
+        monkeypatch.setattr(MetricsController, "METRICS_TOKEN", None)
+        assert client.get("/metrics", headers={"Authorization": "Bearer scraper-token"}).status_code == 403
+
+    def test_order_counts_cached(self, client, monkeypatch):
+        """Test: Orders are counted once for several scrapes within ORDER_COUNTS_TTL."""
+        from src.Service.OrderService import OrderService
+
+        calls = []
+        monkeypatch.setattr(OrderService, "count_by_status", lambda self: calls.append(1) or {"Ready": 2})
+        for _ in range(3):
+            response = client.get("/metrics", headers={"Authorization": "Bearer scraper-token"})
+            assert 'orders{status="Ready"} 2' in response.text
+        assert len(calls) == 1
@@ -0,0 +1,89 @@
+import pytest
+from dotenv import load_dotenv
+
+from src.DAO.DBConnector import DBConnector
+from src.utils.migrate_database import MigrateDatabase
+from src.utils.reset_database import ResetDatabase
+
+load_dotenv()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_test_environment():
+    """Reset DB before tests"""
+    ResetDatabase(test=True).lancer()
+
+
+@pytest.fixture
+def db():
+    return DBConnector(test=True)
+
+
+def explain(db, query, data=None):
+    """Return the plan of a query, with sequential scans disabled so that the
+    planner picks an index whenever one matches, even on the small test tables."""
+    with db.transaction() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("EXPLAIN " + query, data)
+        return "\n".join(row["QUERY PLAN"] for row in cursor.fetchall())
+
+
+class TestMigrateDatabase:
+    """Tests for MigrateDatabase and the indexes it creates"""
+
+    def test_migrations_applied_by_reset(self):
+        """Test: Resetting the schema applies every migration."""
+        migrate = MigrateDatabase(test=True)
+        versions = {version for version, _, _ in migrate.list_migrations()}
+        assert versions
+        assert migrate.applied_versions() == versions
+
+    def test_lancer_idempotent(self):
+        """Test: Running the migrations again applies nothing."""
+        assert MigrateDatabase(test=True).lancer() == []
+
+    def test_pending_migration_applied(self, tmp_path, db):
+        """Test: A new script is applied once and recorded."""
+        (tmp_path / "999_test_table.sql").write_text("CREATE TABLE migration_test (id INT);")
+        (tmp_path / "not_a_migration.txt").write_text("DROP TABLE orders;")
+        migrate = MigrateDatabase(test=True, migrations_dir=str(tmp_path))
+        try:
+            assert migrate.lancer() == [999]
+            assert migrate.lancer() == []
+            assert db.sql_query("SELECT count(*) AS n FROM migration_test")["n"] == 0
+        finally:
+            db.sql_query("DROP TABLE IF EXISTS migration_test", None, None)
+            db.sql_query("DELETE FROM schema_migrations WHERE version = 999", None, None)
+
+    @pytest.mark.parametrize(
+        "query, data, index",
+        [
+            ("SELECT * FROM orders WHERE status = 'Ready' ORDER BY date, id_order", None, "idx_orders_ready_date"),
+            (
+                "SELECT * FROM orders WHERE id_customer = %s ORDER BY date DESC, id_order DESC",
+                [999],
+                "idx_orders_customer_date",
+            ),
+            (
+                "SELECT * FROM orders WHERE id_driver = %s ORDER BY date DESC, id_order DESC",
+                [999],
+                "idx_orders_driver_date",
+            ),
+            (
+                "SELECT * FROM orders WHERE status = %s ORDER BY date DESC, id_order DESC LIMIT 10",
+                ["Delivered"],
+                "idx_orders_status_date",
+            ),
+            ("SELECT * FROM orders ORDER BY date DESC, id_order DESC LIMIT 10", None, "idx_orders_date"),
+            ("SELECT * FROM order_products WHERE id_product = %s", [999], "idx_order_products_product"),
+            (
+                "SELECT id_order FROM orders WHERE status = 'Ready' AND id_driver IS NULL ORDER BY date, id_order "
+                "LIMIT 1 FOR UPDATE SKIP LOCKED",
+                None,
+                "idx_orders_dispatch",
+            ),
+        ],
+    )
+    def test_index_used(self, db, query, data, index):
+        """Test: The hot order lookups are served by their index."""
+        assert index in explain(db, query, data)
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.App.API import app
+from src.App.dependencies import get_address_service, get_db_connector
+from src.App.init_app import jwt_service
+from src.DAO.DBConnector import DBConnector
+from src.Model.Address import Address
+from src.utils.reset_database import ResetDatabase
+
+ORDER = {
+    "address": "10 Maple Street",
+    "city": "Rennes",
+    "postal_code": 35000,
+    "payment_method": "Card",
+    "lines": [{"id_product": 997, "quantity": 1}],
+}
+
+
+class StandInAddressService:
+    """Accepts every address and stores none, so that no Google Maps request is sent"""
+
+    def validate_address(self, address):
+        return True
+
+    def add_address(self, address, city, postal_code):
+        return Address(id_address=999, address=address, city=city, postal_code=postal_code)
+
+
+@pytest.fixture(autouse=True)
+def reset_db():
+    """Reset the test database before each test."""
+    ResetDatabase(test=True).lancer()
+
+
+@pytest.fixture
+def client():
+    """API client reading the test schema"""
+    test_connector = DBConnector(test=True)
+    app.dependency_overrides[get_db_connector] = lambda: test_connector
+    app.dependency_overrides[get_address_service] = StandInAddressService
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def headers(id_user):
+    return {"Authorization": f"Bearer {jwt_service.encode_jwt(id_user).access_token}"}
+
+
+class TestOrderRouter:
+    """Tests for the order endpoints"""
+
+    def test_place_order_own_customer(self, client):
+        """Test: A user places an order for their own customer account."""
+        # User 998 is customer 999
+        response = client.post("/Order/", json={**ORDER, "id_customer": 999}, headers=headers(998))
+        assert response.status_code == 201
+        assert response.json()["order"]["id_customer"] == 999
+
+    def test_place_order_other_customer(self, client):
+        """Test: A user cannot place an order for another customer."""
+        # Customer 998 belongs to user 997
+        response = client.post("/Order/", json={**ORDER, "id_customer": 998}, headers=headers(998))
+        assert response.status_code == 403
+
+    def test_place_order_not_a_customer(self, client):
+        """Test: A user without a customer account cannot place an order."""
+        response = client.post("/Order/", json={**ORDER, "id_customer": 999}, headers=headers(995))
+        assert response.status_code == 403
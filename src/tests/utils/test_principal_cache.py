@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from src.utils.principal_cache import PrincipalCache
+
+
+class TestPrincipalCache:
+    """Tests for the authenticated principal cache"""
+
+    def test_get_set(self):
+        """Test: A cached principal is returned until its TTL runs out."""
+        cache = PrincipalCache(ttl=30)
+        cache.set("admin", 1, 10, "admin profile")
+        assert cache.get("admin", 1) == "admin profile"
+        assert cache.get("user", 1) is None
+
+        with patch("src.utils.principal_cache.time.monotonic", return_value=1e12):
+            assert cache.get("admin", 1) is None
+
+    def test_invalidate_user(self):
+        """Test: Every entry built from a user is dropped, whatever its kind."""
+        cache = PrincipalCache()
+        cache.set("user", 10, 10, "user profile")
+        cache.set("admin", 1, 10, "admin profile")
+        cache.set("user", 11, 11, "other user")
+
+        cache.invalidate_user(10)
+        assert cache.get("user", 10) is None
+        assert cache.get("admin", 1) is None
+        assert cache.get("user", 11) == "other user"
+
+    def test_bounded(self):
+        """Test: The least recently used entry is evicted when the cache is full."""
+        cache = PrincipalCache(max_size=2)
+        cache.set("user", 1, 1, "a")
+        cache.set("user", 2, 2, "b")
+        cache.get("user", 1)
+        cache.set("user", 3, 3, "c")
+        assert cache.get("user", 1) == "a"
+        assert cache.get("user", 2) is None
+
+    def test_disabled(self):
+        """Test: Nothing is cached with a TTL of 0."""
+        cache = PrincipalCache(ttl=0)
+        cache.set("user", 1, 1, "a")
+        assert cache.get("user", 1) is None
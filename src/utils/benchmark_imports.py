@@ -0,0 +1,78 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Entry points of the CLI and the API, and the Google Maps helpers they rely on
+DEFAULT_MODULES = (
+    "src.main_CLI",
+    "src.App.API",
+    "src.CLI.driver.manage_order_view",
+    "src.Service.Google_Maps.map",
+)
+# Packages that are slow to import and should only be loaded when actually used
+HEAVY_MODULES = ("googlemaps", "folium")
+
+_MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, runs: int = 5) -> Dict:
+    """Import a module in fresh interpreters and time it.
+
+    Parameters
+    ----------
+    module : str
+        Dotted name of the module to import.
+    runs : int
+        Number of interpreters started, the median time is kept.
+
+    Returns
+    -------
+    dict
+        module, median and best time in milliseconds, and the heavy packages the import loaded.
+    """
+    timings: List[float] = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _MEASURE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded = result["loaded"]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings), 1),
+        "best_ms": round(min(timings), 1),
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def benchmark_imports(modules=DEFAULT_MODULES, runs: int = 5) -> List[Dict]:
+    """Measure the import time of each module."""
+    return [measure_import(module, runs) for module in modules]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the import time of the application entry points.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per module (default: 5)")
+    args = parser.parse_args()
+
+    for result in benchmark_imports(args.modules, args.runs):
+        heavy = ", ".join(result["heavy_modules_loaded"]) or "-"
+        print(
+            f"{result['module']:<40} median {result['median_ms']:>8.1f} ms"
+            f"   best {result['best_ms']:>8.1f} ms   loads: {heavy}"
+        )
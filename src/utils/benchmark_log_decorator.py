@@ -0,0 +1,64 @@
+import argparse
+import io
+import logging
+import timeit
+from typing import Dict, List
+
+from src.utils import log_decorator
+from src.utils.log_decorator import log
+
+
+class _Dao:
+    """Stand-in for a DAO: a cheap method taking a few arguments and returning a list."""
+
+    def get(self, id_order, status="Ready"):
+        return [{"id_order": id_order, "status": status}] * 5
+
+
+def _measure(method, number: int) -> float:
+    """Average cost of one call, in nanoseconds."""
+    return min(timeit.repeat(lambda: method(_Dao(), 999, status="Ready"), number=number, repeat=5)) / number * 1e9
+
+
+def benchmark_log_decorator(number: int = 20000) -> List[Dict]:
+    """Measure the overhead of @log in its different modes against an undecorated call.
+
+    Log records are written to an in-memory stream so that disk speed does not matter.
+
+    Returns
+    -------
+    list of dict
+        case, nanoseconds per call and overhead compared to the undecorated call.
+    """
+    stream_handler = logging.StreamHandler(io.StringIO())
+    logger = log_decorator.logger
+    previous = (logger.level, logger.propagate)
+    logger.addHandler(stream_handler)
+    logger.propagate = False
+    try:
+        cases = {}
+        cases["undecorated"] = _measure(_Dao.get, number)
+
+        logger.setLevel(logging.WARNING)
+        cases["@log, INFO disabled"] = _measure(log(_Dao.get), number)
+
+        logger.setLevel(logging.INFO)
+        cases["@log, every call logged"] = _measure(log(_Dao.get), number)
+        cases["@log(sample_rate=0.01)"] = _measure(log(sample_rate=0.01)(_Dao.get), number)
+        cases["@log(slow_threshold=0.05)"] = _measure(log(slow_threshold=0.05)(_Dao.get), number)
+    finally:
+        logger.removeHandler(stream_handler)
+        logger.setLevel(previous[0])
+        logger.propagate = previous[1]
+
+    baseline = cases["undecorated"]
+    return [{"case": case, "ns_per_call": round(ns), "overhead_ns": round(ns - baseline)} for case, ns in cases.items()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the overhead of the @log decorator.")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measure (default: 20000)")
+    args = parser.parse_args()
+
+    for result in benchmark_log_decorator(args.number):
+        print(f"{result['case']:<30} {result['ns_per_call']:>8} ns/call   overhead {result['overhead_ns']:>8} ns")
@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+import dotenv
+
+from src.DAO.DBConnector import DBConnector
+from src.DAO.OrderDAO import OrderDAO
+from src.Service.OrderService import EXPORT_FORMATS, OrderService
+
+dotenv.load_dotenv()
+
+
+def export_orders(output, file_format: str = "ndjson", fetch_size: int = 1000, test: bool = False) -> int:
+    """Write the full order history to output and return the number of lines written."""
+    order_service = OrderService(OrderDAO(DBConnector(test=test)))
+    nb_lines = 0
+    for line in order_service.export_orders(file_format=file_format, fetch_size=fetch_size):
+        output.write(line)
+        nb_lines += 1
+    return nb_lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all orders as NDJSON or CSV")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", dest="file_format")
+    parser.add_argument("--output", help="Output file (default: standard output)")
+    parser.add_argument("--fetch-size", type=int, default=1000, help="Rows fetched from the database per round trip")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            export_orders(f, args.file_format, args.fetch_size)
+    else:
+        export_orders(sys.stdout, args.file_format, args.fetch_size)
@@ -0,0 +1,68 @@
+import logging
+import uuid
+from contextvars import ContextVar, Token
+from typing import Optional
+
+# Both values are local to the current thread or asyncio task, so concurrent requests
+# each see their own call depth and id without any lock.
+_call_depth: ContextVar[int] = ContextVar("log_call_depth", default=0)
+_correlation_id: ContextVar[str] = ContextVar("log_correlation_id", default="-")
+
+
+def get_call_depth() -> int:
+    """Return the number of @log calls currently running in this context."""
+    return _call_depth.get()
+
+
+def enter_call() -> Token:
+    """Increase the call depth. Give the returned token back to exit_call."""
+    return _call_depth.set(_call_depth.get() + 1)
+
+
+def exit_call(token: Token):
+    """Restore the call depth as it was before enter_call."""
+    _call_depth.reset(token)
+
+
+def new_correlation_id() -> str:
+    """Generate a short random correlation id."""
+    return uuid.uuid4().hex[:12]
+
+
+def get_correlation_id() -> str:
+    """Return the correlation id of the current request, "-" outside of a request."""
+    return _correlation_id.get()
+
+
+def set_correlation_id(correlation_id: Optional[str] = None) -> Token:
+    """Set the correlation id written on the log lines of the current context.
+
+    Parameters
+    ----------
+    correlation_id : str, optional
+        Id to use, e.g. from an X-Request-ID header. A new one is generated if None.
+
+    Returns
+    -------
+    Token
+        Can be given to reset_correlation_id to restore the previous id.
+    """
+    return _correlation_id.set(correlation_id or new_correlation_id())
+
+
+def reset_correlation_id(token: Token):
+    """Restore the correlation id as it was before set_correlation_id."""
+    _correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Logging filter adding the correlation id of the current context to each record.
+
+    Use %(correlation_id)s in the format of the handler. A record that already has an id
+    keeps it, since handlers behind a queue run in another thread than the logging call.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = _correlation_id.get()
+        return True
@@ -1,87 +1,254 @@
+import inspect
 import logging.config
 import numbers
-from functools import wraps
+import os
+import random
+import time
+from contextvars import Token
+from functools import lru_cache, wraps
+from typing import Dict, Optional
+
+from src.utils.log_context import enter_call, exit_call, get_call_depth
+
+logger = logging.getLogger(__name__)
+
+SENSITIVE_PARAMS = frozenset(["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"])
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse LOG_SAMPLE_RATES, e.g. "src.DAO=0.1,src.Service.OrderService=0.5"."""
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            module, rate = item.split("=", 1)
+            rates[module.strip()] = float(rate)
+    return rates
+
+
+# Share of the calls logged, by module (or package) of the decorated method. 1 logs every call.
+_sample_rates: Dict[str, float] = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+# When set, only calls lasting at least this number of seconds are logged
+_slow_threshold: Optional[float] = (
+    float(os.environ["LOG_SLOW_THRESHOLD_MS"]) / 1000 if os.getenv("LOG_SLOW_THRESHOLD_MS") else None
+)
+
+
+def set_sample_rate(module: str, rate: float):
+    """Log only a share of the calls of the methods defined in a module or package.
+
+    Parameters
+    ----------
+    module : str
+        Module or package name, e.g. "src.DAO" or "src.DAO.OrderDAO".
+    rate : float
+        Between 0 (no call logged) and 1 (every call logged).
+    """
+    if not 0 <= rate <= 1:
+        raise ValueError("The sample rate must be between 0 and 1")
+    _sample_rates[module] = rate
+    _module_sample_rate.cache_clear()
+
+
+def set_slow_threshold(seconds: Optional[float]):
+    """Only log the calls lasting at least this number of seconds. None logs every call."""
+    global _slow_threshold
+    _slow_threshold = seconds
+
+
+def reset_log_settings():
+    """Log every call again."""
+    _sample_rates.clear()
+    _module_sample_rate.cache_clear()
+    set_slow_threshold(None)
+
+
+@lru_cache(maxsize=None)
+def _module_sample_rate(module: str) -> float:
+    """Sample rate of the most specific module or package configured."""
+    name = module
+    while name:
+        if name in _sample_rates:
+            return _sample_rates[name]
+        name = name.rpartition(".")[0]
+    return 1.0
 
 
 class LogIndentation:
     """Handles indentation for logs when entering a new method."""
 
-    current_indentation = 0
-
     @classmethod
-    def increase_indentation(cls):
-        """Increase the indentation level."""
-        cls.current_indentation += 1
+    def increase_indentation(cls) -> Token:
+        """Increase the indentation level. Give the returned token back to decrease_indentation."""
+        # The depth is kept in a context variable, so each thread and each asyncio task
+        # (i.e. each API request) has its own indentation
+        return enter_call()
 
     @classmethod
-    def decrease_indentation(cls):
-        """Decrease the indentation level."""
-        cls.current_indentation -= 1
+    def decrease_indentation(cls, token: Token):
+        """Restore the indentation level as it was before increase_indentation."""
+        exit_call(token)
 
     @classmethod
     def get_indentation(cls):
         """Get the current indentation as a string."""
-        return "    " * cls.current_indentation
+        return "    " * get_call_depth()
+
+
+class _Call:
+    """Method call description, only formatted if a log record is actually written."""
+
+    __slots__ = ("func", "args", "kwargs", "_text")
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._text = None
 
+    def __str__(self):
+        if self._text is None:
+            class_name = self.args[0].__class__.__name__ if self.args else ""
+            args_list = [str(arg) if not isinstance(arg, numbers.Number) else arg for arg in self.args[1:]]
 
-def log(func):
+            # Hide passwords in logs
+            code = self.func.__code__
+            param_names = code.co_varnames[1 : code.co_argcount]
+            for i, name in enumerate(param_names[: len(args_list)]):
+                if name in SENSITIVE_PARAMS:
+                    args_list[i] = "*****"
+            args_list += ["*****" if k in SENSITIVE_PARAMS else v for k, v in self.kwargs.items()]
+
+            # Convert to tuple for display with parentheses
+            self._text = f"{class_name}.{self.func.__name__}{tuple(args_list)}"
+        return self._text
+
+
+class _Output:
+    """Method output, shortened and only formatted if a log record is actually written."""
+
+    __slots__ = ("result",)
+
+    def __init__(self, result):
+        self.result = result
+
+    def __str__(self):
+        result = self.result
+        # Shorten long outputs for logging
+        if isinstance(result, list):
+            return str([str(item) for item in result[:3]]) + f" ... ({len(result)} elements)"
+        if isinstance(result, dict):
+            return str([(str(k), str(v)) for k, v in list(result.items())[:3]]) + f" ... ({len(result)} elements)"
+        if isinstance(result, str) and len(result) > 50:
+            return result[:50] + f" ... ({len(result)} characters)"
+        return str(result)
+
+
+def _is_logged(module: str, sample_rate: Optional[float]) -> bool:
+    """Whether this call is logged, given the INFO level and the sample rate."""
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    rate = sample_rate if sample_rate is not None else _module_sample_rate(module)
+    return rate >= 1 or random.random() < rate
+
+
+def _threshold(slow_threshold: Optional[float]) -> Optional[float]:
+    """Duration in seconds below which a call is not logged, None to log every call."""
+    return slow_threshold if slow_threshold is not None else _slow_threshold
+
+
+def _log_if_slow(call: _Call, elapsed: float, threshold: float, result):
+    """Log a call and its output in one record if it lasted at least threshold seconds."""
+    if elapsed >= threshold:
+        logger.info("%s - SLOW %.1f ms\n   └─> Output: %s", call, elapsed * 1000, _Output(result))
+
+
+def _log_start(indentation: str, call: _Call):
+    """Log the method call."""
+    logger.info("%s%s - START", indentation, call)
+
+
+def _log_end(indentation: str, call: _Call, result):
+    """Log the end of the method call and its output."""
+    logger.info("%s%s - END", indentation, call)
+    logger.info("%s   └─> Output: %s", indentation, _Output(result))
+
+
+def _log_coroutine(func, sample_rate: Optional[float], slow_threshold: Optional[float]):
+    """Version of the log decorator for coroutine functions, awaiting the call."""
+    module = func.__module__
+
+    @wraps(func)
+    async def async_wrapper(*args, **kwargs):
+        if not _is_logged(module, sample_rate):
+            return await func(*args, **kwargs)
+
+        threshold = _threshold(slow_threshold)
+        if threshold is not None:
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            _log_if_slow(_Call(func, args, kwargs), time.perf_counter() - start, threshold, result)
+            return result
+
+        token = LogIndentation.increase_indentation()
+        indentation = LogIndentation.get_indentation()
+        call = _Call(func, args, kwargs)
+        try:
+            _log_start(indentation, call)
+            result = await func(*args, **kwargs)
+            _log_end(indentation, call, result)
+            return result
+        finally:
+            LogIndentation.decrease_indentation(token)
+
+    return async_wrapper
+
+
+def log(func=None, *, sample_rate: Optional[float] = None, slow_threshold: Optional[float] = None):
     """
     Decorator that logs method calls and their outputs.
 
     When applied to a method, this decorator will log:
     - The method call with parameter values
     - The returned output from the method
+
+    Nothing is formatted when INFO is disabled. Can be used as @log or with options:
+
+    Parameters
+    ----------
+    sample_rate : float, optional
+        Share of the calls logged. Defaults to the rate set for the module with set_sample_rate.
+    slow_threshold : float, optional
+        Only log the calls lasting at least this number of seconds. Defaults to set_slow_threshold.
     """
+    if func is None:
+        return lambda f: log(f, sample_rate=sample_rate, slow_threshold=slow_threshold)
+
+    module = func.__module__
+
+    if inspect.iscoroutinefunction(func):
+        return _log_coroutine(func, sample_rate, slow_threshold)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = logging.getLogger(__name__)
-
-        LogIndentation.increase_indentation()
-        indentation = LogIndentation.get_indentation()
+        if not _is_logged(module, sample_rate):
+            return func(*args, **kwargs)
 
-        # Retrieve method parameters
-        class_name = args[0].__class__.__name__ if args else ""
-        method_name = func.__name__
-        args_list = list(
-            [
-                str(arg) if not isinstance(arg, numbers.Number) else arg
-                for arg in args[1:]
-            ]
-            + list(kwargs.values())
-        )
-
-        # Hide passwords in logs
-        param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
-        for i, v in enumerate(param_names):
-            if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"]:
-                args_list[i] = "*****"
-
-        # Convert to tuple for display with parentheses
-        args_list = tuple(args_list)
-
-        # Log the method call
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - START")
-        result = func(*args, **kwargs)
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - END")
+        threshold = _threshold(slow_threshold)
+        if threshold is not None:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            _log_if_slow(_Call(func, args, kwargs), time.perf_counter() - start, threshold, result)
+            return result
 
-        # Shorten long outputs for logging
-        if isinstance(result, list):
-            result_str = str([str(item) for item in result[:3]])
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, dict):
-            result_str = [(str(k), str(v)) for k, v in result.items()][:3]
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, str) and len(result) > 50:
-            result_str = result[:50]
-            result_str += " ... (" + str(len(result)) + " characters)"
-        else:
-            result_str = str(result)
-
-        logger.info(f"{indentation}   └─> Output: {result_str}")
-
-        LogIndentation.decrease_indentation()
-
-        return result
+        token = LogIndentation.increase_indentation()
+        indentation = LogIndentation.get_indentation()
+        call = _Call(func, args, kwargs)
+        try:
+            _log_start(indentation, call)
+            result = func(*args, **kwargs)
+            _log_end(indentation, call, result)
+            return result
+        finally:
+            LogIndentation.decrease_indentation(token)
 
     return wrapper
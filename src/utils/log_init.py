@@ -1,22 +1,192 @@
+import atexit
+import copy
+import datetime
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+from typing import List, Optional
 
 import yaml
 
+from src.utils.log_context import CorrelationIdFilter
 
-def initialize_logs(name):
-    """Initialize logging using the configuration file."""
+QUEUE_POLICIES = ("drop", "block")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_exception_formatter = logging.Formatter()
+_queue_handler: Optional["BoundedQueueHandler"] = None
+# Loggers whose handlers were replaced by the queue handler
+_queued_loggers: List[logging.Logger] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a bounded queue.
+
+    When the queue is full, the record is either dropped (and counted) or the caller
+    waits for some room, depending on the policy.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: Optional[float] = None):
+        super().__init__(log_queue)
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}, expected one of {QUEUE_POLICIES}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message, and keep the traceback apart from it.
+
+        QueueHandler.prepare appends the traceback to the message. Here it is kept in exc_text,
+        so the formatters of the writing thread still find it: the text formatter appends it to
+        the line, and JsonFormatter writes it in the "exception" field.
+        """
+        exc_text = record.exc_text
+        if record.exc_info:
+            exc_text = _exception_formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def initialize_logs(
+    name,
+    queue_size: Optional[int] = None,
+    policy: Optional[str] = None,
+    json_format: Optional[bool] = None,
+):
+    """Initialize logging using the configuration file.
+
+    The handlers of the configuration, those of the root logger and of the named loggers, are
+    moved behind one queue: logging calls only put the record in the queue, and a background
+    thread writes it to the files. A named logger writes to every handler behind the queue.
+
+    Parameters
+    ----------
+    name : str
+        Name of the program, written at the top of the logs.
+    queue_size : int, optional
+        Maximum number of records waiting to be written. LOG_QUEUE_SIZE or 10000 by default.
+    policy : str, optional
+        "drop" to drop the records when the queue is full, "block" to wait for room.
+        LOG_QUEUE_POLICY or "drop" by default.
+    json_format : bool, optional
+        Write one JSON object per line instead of text. True if LOG_FORMAT is "json".
+    """
+    global _listener, _queue_handler
+
+    shutdown_logs()
 
     # Create the 'logs' folder at the project root if it doesn't exist
     os.makedirs("logs", exist_ok=True)
 
     # Load logging configuration from YAML file
-    stream = open("logging_config.yml", encoding="utf-8")
-    config = yaml.load(stream, Loader=yaml.FullLoader)
+    with open("logging_config.yml", encoding="utf-8") as stream:
+        config = yaml.load(stream, Loader=yaml.FullLoader)
     logging.config.dictConfig(config)
 
+    queue_size = queue_size if queue_size is not None else int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    policy = policy or os.getenv("LOG_QUEUE_POLICY", "drop")
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+
+    # Move the configured handlers of the root logger and of the named loggers (e.g. simpleLogger)
+    # behind one queue, so that no logging call writes to a file itself
+    loggers = [logging.getLogger()] + [logging.getLogger(name) for name in config.get("loggers", {})]
+    handlers = []
+    for logger in loggers:
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+    if json_format:
+        for handler in handlers:
+            handler.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, policy)
+    # The correlation id is read in the thread that logs, not in the writing thread
+    _queue_handler.addFilter(CorrelationIdFilter())
+    for logger in loggers:
+        if logger.handlers:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            logger.addHandler(_queue_handler)
+            _queued_loggers.append(logger)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
     # Log the start of the program
     logging.info("-" * 50)
     logging.info(f"Starting {name}")
     logging.info("-" * 50)
+
+
+def shutdown_logs():
+    """Write the records still in the queue, stop the background thread and close the files."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    listener, queue_handler = _listener, _queue_handler
+    _listener = _queue_handler = None
+
+    for logger in _queued_loggers:
+        logger.removeHandler(queue_handler)
+    _queued_loggers.clear()
+    listener.stop()
+    for handler in listener.handlers:
+        if queue_handler.dropped:
+            handler.handle(
+                logging.LogRecord(
+                    "src.utils.log_init",
+                    logging.WARNING,
+                    __file__,
+                    0,
+                    "%d log records dropped because the log queue was full",
+                    (queue_handler.dropped,),
+                    None,
+                )
+            )
+        handler.flush()
+        handler.close()
+
+
+def dropped_records() -> int:
+    """Number of records dropped since initialize_logs because the queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+atexit.register(shutdown_logs)
@@ -0,0 +1,75 @@
+import os
+import re
+
+import dotenv
+
+from src.DAO.DBConnector import DBConnector
+
+dotenv.load_dotenv()
+
+MIGRATIONS_DIR = "data/migrations"
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+class MigrateDatabase:
+    """Apply the versioned SQL scripts of data/migrations that are not yet applied to a schema.
+
+    Scripts are named <version>_<description>.sql and applied in version order,
+    each in its own transaction. Applied versions are recorded in the schema_migrations table.
+    """
+
+    def __init__(self, test: bool = False, migrations_dir: str = MIGRATIONS_DIR):
+        self.test = test
+        self.db = DBConnector(test=test)
+        self.migrations_dir = migrations_dir
+
+    def list_migrations(self):
+        """Return the (version, name, path) of every migration script, sorted by version."""
+        migrations = []
+        for file_name in os.listdir(self.migrations_dir):
+            match = MIGRATION_FILE.match(file_name)
+            if match:
+                migrations.append((int(match.group(1)), match.group(2), os.path.join(self.migrations_dir, file_name)))
+        return sorted(migrations)
+
+    def applied_versions(self):
+        """Return the set of versions already applied to the schema."""
+        self.db.sql_query(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version     INT PRIMARY KEY,
+                name        VARCHAR(255) NOT NULL,
+                applied_at  TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+            """,
+            None,
+            None,
+        )
+        rows = self.db.sql_query("SELECT version FROM schema_migrations", None, "all")
+        return {row["version"] for row in rows}
+
+    def lancer(self):
+        """Apply the pending migrations and return the list of versions applied"""
+        applied = self.applied_versions()
+        newly_applied = []
+        for version, name, path in self.list_migrations():
+            if version in applied:
+                continue
+            with open(path, "r") as f:
+                sql_commands = f.read()
+            with self.db.transaction() as cursor:
+                # Another process may be migrating the same schema
+                cursor.execute("LOCK TABLE schema_migrations IN EXCLUSIVE MODE")
+                cursor.execute("SELECT 1 FROM schema_migrations WHERE version = %s", [version])
+                if cursor.fetchone():
+                    continue
+                print(f"Applying migration {version} ({name}) to schema {self.db.schema}")
+                cursor.execute(sql_commands)
+                cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", [version, name])
+            newly_applied.append(version)
+        return newly_applied
+
+
+if __name__ == "__main__":
+    MigrateDatabase(test=False).lancer()  # for "default_schema"
+    MigrateDatabase(test=True).lancer()  # for "test"
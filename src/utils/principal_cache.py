@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class PrincipalCache:
+    """Short-lived cache of the authenticated users, so that a request does not need a database
+    round trip just to learn who the caller is.
+
+    Entries are keyed by (kind, id), e.g. ("admin", id_admin), and remember the id_user they
+    belong to so that every entry of a user can be dropped when this user is updated.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 1024):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        ttl : float
+            Number of seconds an entry stays valid. 0 disables the cache.
+        max_size : int
+            Maximum number of entries. The least recently used one is evicted first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, id_user, value)
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, principal_id: Hashable) -> Optional[Any]:
+        """Return the cached principal, or None if it is missing or expired."""
+        key = (kind, principal_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, kind: str, principal_id: Hashable, id_user: int, value: Any):
+        """Cache a principal.
+
+        Parameters
+        ----------
+        kind : str
+            Kind of principal, e.g. "user" or "admin".
+        principal_id : Hashable
+            Id of the principal, as found in its JWT.
+        id_user : int
+            Id of the row of the users table the principal is built from.
+        value : Any
+            Principal to return on the next get. Should not be modified afterwards.
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(kind, principal_id)] = (time.monotonic() + self.ttl, id_user, value)
+            self._entries.move_to_end((kind, principal_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, id_user: int):
+        """Drop every entry built from this user, whatever its kind."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] == id_user]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Principals of the API, PRINCIPAL_CACHE_TTL seconds (30 by default) before being read again from the database
+principal_cache = PrincipalCache(ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", 30)))
@@ -2,6 +2,7 @@ import dotenv
 from psycopg2 import connect, sql
 
 from src.DAO.DBConnector import DBConnector
+from src.utils.migrate_database import MigrateDatabase
 
 dotenv.load_dotenv()
 
@@ -14,7 +15,7 @@ class ResetDatabase:
         self.db = DBConnector(test=test)
 
     def lancer(self):
-        """Reset the schema by executing the SQL script"""
+        """Reset the schema by executing the SQL script, then apply the migrations"""
         print(f"Resetting schema: {self.schema}")
         try:
             with connect(
@@ -33,6 +34,7 @@ class ResetDatabase:
                     with open(self.sql_file, "r") as f:
                         sql_commands = f.read()
                         cursor.execute(sql_commands)
+            MigrateDatabase(test=self.test).lancer()
             print(f"Schema {self.schema} reset successfully!")
         except Exception as e:
             print(f"ERROR resetting schema {self.schema}")